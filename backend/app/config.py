@@ -0,0 +1,167 @@
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()  # loads .env file
+
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+# The backend directory, for bundled data that must not depend on the CWD
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+# ---------- OLLAMA ----------
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "mistral")
+OLLAMA_TIMEOUT = _float("OLLAMA_TIMEOUT", 60.0)
+
+# Shared keep-alive pool used by every LocalLLM instance
+OLLAMA_MAX_CONNECTIONS = _int("OLLAMA_MAX_CONNECTIONS", 100)
+OLLAMA_MAX_KEEPALIVE = _int("OLLAMA_MAX_KEEPALIVE", 20)
+OLLAMA_KEEPALIVE_EXPIRY = _float("OLLAMA_KEEPALIVE_EXPIRY", 30.0)
+
+# ---------- LLM RESPONSE CACHE ----------
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "cache/llm_cache.sqlite3")  # "" = memory only
+LLM_CACHE_MEMORY_ENTRIES = _int("LLM_CACHE_MEMORY_ENTRIES", 512)
+LLM_CACHE_MAX_ENTRIES = _int("LLM_CACHE_MAX_ENTRIES", 10_000)
+LLM_CACHE_TTL = _float("LLM_CACHE_TTL", 7 * 24 * 3600)
+
+# ---------- LLM SCHEDULER ----------
+# Global cap on concurrent Ollama generations; match OLLAMA_NUM_PARALLEL.
+# 0 disables admission control.
+LLM_MAX_CONCURRENCY = _int("LLM_MAX_CONCURRENCY", 4)
+# Longest a call may queue before it is shed (0 = wait forever), per class
+LLM_QUEUE_TIMEOUT_INTERACTIVE = _float("LLM_QUEUE_TIMEOUT_INTERACTIVE", 30.0)
+LLM_QUEUE_TIMEOUT_SCORING = _float("LLM_QUEUE_TIMEOUT_SCORING", 15.0)
+LLM_QUEUE_TIMEOUT_BACKGROUND = _float("LLM_QUEUE_TIMEOUT_BACKGROUND", 120.0)
+# Background calls beyond this many queued are shed at once (0 = unbounded)
+LLM_MAX_QUEUED_BACKGROUND = _int("LLM_MAX_QUEUED_BACKGROUND", 32)
+
+# ---------- LLM DEADLINES AND CIRCUIT BREAKER ----------
+# Time budget shared by every LLM call of one /start or /answer request;
+# OLLAMA_TIMEOUT still caps each call. 0 = no budget.
+LLM_TURN_BUDGET = _float("LLM_TURN_BUDGET", 45.0)
+# After this many consecutive timeouts/connection errors, calls fail fast
+# to their fallbacks until a probe of /api/tags succeeds. 0 disables.
+LLM_BREAKER_THRESHOLD = _int("LLM_BREAKER_THRESHOLD", 5)
+LLM_BREAKER_COOLDOWN = _float("LLM_BREAKER_COOLDOWN", 15.0)  # doubles per failed probe
+LLM_BREAKER_MAX_COOLDOWN = _float("LLM_BREAKER_MAX_COOLDOWN", 120.0)
+LLM_BREAKER_PROBE_TIMEOUT = _float("LLM_BREAKER_PROBE_TIMEOUT", 3.0)
+# Turn budgets end calls before OLLAMA_TIMEOUT does, so a call cut short
+# after Ollama has been silent this long also counts as a failure. 0 = only
+# full OLLAMA_TIMEOUTs count.
+LLM_BREAKER_SLOW_CALL = _float("LLM_BREAKER_SLOW_CALL", 20.0)
+
+# ---------- LLM SESSION CONTEXT ----------
+# Follow-ups continue a per-session Ollama conversation so each turn only
+# prefills the new answer. A context longer than LLM_CONTEXT_MAX_TOKENS
+# (keep it below the model's num_ctx) is dropped and the next turn starts
+# fresh. 0 disables.
+# Only follow-ups generated on their own use it: /answer/stream always, but
+# /answer only with EVALUATION_MODE=separate. In combined mode /answer takes
+# the follow-up from the JSON judgement and converses only as a fallback.
+LLM_CONTEXT_MAX_TOKENS = _int("LLM_CONTEXT_MAX_TOKENS", 3072)
+LLM_CONTEXT_MAX_SESSIONS = _int("LLM_CONTEXT_MAX_SESSIONS", 1000)
+
+# ---------- LLM REQUEST COALESCING ----------
+# Concurrent identical prompts share one Ollama call. Callers listed in
+# LLM_COALESCE_EXCLUDE (comma-separated, e.g. "question") always go out.
+LLM_COALESCE_ENABLED = os.getenv("LLM_COALESCE_ENABLED", "1") == "1"
+LLM_COALESCE_EXCLUDE = frozenset(
+    c.strip() for c in os.getenv("LLM_COALESCE_EXCLUDE", "").split(",") if c.strip()
+)
+
+# ---------- VOICE ----------
+STT_BACKEND = os.getenv("STT_BACKEND", "vosk")  # vosk (offline) | google (needs network)
+VOSK_MODEL_DIR = os.getenv("VOSK_MODEL_DIR", "models/vosk-model-small-en-us-0.15")
+STT_SAMPLE_RATE = _int("STT_SAMPLE_RATE", 16000)  # for raw PCM uploads; WAV carries its own
+VOICE_MAX_STREAMS = _int("VOICE_MAX_STREAMS", 64)
+VOICE_STREAM_IDLE_TTL = _float("VOICE_STREAM_IDLE_TTL", 120.0)
+VOICE_MAX_AUDIO_SECONDS = _float("VOICE_MAX_AUDIO_SECONDS", 600.0)
+# Chunked uploads are decoded in pieces of about this many bytes (0.25 s at 16 kHz)
+VOICE_DECODE_BYTES = _int("VOICE_DECODE_BYTES", 8000)
+
+# Text-to-speech renders to WAV on one worker thread (pyttsx3 isn't thread-safe)
+TTS_VOICE = os.getenv("TTS_VOICE", "")  # pyttsx3 voice id; "" = engine default
+TTS_RATE = _int("TTS_RATE", 0)  # words per minute; 0 = engine default
+TTS_MAX_CHARS = _int("TTS_MAX_CHARS", 2000)
+# Render each new question/follow-up in the background so playback is instant
+TTS_PREFETCH = os.getenv("TTS_PREFETCH", "0") == "1"
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "cache/tts")
+TTS_CACHE_MAX_BYTES = _int("TTS_CACHE_MAX_BYTES", 256 * 1024 * 1024)  # 0 disables the cache
+TTS_CACHE_MAX_FILES = _int("TTS_CACHE_MAX_FILES", 5000)
+
+# ---------- EMBEDDINGS ----------
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # torch | onnx
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "onnx/all-MiniLM-L6-v2")
+ONNX_QUANTIZED = os.getenv("ONNX_QUANTIZED", "1") == "1"
+ONNX_THREADS = _int("ONNX_THREADS", 0)  # 0 = let ONNX Runtime decide
+EMBEDDING_CACHE_ENTRIES = _int("EMBEDDING_CACHE_ENTRIES", 20_000)
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "")  # e.g. cache/embeddings.npz
+
+# Cross-request micro-batching of similarity scoring
+EMBEDDING_BATCH_ENABLED = os.getenv("EMBEDDING_BATCH_ENABLED", "1") == "1"
+EMBEDDING_BATCH_MAX_SIZE = _int("EMBEDDING_BATCH_MAX_SIZE", 32)
+EMBEDDING_BATCH_MAX_WAIT_MS = _float("EMBEDDING_BATCH_MAX_WAIT_MS", 5.0)
+
+# ---------- STARTUP ----------
+# Load the embedding model in the background as soon as the server starts
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "1") == "1"
+# Also ask Ollama to load its model at startup
+OLLAMA_WARMUP_ON_STARTUP = os.getenv("OLLAMA_WARMUP_ON_STARTUP", "0") == "1"
+
+# ---------- QUESTION PREFETCH POOL ----------
+QUESTION_POOL_ENABLED = os.getenv("QUESTION_POOL_ENABLED", "1") == "1"
+QUESTION_POOL_LOW_WATER = _int("QUESTION_POOL_LOW_WATER", 2)
+QUESTION_POOL_TARGET = _int("QUESTION_POOL_TARGET", 4)
+QUESTION_POOL_MAX_KEYS = _int("QUESTION_POOL_MAX_KEYS", 64)
+QUESTION_POOL_REFILL_CONCURRENCY = _int("QUESTION_POOL_REFILL_CONCURRENCY", 1)
+
+# ---------- QUESTION BANK ----------
+# Curated questions served before the pool or the LLM (no repeats per session)
+QUESTION_BANK_ENABLED = os.getenv("QUESTION_BANK_ENABLED", "1") == "1"
+QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", "db/questions.sqlite3")  # empty = memory only
+# Re-imported when it changes; relative paths are resolved from the backend directory
+QUESTION_BANK_SOURCE = os.getenv("QUESTION_BANK_SOURCE", "data/questions.json")
+if QUESTION_BANK_SOURCE:
+    QUESTION_BANK_SOURCE = str(BACKEND_DIR / QUESTION_BANK_SOURCE)
+QUESTION_BANK_RELOAD_INTERVAL = _float("QUESTION_BANK_RELOAD_INTERVAL", 30.0)
+QUESTION_BANK_CACHE_BUCKETS = _int("QUESTION_BANK_CACHE_BUCKETS", 256)
+
+# ---------- ANSWER EVALUATION ----------
+# combined: one JSON-constrained LLM call for STAR, correctness and follow-up
+#   (/answer/stream still streams the follow-up as a second call next to it)
+# separate: STAR and follow-up as independent calls
+EVALUATION_MODE = os.getenv("EVALUATION_MODE", "combined")
+
+# ---------- SESSIONS ----------
+# sqlite also shares report job status and cohort scores between workers
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")  # memory | sqlite (multi-worker)
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "db/sessions.sqlite3")
+SESSION_CACHE_ENTRIES = _int("SESSION_CACHE_ENTRIES", 1024)
+SESSION_MAX_SESSIONS = _int("SESSION_MAX_SESSIONS", 10_000)
+SESSION_MAX_BYTES = _int("SESSION_MAX_BYTES", 256 * 1024 * 1024)
+SESSION_IDLE_TTL = _float("SESSION_IDLE_TTL", 2 * 3600)
+SESSION_COMPLETED_TTL = _float("SESSION_COMPLETED_TTL", 30 * 60)
+SESSION_SWEEP_INTERVAL = _float("SESSION_SWEEP_INTERVAL", 60.0)
+
+# ---------- REPORT JOBS ----------
+REPORT_WORKERS = _int("REPORT_WORKERS", 2)
+REPORT_MAX_JOBS = _int("REPORT_MAX_JOBS", 1000)
+
+# ---------- METRICS ----------
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"  # /metrics + per-route timing
+
+# ---------- COHORT ANALYTICS ----------
+# With SESSION_STORE=sqlite, cohorts live in the session database instead
+COHORT_STORE_PATH = os.getenv("COHORT_STORE_PATH", "db/cohorts.npz")  # empty = memory only
+COHORT_SAVE_EVERY = _int("COHORT_SAVE_EVERY", 100)
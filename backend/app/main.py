@@ -1,14 +1,121 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.routers import interview
+from fastapi.responses import PlainTextResponse
+from app import config
+from app.routers import analytics, health, interview, voice
+from app.services.local_llm import (
+    close_clients,
+    coalescing_stats,
+    get_breaker,
+    get_cache,
+    get_conversations,
+    get_scheduler,
+)
+from app.utils.metrics import REGISTRY, Gauge, MetricsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Serve /health/live right away; readiness flips once the model is in
+    if config.MODEL_PRELOAD:
+        health.start_background_load()
+    if config.OLLAMA_WARMUP_ON_STARTUP:
+        app.state.ollama_warmup = asyncio.create_task(health.warmup_ollama())
+    if config.QUESTION_POOL_ENABLED:
+        interview.question_pool.start()
+    if config.QUESTION_BANK_ENABLED:
+        await asyncio.to_thread(interview.question_bank.reload, True)
+    interview.session_manager.start_sweeper()
+    interview.report_jobs.start()
+    yield
+    await interview.report_jobs.stop()
+    await interview.session_manager.stop_sweeper()
+    await interview.question_pool.stop()
+    # Release the shared Ollama keep-alive pool
+    await close_clients()
+    # Persist question/answer embeddings for the next start (if configured)
+    interview.answer_evaluator.semantic.cache.save()
+    # Persist cross-session score columns
+    interview.cohort_store.save()
+    interview.voice_engine.close()
+
 
 app = FastAPI(
     title="AI Interview Prep Coach",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # ✅ THIS IS CRITICAL
 app.include_router(interview.router)
+app.include_router(health.router)
+app.include_router(analytics.router)
+app.include_router(voice.router)
+
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Queue/pool sizes are read when /metrics is scraped
+Gauge("sessions_live", "Interviews started and not yet ended",
+      function=lambda: interview.session_manager.stats()["live_sessions"])
+Gauge("report_jobs_queued", "Report jobs waiting for a worker",
+      function=lambda: interview.report_jobs.stats()["queue_depth"])
+Gauge("question_pool_size", "Pre-generated opening questions ready to serve",
+      function=lambda: interview.question_pool.stats()["pooled_questions"])
+Gauge("llm_breaker_open", "1 while LLM calls are failing fast",
+      function=lambda: int(get_breaker().state != "closed"))
 
 @app.get("/")
 def root():
     return {"status": "Backend running"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    if not config.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/llm/scheduler")
+def llm_scheduler_stats():
+    return get_scheduler().stats()
+
+@app.get("/llm/conversations")
+def llm_conversation_stats():
+    return get_conversations().stats()
+
+@app.get("/llm/breaker")
+def llm_breaker_stats():
+    return get_breaker().stats()
+
+@app.get("/llm/cache")
+def llm_cache_stats():
+    cache = get_cache()
+    stats = cache.stats() if cache else {"enabled": False}
+    stats["coalescing"] = coalescing_stats()
+    return stats
+
+@app.get("/llm/evaluation")
+def evaluation_stats():
+    combined = interview.answer_evaluator.combined
+    return {
+        "mode": interview.answer_evaluator.mode,
+        "combined": combined.stats() if combined else None,
+    }
+
+@app.get("/embeddings/stats")
+def embedding_stats():
+    evaluator = interview.answer_evaluator
+    return {
+        "cache": evaluator.semantic.cache.stats(),
+        "batcher": evaluator.batcher.stats() if evaluator.batcher else None,
+    }
+
+@app.get("/questions/pool")
+def question_pool_stats():
+    return interview.question_pool.stats()
+
+@app.get("/questions/bank")
+def question_bank_stats():
+    return interview.question_bank.stats()
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from app.routers.interview import cohort_store, session_manager
+from app.services.cohort_store import COHORT_METRICS
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/cohorts")
+def list_cohorts():
+    return {"sessions": len(cohort_store), "cohorts": cohort_store.cohorts()}
+
+
+@router.get("/cohort")
+def cohort_summary(
+    role: str | None = None,
+    domain: str | None = None,
+    difficulty: str | None = None,
+    bins: int = Query(10, ge=1, le=100),
+):
+    """Distribution of finished-session scores; omitted filters match everything."""
+    summary = cohort_store.summary(role, domain, difficulty)
+    summary["histograms"] = {
+        metric: cohort_store.histogram(metric, bins, role=role, domain=domain, difficulty=difficulty)
+        for metric in COHORT_METRICS
+    }
+    return summary
+
+
+@router.get("/ranking/{session_id}")
+def session_ranking(session_id: str, scope: str = Query("cohort", pattern="^(cohort|role|all)$")):
+    """
+    Percentile rank of one session against its cohort.
+
+    ``scope=cohort`` compares against the same role/domain/difficulty,
+    ``role`` against every session for the role, ``all`` against everyone.
+    """
+    session = session_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Invalid session")
+
+    aggregates = session["aggregates"]
+    if not aggregates.count:
+        raise HTTPException(status_code=400, detail="Session has no answers yet")
+
+    scores = {m: aggregates.mean(m) for m in COHORT_METRICS}
+    filters = {
+        "cohort": (session["role"], session["domain"], session["difficulty"]),
+        "role": (session["role"], None, None),
+        "all": (None, None, None),
+    }[scope]
+
+    comparison = cohort_store.compare(scores, *filters)
+    comparison["scope"] = scope
+    comparison["scores"] = {m: round(v, 2) for m, v in scores.items()}
+    return comparison
@@ -28,8 +28,7 @@ def evaluate_answer(payload: dict):
         evaluation["confidence_score"]
     )
 
-    session["answers"].append(answer)
-    session["evaluations"].append(evaluation)
+    session_manager.record_turn(session_id, answer, evaluation, followup)
 
     return {
         "score": evaluation["correctness_score"],
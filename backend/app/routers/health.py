@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import threading
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.routers.interview import answer_evaluator, llm
+
+router = APIRouter(prefix="/health", tags=["Health"])
+logger = logging.getLogger(__name__)
+
+semantic = answer_evaluator.semantic
+
+
+def _load_model():
+    start = time.perf_counter()
+    try:
+        semantic.load()
+        # One forward pass so the first real request doesn't pay for lazy init
+        semantic.backend.encode(["warm up"])
+    except Exception:
+        logger.exception("Embedding model failed to load")
+        return
+    logger.info("Embedding model ready in %.2fs", time.perf_counter() - start)
+
+
+def start_background_load():
+    threading.Thread(target=_load_model, name="model-loader", daemon=True).start()
+
+
+async def warmup_ollama() -> str:
+    try:
+        await llm.awarmup()
+        return "ok"
+    except Exception as e:
+        return f"failed: {e}"
+
+
+# ---------- ROUTES ----------
+
+@router.get("/live")
+def live():
+    return {"status": "alive"}
+
+@router.get("/ready")
+def ready():
+    if semantic.is_loaded:
+        return {"status": "ready"}
+
+    body = {"status": "loading"}
+    if semantic.load_error is not None:
+        body = {"status": "error", "detail": str(semantic.load_error)}
+    return JSONResponse(body, status_code=503)
+
+@router.post("/warmup")
+async def warmup():
+    start = time.perf_counter()
+    await asyncio.to_thread(_load_model)
+    model_seconds = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    ollama = await warmup_ollama()
+    ollama_seconds = round(time.perf_counter() - start, 3)
+
+    return {
+        "embedding_model": "ok" if semantic.is_loaded else "failed",
+        "embedding_model_seconds": model_seconds,
+        "ollama": ollama,
+        "ollama_seconds": ollama_seconds,
+    }
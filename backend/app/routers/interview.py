@@ -1,14 +1,29 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
+import asyncio
+import json
+import os
 import time
 
 from app.services.session_manager import SessionManager
+from app.services.session_store import SessionNotFound
 from app.services.answer_evaluation import AnswerEvaluator
 from app.services.analytics_engine import AnalyticsEngine
 from app.services.improvement_plan import ImprovementPlanEngine
 from app.services.report_generator import PDFReportGenerator
-from app.services.local_llm import LocalLLM
+from app.services import deadline
+from app.services.circuit_breaker import LLMUnavailable
+from app.services.deadline import DeadlineExceeded
+from app.services.followup_engine import FALLBACK_FOLLOWUP
+from app.services.llm_scheduler import LLMOverloaded, current_session
+from app.services.local_llm import LocalLLM, get_breaker, get_conversations
+from app.services.cohort_store import COHORT_METRICS, CohortStore
+from app.services.question_bank import get_question_bank
+from app.services.question_pool import QuestionPool, opening_question_prompt
+from app.services.report_jobs import FAILED, QUEUED, RUNNING, ReportJobQueue
+from app.services.voice_engine import VoiceEngine
+from app import config
 
 router = APIRouter(prefix="/interview", tags=["Interview"])
 
@@ -18,6 +33,30 @@ analytics_engine = AnalyticsEngine()
 improvement_engine = ImprovementPlanEngine()
 report_generator = PDFReportGenerator()
 llm = LocalLLM()
+voice_engine = VoiceEngine()
+report_jobs = ReportJobQueue(
+    improvement_engine,
+    report_generator,
+    concurrency=config.REPORT_WORKERS,
+    max_jobs=config.REPORT_MAX_JOBS,
+    db_path=config.SESSION_DB_PATH if config.SESSION_STORE == "sqlite" else None,
+)
+cohort_store = CohortStore(
+    path=config.COHORT_STORE_PATH or None,
+    save_every=config.COHORT_SAVE_EVERY,
+    db_path=config.SESSION_DB_PATH if config.SESSION_STORE == "sqlite" else None,
+)
+conversations = get_conversations()
+session_manager.add_evict_listener(conversations.evict)
+question_pool = QuestionPool(
+    llm,
+    low_water=config.QUESTION_POOL_LOW_WATER,
+    target=config.QUESTION_POOL_TARGET,
+    max_keys=config.QUESTION_POOL_MAX_KEYS,
+    refill_concurrency=config.QUESTION_POOL_REFILL_CONCURRENCY,
+)
+question_bank = get_question_bank()
+session_manager.add_evict_listener(question_bank.evict)
 
 # ---------- MODELS ----------
 
@@ -34,40 +73,138 @@ class AnswerRequest(BaseModel):
 class EndInterviewRequest(BaseModel):
     session_id: str
 
+# ---------- PROMPTS ----------
+
+def followup_prompt(question: str, answer: str, correctness: float, confidence: float) -> str:
+    return f"""
+You are a senior interviewer.
+
+Previous Question:
+{question}
+
+Candidate Answer:
+{answer}
+
+Evaluation Summary:
+Correctness: {correctness}
+Confidence: {confidence}
+
+Ask ONE deeper follow-up interview question.
+No explanations.
+"""
+
+def followup_turn_prompt(answer: str, correctness: float, confidence: float) -> str:
+    # Continues the session's conversation: the question is already in its context
+    return f"""
+Candidate Answer:
+{answer}
+
+Evaluation Summary:
+Correctness: {correctness}
+Confidence: {confidence}
+
+Ask ONE deeper follow-up interview question that builds on the interview so far.
+No explanations.
+"""
+
+def session_followup_prompt(session_id: str, question: str, answer: str, scores: dict) -> str:
+    """
+    Only the new answer when the model asked ``question`` itself in this
+    session's conversation; otherwise the question goes in too (opening
+    question, combined-mode follow-up, or a dropped context).
+    """
+    if conversations.last_reply(session_id) == question:
+        return followup_turn_prompt(answer, scores["correctness_score"], scores["confidence_score"])
+    return followup_prompt(question, answer, scores["correctness_score"], scores["confidence_score"])
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _overloaded(e: LLMOverloaded) -> HTTPException:
+    return HTTPException(503, f"Interview coach is busy, please retry: {e}", headers={"Retry-After": "5"})
+
+def _expired() -> HTTPException:
+    # The session was swept or evicted while its turn was being generated
+    return HTTPException(410, "Session expired, please start a new interview")
+
+def _unavailable(e: LLMUnavailable) -> HTTPException:
+    retry_after = max(int(get_breaker().retry_after()), 1)
+    return HTTPException(503, f"Interview coach is unavailable: {e}", headers={"Retry-After": str(retry_after)})
+
+async def _disconnected(request: Request):
+    # The body is already read, so the next message is the disconnect
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+async def _cancel_on_disconnect(request: Request, work):
+    """Awaits ``work``, cancelling it (and its Ollama calls) if the client goes away."""
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.create_task(_disconnected(request))
+    try:
+        await asyncio.wait((task, watcher), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        gone = not task.done()
+        if gone:
+            task.cancel()
+    if gone:
+        raise HTTPException(499, "Client closed request")
+    return task.result()
+
+async def _banked_question(session: dict) -> str | None:
+    """An unasked bank question matching the session's tags (the first bucket load hits SQLite)."""
+    if not config.QUESTION_BANK_ENABLED:
+        return None
+    return await asyncio.to_thread(
+        question_bank.take,
+        session["session_id"],
+        session["role"],
+        session["domain"],
+        session["difficulty"],
+        session["mode"],
+    )
+
 # ---------- ROUTES ----------
 
 @router.post("/start")
-def start_interview(req: StartInterviewRequest):
-    session = session_manager.create_session(
+async def start_interview(req: StartInterviewRequest, request: Request):
+    session = await session_manager.acreate_session(
         role=req.role,
         domain=req.domain,
         difficulty=req.difficulty,
         mode=req.mode,
     )
 
-    prompt = f"""
-You are a professional technical interviewer.
-
-Generate ONE clear interview question.
-
-Role: {req.role}
-Domain: {req.domain}
-Difficulty: {req.difficulty}
-Focus: {req.mode}
-
-Rules:
-- Ask only ONE question
-- Open-ended
-- Interview style
-- No explanation
-"""
+    current_session.set(session["session_id"])
+    deadline.set_budget(config.LLM_TURN_BUDGET)
+
+    question = await _banked_question(session)
+    if question is None and config.QUESTION_POOL_ENABLED:
+        question = question_pool.take(req.role, req.domain, req.difficulty, req.mode)
+
+    if question is None:
+        # Nothing banked or pooled: generate synchronously
+        prompt = opening_question_prompt(req.role, req.domain, req.difficulty, req.mode)
+        try:
+            question = (
+                await _cancel_on_disconnect(request, llm.agenerate(prompt, caller="question"))
+            ).strip()
+        except HTTPException:
+            raise
+        except LLMOverloaded as e:
+            raise _overloaded(e)
+        except LLMUnavailable as e:
+            raise _unavailable(e)
+        except DeadlineExceeded as e:
+            raise HTTPException(504, f"LLM did not generate a question in time: {e}")
+        except Exception as e:
+            raise HTTPException(500, f"LLM failed to generate question: {e}")
 
     try:
-        question = llm.generate(prompt).strip()
-    except Exception as e:
-        raise HTTPException(500, f"LLM failed to generate question: {e}")
-
-    session["questions"].append(question)
+        await session_manager.aadd_question(session["session_id"], question)
+    except SessionNotFound:
+        raise _expired()
+    voice_engine.prefetch(question)
 
     return {
         "session_id": session["session_id"],
@@ -76,40 +213,41 @@ Rules:
     }
 
 @router.post("/answer")
-def submit_answer(req: AnswerRequest):
-    session = session_manager.get_session(req.session_id)
+async def submit_answer(req: AnswerRequest, request: Request):
+    session = await session_manager.aget_session(req.session_id)
     if not session:
         raise HTTPException(404, "Invalid session ID")
 
+    current_session.set(req.session_id)
+    deadline.set_budget(config.LLM_TURN_BUDGET)
     last_question = session["questions"][-1]
-    session["answers"].append(req.answer)
-
-    evaluation = answer_evaluator.evaluate(last_question, req.answer)
-    session["evaluations"].append(evaluation)
 
-    followup_prompt = f"""
-You are a senior interviewer.
-
-Previous Question:
-{last_question}
-
-Candidate Answer:
-{req.answer}
-
-Evaluation Summary:
-Correctness: {evaluation['correctness_score']}
-Confidence: {evaluation['confidence_score']}
-
-Ask ONE deeper follow-up interview question.
-No explanations.
-"""
+    async def generate_followup(scores: dict) -> str:
+        prompt = session_followup_prompt(req.session_id, last_question, req.answer, scores)
+        try:
+            return await llm.aconverse(req.session_id, prompt, caller="followup")
+        except (DeadlineExceeded, LLMUnavailable):
+            # Keep the interview moving; scoring has its own fallbacks
+            return await _banked_question(session) or FALLBACK_FOLLOWUP
 
+    # Follow-up only needs the heuristic scores, so it runs alongside STAR
     try:
-        followup_question = llm.generate(followup_prompt).strip()
+        evaluation, followup_question = await _cancel_on_disconnect(
+            request,
+            answer_evaluator.aevaluate_turn(last_question, req.answer, followup=generate_followup),
+        )
+    except HTTPException:
+        raise
+    except LLMOverloaded as e:
+        raise _overloaded(e)
     except Exception as e:
         raise HTTPException(500, f"LLM failed to generate follow-up: {e}")
 
-    session["questions"].append(followup_question)
+    try:
+        await session_manager.arecord_turn(req.session_id, req.answer, evaluation, followup_question)
+    except SessionNotFound:
+        raise _expired()
+    voice_engine.prefetch(followup_question)
 
     return {
         "relevance_score": evaluation["relevance_score"],
@@ -120,28 +258,169 @@ No explanations.
         "follow_up_question": followup_question,
     }
 
-@router.post("/end")
-def end_interview(req: EndInterviewRequest):
-    session = session_manager.get_session(req.session_id)
+@router.post("/answer/stream")
+async def submit_answer_stream(req: AnswerRequest):
+    """
+    Server-Sent Events variant of /answer.
+
+    Events, in order:
+    - ``scores``: heuristic relevance/correctness/confidence
+    - ``token``: follow-up question text as Ollama generates it
+      (also in combined mode: the judgement call then leaves the
+      follow-up out, so the first token doesn't wait for the scores)
+    - ``evaluation``: full evaluation once STAR scoring finishes; its
+      correctness_score (blended with the LLM verdict) replaces the
+      heuristic one from ``scores``
+    - ``done``: the complete follow-up question
+    An ``error`` event replaces the remaining events on failure.
+    """
+    session = await session_manager.aget_session(req.session_id)
     if not session:
-        raise HTTPException(status_code=404, detail="Invalid session")
+        raise HTTPException(404, "Invalid session ID")
 
-    analytics = analytics_engine.generate_metrics(session["evaluations"])
-    improvement = improvement_engine.generate_plan(session["evaluations"])
+    last_question = session["questions"][-1]
 
-    pdf_path = report_generator.generate(
-        session=session,
-        analytics=analytics,
-        improvement=improvement
+    # Starlette cancels this generator when the client disconnects, which
+    # closes the Ollama stream and the scoring task below.
+    async def events():
+        current_session.set(req.session_id)
+        deadline.set_budget(config.LLM_TURN_BUDGET)
+        judge_task = asyncio.create_task(
+            answer_evaluator.ajudge(last_question, req.answer, followup=False)
+        )
+        try:
+            relevance = await answer_evaluator.arelevance(last_question, req.answer)
+            scores = answer_evaluator.heuristic_scores(req.answer, relevance)
+            yield _sse("scores", {
+                "relevance_score": round(scores["relevance"], 2),
+                "correctness_score": scores["correctness_score"],
+                "confidence_score": scores["confidence_score"],
+            })
+
+            prompt = session_followup_prompt(req.session_id, last_question, req.answer, scores)
+            tokens = []
+            try:
+                async for token in llm.astream(prompt, caller="followup", session_id=req.session_id):
+                    tokens.append(token)
+                    yield _sse("token", token)
+            except (DeadlineExceeded, LLMUnavailable):
+                if tokens:
+                    raise
+                fallback = await _banked_question(session) or FALLBACK_FOLLOWUP
+                tokens.append(fallback)
+                yield _sse("token", fallback)
+
+            followup_question = "".join(tokens).strip()
+            if not followup_question:
+                raise RuntimeError("empty response")
+
+            evaluation = answer_evaluator.combine(scores, await judge_task)
+            yield _sse("evaluation", {
+                "correctness_score": evaluation["correctness_score"],
+                "correctness_verdict": evaluation.get("correctness_verdict"),
+                "readiness_score": evaluation["readiness_score"],
+                "feedback": evaluation["feedback"],
+            })
+        except Exception as e:
+            yield _sse("error", {"detail": f"LLM failed to generate follow-up: {e}"})
+            return
+        finally:
+            # Client went away or generation failed: stop scoring too
+            judge_task.cancel()
+
+        try:
+            await session_manager.arecord_turn(req.session_id, req.answer, evaluation, followup_question)
+        except SessionNotFound:
+            yield _sse("error", {"detail": _expired().detail})
+            return
+        voice_engine.prefetch(followup_question)
+
+        yield _sse("done", {"follow_up_question": followup_question})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
+@router.post("/end")
+async def end_interview(req: EndInterviewRequest):
+    session = await session_manager.aget_session(req.session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Invalid session")
+
+    already_ended = session["end_time"] is not None
+    try:
+        await session_manager.aend_session(req.session_id)
+    except SessionNotFound:
+        raise _expired()
+    conversations.end(req.session_id)
+    question_bank.end(req.session_id)
+    analytics = analytics_engine.generate_metrics(session)
+
+    # Feed the cross-session percentiles (once per session, answered ones only)
+    aggregates = session["aggregates"]
+    if not already_ended and aggregates.count:
+        averages = {m: aggregates.mean(m) for m in COHORT_METRICS}
+        save_due = await asyncio.to_thread(
+            cohort_store.add, session["role"], session["domain"], session["difficulty"], averages
+        )
+        if save_due:
+            await asyncio.to_thread(cohort_store.save)
+
+    # LLM coaching summary and PDF are produced in the background;
+    # the rule-based part of the plan is returned right away.
+    improvement = improvement_engine.diagnose_plan(session["aggregates"])
+    # Ending again reuses the session's report unless that one failed
+    job = report_jobs.for_session(req.session_id) if already_ended else None
+    if job is None or job["status"] == FAILED:
+        job = await report_jobs.submit(session, analytics)
+
     return {
         "analytics": analytics,
         "improvement": improvement,
+        "job_id": job["job_id"],
+        "status_url": f"/interview/jobs/{job['job_id']}",
         "report_url": f"/interview/report/{req.session_id}"
     }
 
+@router.get("/jobs/{job_id}")
+def report_job_status(job_id: str):
+    job = report_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+@router.get("/{session_id}/metrics")
+def live_metrics(session_id: str):
+    session = session_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Invalid session")
+
+    return {
+        "session_id": session_id,
+        "total_questions": session["aggregates"].count,
+        "completed": session["end_time"] is not None,
+        "metrics": session["aggregates"].to_dict(),
+    }
+
+@router.get("/sessions/stats")
+def session_stats():
+    return session_manager.stats()
+
 @router.get("/report/{session_id}")
 def download_report(session_id: str):
+    job = report_jobs.for_session(session_id)
+    if job and job["status"] in (QUEUED, RUNNING):
+        return JSONResponse(
+            status_code=202,
+            content={"status": job["status"], "progress": job["progress"], "job_id": job["job_id"]},
+            headers={"Retry-After": "2"},
+        )
+    if job and job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=f"Report generation failed: {job['error']}")
+
     path = report_generator.get_path(session_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Report not found")
     return FileResponse(path, filename="Interview_Report.pdf")
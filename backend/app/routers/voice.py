@@ -0,0 +1,155 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import BaseModel
+
+from app import config
+from app.routers.interview import session_manager, voice_engine
+from app.services.voice_engine import AudioFormatError, TranscriptionStream, audio_media_type
+from app.utils.metrics import Histogram
+
+router = APIRouter(prefix="/voice", tags=["Voice"])
+
+STT_FINALIZE_SECONDS = Histogram(
+    "stt_finalize_seconds", "Time from the end of the upload to the final transcript"
+)
+
+# ---------- MODELS ----------
+
+class OpenStreamRequest(BaseModel):
+    sample_rate: int | None = None  # raw PCM only; WAV uploads carry their own
+    session_id: str | None = None
+
+class SpeechRequest(BaseModel):
+    text: str
+    voice: str | None = None
+    rate: int | None = None
+
+# ---------- HELPERS ----------
+
+def _open(sample_rate: int | None, session_id: str | None) -> TranscriptionStream:
+    try:
+        return voice_engine.open_stream(sample_rate, session_id)
+    except (ImportError, FileNotFoundError) as e:
+        raise HTTPException(503, f"Speech-to-text unavailable: {e}")
+    except RuntimeError as e:
+        raise HTTPException(501, str(e))
+    except OverflowError as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": "5"})
+
+def _stream_or_404(stream_id: str) -> TranscriptionStream:
+    stream = voice_engine.get_stream(stream_id)
+    if stream is None:
+        raise HTTPException(404, "Unknown or expired stream")
+    return stream
+
+async def _feed(stream: TranscriptionStream, data: bytes) -> str:
+    # Decoding is CPU-bound; keep it off the event loop
+    try:
+        text = await asyncio.to_thread(stream.feed, data)
+    except AudioFormatError as e:
+        voice_engine.close_stream(stream.stream_id)
+        raise HTTPException(415, str(e))
+    if stream.audio_seconds > config.VOICE_MAX_AUDIO_SECONDS:
+        voice_engine.close_stream(stream.stream_id)
+        raise HTTPException(413, f"Audio longer than {config.VOICE_MAX_AUDIO_SECONDS:.0f}s")
+    return text
+
+async def _finish(stream: TranscriptionStream) -> dict:
+    voice_engine.close_stream(stream.stream_id)
+    with STT_FINALIZE_SECONDS.time():
+        await asyncio.to_thread(stream.finish)
+    return stream.info()
+
+async def _speech(request: Request, text: str, voice: str | None = None, rate: int | None = None) -> Response:
+    try:
+        speech_id = voice_engine.speech_id(text, voice, rate)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+    # The audio for an id never changes, so clients may cache it for good
+    headers = {"ETag": f'"{speech_id}"', "Cache-Control": "public, max-age=31536000, immutable"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        _, audio = await voice_engine.atext_to_speech(text, voice, rate)
+    except ImportError as e:
+        raise HTTPException(503, f"Text-to-speech unavailable: {e}")
+    except Exception as e:
+        raise HTTPException(500, f"Text-to-speech failed: {e}")
+    return Response(audio, media_type=audio_media_type(audio), headers=headers)
+
+# ---------- ROUTES ----------
+
+@router.post("/streams")
+def open_stream(req: OpenStreamRequest):
+    """
+    Starts an incremental transcription. Post audio to
+    ``/voice/streams/{stream_id}/chunks`` while the candidate speaks,
+    then ``/finish`` for the transcript to submit as the answer.
+    """
+    return _open(req.sample_rate, req.session_id).info()
+
+@router.post("/streams/{stream_id}/chunks")
+async def add_chunk(stream_id: str, request: Request):
+    """Raw request body: the next piece of 16-bit mono PCM or WAV audio."""
+    stream = _stream_or_404(stream_id)
+    partial = await _feed(stream, await request.body())
+    return {
+        "stream_id": stream_id,
+        "partial": partial,
+        "audio_seconds": round(stream.audio_seconds, 3),
+    }
+
+@router.post("/streams/{stream_id}/finish")
+async def finish_stream(stream_id: str):
+    return await _finish(_stream_or_404(stream_id))
+
+@router.delete("/streams/{stream_id}")
+def cancel_stream(stream_id: str):
+    if voice_engine.close_stream(stream_id) is None:
+        raise HTTPException(404, "Unknown or expired stream")
+    return {"stream_id": stream_id, "status": "cancelled"}
+
+@router.post("/transcribe")
+async def transcribe(
+    request: Request,
+    sample_rate: int | None = Query(None, description="raw PCM only"),
+    session_id: str | None = None,
+):
+    """
+    Single-request variant: send the audio as a chunked upload
+    (``Transfer-Encoding: chunked``) while recording. Each piece is
+    decoded as it arrives, so only the tail is left when the body ends.
+    """
+    # The first stream loads the STT model; keep that off the event loop
+    stream = await asyncio.to_thread(_open, sample_rate, session_id)
+    buffer = bytearray()
+    try:
+        async for data in request.stream():
+            buffer += data
+            if len(buffer) >= config.VOICE_DECODE_BYTES:
+                await _feed(stream, bytes(buffer))
+                buffer.clear()
+        await _feed(stream, bytes(buffer))
+    except BaseException:
+        voice_engine.close_stream(stream.stream_id)
+        raise
+    return await _finish(stream)
+
+@router.post("/speech")
+async def synthesize(req: SpeechRequest, request: Request):
+    """Renders text to audio (WAV); repeated texts come from the cache."""
+    return await _speech(request, req.text, req.voice, req.rate)
+
+@router.get("/questions/{session_id}/speech")
+async def question_speech(session_id: str, request: Request):
+    """The session's current question as audio, for an ``<audio src>``."""
+    session = await session_manager.aget_session(session_id)
+    if not session or not session["questions"]:
+        raise HTTPException(404, "Invalid session")
+    return await _speech(request, session["questions"][-1])
+
+@router.get("/stats")
+def voice_stats():
+    return voice_engine.stats()
@@ -1,6 +1,9 @@
 class AnalyticsEngine:
-    def generate_metrics(self, evaluations: list[dict]) -> dict:
-        if not evaluations:
+    def generate_metrics(self, session) -> dict:
+        # Averages come from the session's running aggregates (O(1));
+        # trends are the per-turn score columns.
+        aggregates = session["aggregates"]
+        if not aggregates.count:
             return {
                 "summary": "No data available yet.",
                 "trends": {},
@@ -8,25 +11,20 @@ class AnalyticsEngine:
                 "total_questions": 0
             }
 
-        # ✅ SAFE extraction (no KeyError)
-        correctness = [e.get("correctness_score", 0) for e in evaluations]
-        confidence = [e.get("confidence_score", 0) for e in evaluations]
-        star = [e.get("star_score", 0) for e in evaluations]  # fallback = 0
-        readiness = [e.get("readiness_score", 0) for e in evaluations]
-
+        scores = session["scores"]
         return {
             "summary": "Interview performance analytics",
             "averages": {
-                "correctness": round(sum(correctness) / len(correctness), 2),
-                "confidence": round(sum(confidence) / len(confidence), 2),
-                "star": round(sum(star) / len(star), 2),
-                "readiness": round(sum(readiness) / len(readiness), 2),
+                "correctness": round(aggregates.mean("correctness"), 2),
+                "confidence": round(aggregates.mean("confidence"), 2),
+                "star": round(aggregates.mean("star"), 2),
+                "readiness": round(aggregates.mean("readiness"), 2),
             },
             "trends": {
-                "correctness": correctness,
-                "confidence": confidence,
-                "star": star,
-                "readiness": readiness
+                "correctness": scores["correctness_score"].tolist(),
+                "confidence": scores["confidence_score"].tolist(),
+                "star": scores["star_score"].tolist(),
+                "readiness": scores["readiness_score"].tolist()
             },
-            "total_questions": len(evaluations)
+            "total_questions": aggregates.count
         }
@@ -1,16 +1,38 @@
+import asyncio
 import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable
+from app import config
+from app.services.combined_evaluation import CombinedEvaluator
+from app.services.embedding_batcher import EmbeddingBatcher
 from app.services.semantic_evaluator import SemanticEvaluator
-from app.services.star_evaluation import STAREvaluator
+from app.services.star_evaluation import STAREvaluator, heuristic_star, star_result
+from app.utils.metrics import Histogram
+
+# Per-stage time inside answer scoring; "relevance" includes batcher queueing
+STAGE_SECONDS = Histogram(
+    "evaluation_stage_duration_seconds", "Answer scoring time by stage", ("stage",)
+)
+
+# Runs the LLM judgement alongside encoding for sync callers
+_judge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="judge")
 
 class AnswerEvaluator:
-    def __init__(self):
+    def __init__(self, mode: str = config.EVALUATION_MODE):
+        self.mode = mode
         self.semantic = SemanticEvaluator()
         self.star = STAREvaluator()
+        # "combined": STAR, correctness and follow-up from one LLM call
+        self.combined = CombinedEvaluator(self.star.llm) if mode == "combined" else None
+        self.batcher = None
+        if config.EMBEDDING_BATCH_ENABLED:
+            self.batcher = EmbeddingBatcher(
+                self.semantic,
+                max_batch_size=config.EMBEDDING_BATCH_MAX_SIZE,
+                max_wait_ms=config.EMBEDDING_BATCH_MAX_WAIT_MS,
+            )
 
-    def evaluate(self, question: str, answer: str) -> dict:
-        # ---- Semantic relevance (0–10) ----
-        relevance = self.semantic.similarity(question, answer)
-
+    def heuristic_scores(self, answer: str, relevance: float) -> dict:
         # ---- Length heuristic ----
         length_score = min(len(answer.split()) / 25, 1.0) * 10
 
@@ -29,10 +51,57 @@ class AnswerEvaluator:
             (relevance * 0.6 + length_score * 0.4), 2
         )
 
-        # ---- STAR evaluation (LLM) ----
-        star_eval = self.star.evaluate(question, answer)
+        return {
+            "relevance": relevance,
+            "length_score": length_score,
+            "confidence_score": confidence_score,
+            "correctness_score": correctness_score,
+        }
+
+    # ---------- LLM JUDGEMENT ----------
+    def _judgement(self, combined: dict | None, answer: str) -> dict:
+        if combined is None:
+            return {
+                "star": star_result(heuristic_star(answer), fallback=True),
+                "verdict": None,
+                "follow_up_question": None,
+            }
+        return {
+            "star": star_result(combined["star"]),
+            "verdict": combined,
+            "follow_up_question": combined["follow_up_question"],
+        }
+
+    def judge(self, question: str, answer: str) -> dict:
+        """STAR scores, plus verdict and follow-up in combined mode."""
+        if self.combined is None:
+            return {"star": self.star.evaluate(question, answer), "verdict": None, "follow_up_question": None}
+        return self._judgement(self.combined.evaluate(question, answer), answer)
+
+    async def ajudge(self, question: str, answer: str, followup: bool = True) -> dict:
+        """``followup=False``: the caller generates the follow-up itself (streaming)."""
+        with STAGE_SECONDS.labels("judge").time():
+            return await self._ajudge(question, answer, followup)
+
+    async def _ajudge(self, question: str, answer: str, followup: bool = True) -> dict:
+        if self.combined is None:
+            star_eval = await self.star.aevaluate(question, answer)
+            return {"star": star_eval, "verdict": None, "follow_up_question": None}
+        return self._judgement(await self.combined.aevaluate(question, answer, followup), answer)
+
+    def combine(self, scores: dict, judgement: dict) -> dict:
+        star_eval = judgement["star"]
+        verdict = judgement.get("verdict")
+        relevance = scores["relevance"]
+        length_score = scores["length_score"]
+        confidence_score = scores["confidence_score"]
+        correctness_score = scores["correctness_score"]
         star_score = star_eval["star_score"]
 
+        # ---- Blend the proxy with the LLM's correctness score when available ----
+        if verdict:
+            correctness_score = round((correctness_score + verdict["correctness"]) / 2, 2)
+
         # ---- Readiness score ----
         readiness_score = round(
             (correctness_score * 0.5 + confidence_score * 0.2 + star_score * 0.3),
@@ -51,8 +120,10 @@ class AnswerEvaluator:
             feedback.append("Structure your answer better using the STAR method.")
         if not feedback:
             feedback.append("Strong answer with good structure and clarity.")
+        if star_eval.get("fallback"):
+            feedback.append("Detailed scoring was unavailable; the STAR score is an estimate.")
 
-        return {
+        evaluation = {
             "relevance_score": round(relevance, 2),
             "correctness_score": correctness_score,
             "confidence_score": confidence_score,
@@ -61,3 +132,71 @@ class AnswerEvaluator:
             "readiness_score": readiness_score,
             "feedback": feedback
         }
+        if verdict:
+            evaluation["correctness_verdict"] = verdict["verdict"]
+        if star_eval.get("fallback"):
+            evaluation["scoring_fallback"] = True
+        return evaluation
+
+    async def arelevance(self, question: str, answer: str) -> float:
+        with STAGE_SECONDS.labels("relevance").time():
+            if self.batcher is not None:
+                return await self.batcher.similarity(question, answer)
+            # Encoding is CPU-bound, keep it off the event loop
+            return await asyncio.to_thread(self.semantic.similarity, question, answer)
+
+    def evaluate(self, question: str, answer: str) -> dict:
+        # ---- LLM judgement, started first since it is the slowest ----
+        judge_future = _judge_pool.submit(self.judge, question, answer)
+
+        # ---- Semantic relevance (0–10) ----
+        relevance = self.semantic.similarity(question, answer)
+        scores = self.heuristic_scores(answer, relevance)
+
+        return self.combine(scores, judge_future.result())
+
+    async def aevaluate(self, question: str, answer: str) -> dict:
+        evaluation, _ = await self.aevaluate_turn(question, answer)
+        return evaluation
+
+    async def aevaluate_turn(
+        self,
+        question: str,
+        answer: str,
+        followup: Callable[[dict], Awaitable[str]] | None = None,
+    ) -> tuple[dict, str | None]:
+        """
+        Evaluates one answer with the independent stages overlapped.
+
+        Embedding similarity and the LLM judgement start together. In
+        separate mode the optional ``followup`` coroutine only needs the
+        heuristic scores, so it starts as soon as similarity finishes
+        instead of waiting for STAR. In combined mode the judgement
+        already carries the follow-up, and ``followup`` only runs if
+        that call failed. Returns ``(evaluation, followup_result)``.
+        """
+        judge_task = asyncio.create_task(self.ajudge(question, answer))
+        followup_task = None
+
+        try:
+            relevance = await self.arelevance(question, answer)
+            scores = self.heuristic_scores(answer, relevance)
+
+            if followup is not None and self.combined is None:
+                followup_task = asyncio.create_task(followup(scores))
+
+            judgement = await judge_task
+            if followup_task:
+                followup_result = await followup_task
+            elif followup is not None:
+                followup_result = judgement["follow_up_question"] or await followup(scores)
+            else:
+                followup_result = None
+        except BaseException:
+            # Don't leave orphaned LLM calls running after a failure
+            judge_task.cancel()
+            if followup_task:
+                followup_task.cancel()
+            raise
+
+        return self.combine(scores, judgement), followup_result
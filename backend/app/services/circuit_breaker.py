@@ -0,0 +1,151 @@
+import logging
+import threading
+import time
+from typing import Awaitable, Callable
+
+from app.utils.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+PROBING = "probing"
+
+BREAKER_REJECTED = Counter(
+    "llm_breaker_rejected_total", "LLM calls failed fast because the circuit was open"
+)
+BREAKER_TRANSITIONS = Counter(
+    "llm_breaker_transitions_total", "Circuit breaker state changes", ("state",)
+)
+
+
+class LLMUnavailable(RuntimeError):
+    """Raised instead of calling Ollama while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Fails LLM calls fast after Ollama stops responding.
+
+    ``threshold`` consecutive failures (timeouts, connection errors,
+    5xx) open the circuit: calls raise ``LLMUnavailable`` at once so
+    callers go straight to their fallbacks. After ``cooldown`` seconds
+    the next caller runs a cheap probe; success closes the circuit,
+    failure reopens it with the cooldown doubled up to ``max_cooldown``.
+    Calls arriving during the probe still fail fast.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 15.0, max_cooldown: float = 120.0):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = cooldown
+        self.open_until = 0.0
+
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    # ---------- STATE (call with the lock held) ----------
+    def _set_state(self, state: str):
+        self.state = state
+        BREAKER_TRANSITIONS.labels(state).inc()
+
+    def _open(self):
+        self.open_until = time.monotonic() + self.cooldown
+        self.opened += 1
+        self._set_state(OPEN)
+        logger.warning("Ollama circuit open for %.0fs", self.cooldown)
+
+    def _reject(self):
+        self.rejected += 1
+        BREAKER_REJECTED.inc()
+        raise LLMUnavailable(f"Ollama unavailable, retry in {self.retry_after():.0f}s")
+
+    def _should_probe(self) -> bool:
+        """True if this caller must run the probe; raises while the circuit is open."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            if self.state == PROBING or time.monotonic() < self.open_until:
+                self._reject()
+            self._set_state(PROBING)
+            return True
+
+    def _probed(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.failures = 0
+                self.cooldown = self.base_cooldown
+                self._set_state(CLOSED)
+                logger.info("Ollama circuit closed after successful probe")
+            else:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open()
+
+    # ---------- GUARDS ----------
+    def check(self, probe: Callable[[], bool]):
+        """Call before an Ollama request from a thread."""
+        if not self._should_probe():
+            return
+        try:
+            ok = probe()
+        except Exception:
+            ok = False
+        self._probed(ok)
+        if not ok:
+            with self._lock:
+                self._reject()
+
+    async def acheck(self, probe: Callable[[], Awaitable[bool]]):
+        """Call before an Ollama request from a coroutine."""
+        if not self._should_probe():
+            return
+        try:
+            ok = await probe()
+        except Exception:
+            ok = False
+        except BaseException:
+            # Cancelled mid-probe: reopen rather than stay stuck probing
+            self._probed(False)
+            raise
+        self._probed(ok)
+        if not ok:
+            with self._lock:
+                self._reject()
+
+    def record_success(self):
+        if self.failures:
+            with self._lock:
+                self.failures = 0
+
+    def record_failure(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.failures += 1
+            if self.state == CLOSED and self.failures >= self.threshold:
+                self._open()
+
+    def retry_after(self) -> float:
+        return max(self.open_until - time.monotonic(), 0.0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "retry_after_s": round(self.retry_after(), 1) if self.state != CLOSED else 0.0,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,273 @@
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+# Per-session average scores recorded for every finished interview
+COHORT_METRICS = ("correctness", "confidence", "star", "readiness", "relevance")
+SUMMARY_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+class _Cohort:
+    """
+    Columnar score storage for one (role, domain, difficulty) cohort.
+
+    ``sorted`` keeps one row per metric sorted in place, so percentile
+    and histogram queries are binary searches rather than scans.
+    """
+
+    __slots__ = ("sorted", "n")
+
+    def __init__(self, capacity: int = 1024):
+        self.sorted = np.empty((len(COHORT_METRICS), capacity), dtype=np.float32)
+        self.n = 0
+
+    def add(self, vector: np.ndarray):
+        n = self.n
+        if n == self.sorted.shape[1]:
+            grown = np.empty((self.sorted.shape[0], n * 2), dtype=np.float32)
+            grown[:, :n] = self.sorted[:, :n]
+            self.sorted = grown
+
+        for m, value in enumerate(vector):
+            row = self.sorted[m]
+            pos = np.searchsorted(row[:n], value)
+            row[pos + 1:n + 1] = row[pos:n]
+            row[pos] = value
+
+        self.n = n + 1
+
+    def view(self) -> np.ndarray:
+        return self.sorted[:, :self.n]
+
+
+class CohortStore:
+    """
+    Finished-session score vectors grouped by (role, domain, difficulty).
+
+    Queries are vectorized over the sorted columns. Percentiles are two
+    ``searchsorted`` calls per metric. Histograms count by searching
+    for the bin edges. Quantiles index straight into the sorted data.
+    Queries that leave out part of the key merge the matching cohorts
+    and cache the merge until one of them changes.
+
+    With ``db_path`` (the shared session database) sessions are appended
+    to a ``cohort_scores`` table instead of the .npz snapshot, and every
+    query first folds in rows added since the last one, by any worker.
+    """
+
+    def __init__(self, path: str | None = None, save_every: int = 100, db_path: str | None = None):
+        self.path = None if db_path else path
+        self.save_every = save_every
+        self._unsaved = 0
+        self._cohorts: dict[tuple, _Cohort] = {}
+        self._merged: dict[tuple, tuple[int, np.ndarray]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._synced = 0  # last cohort_scores id folded in
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA busy_timeout=5000")
+            columns = ", ".join(f"{m} REAL NOT NULL" for m in COHORT_METRICS)
+            self._db.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS cohort_scores (
+                    id INTEGER PRIMARY KEY,
+                    role TEXT NOT NULL,
+                    domain TEXT NOT NULL,
+                    difficulty TEXT NOT NULL,
+                    {columns}
+                )
+                """
+            )
+        elif path and os.path.exists(path):
+            self.load()
+
+    @staticmethod
+    def key(role: str, domain: str, difficulty: str) -> tuple:
+        return tuple(v.strip().lower() for v in (role, domain, difficulty))
+
+    # ---------- WRITE ----------
+    def add(self, role: str, domain: str, difficulty: str, averages: dict) -> bool:
+        """Record one finished session. Returns True when a save is due."""
+        vector = np.array(
+            [averages.get(m, 0.0) for m in COHORT_METRICS], dtype=np.float32
+        )
+        key = self.key(role, domain, difficulty)
+        with self._lock:
+            if self._db is not None:
+                # Blocking write: async callers run this in a thread
+                self._db.execute(
+                    f"INSERT INTO cohort_scores (role, domain, difficulty, {', '.join(COHORT_METRICS)}) "
+                    f"VALUES ({', '.join('?' * (3 + len(COHORT_METRICS)))})",
+                    (*key, *map(float, vector)),
+                )
+                self._sync()
+                return False
+            self._add(key, vector)
+            self._unsaved += 1
+            return bool(self.path) and self._unsaved >= self.save_every
+
+    def _add(self, key: tuple, vector: np.ndarray):
+        # Call with the lock held
+        cohort = self._cohorts.get(key)
+        if cohort is None:
+            cohort = self._cohorts[key] = _Cohort()
+        cohort.add(vector)
+        self._version += 1
+
+    def _sync(self):
+        # Call with the lock held: fold in rows other workers appended
+        if self._db is None:
+            return
+        rows = self._db.execute(
+            f"SELECT id, role, domain, difficulty, {', '.join(COHORT_METRICS)} "
+            "FROM cohort_scores WHERE id > ? ORDER BY id",
+            (self._synced,),
+        ).fetchall()
+        for row in rows:
+            self._add(tuple(row[1:4]), np.array(row[4:], dtype=np.float32))
+        if rows:
+            self._synced = rows[-1][0]
+
+    # ---------- READ ----------
+    def _select(self, role=None, domain=None, difficulty=None) -> np.ndarray:
+        """Sorted (metrics x n) matrix for the cohort(s) matching the filter."""
+        self._sync()
+        wanted = tuple(v.strip().lower() if v else None for v in (role, domain, difficulty))
+        if all(wanted):
+            cohort = self._cohorts.get(wanted)
+            return cohort.view() if cohort else np.empty((len(COHORT_METRICS), 0), np.float32)
+
+        cached = self._merged.get(wanted)
+        if cached and cached[0] == self._version:
+            return cached[1]
+
+        parts = [
+            c.view() for k, c in self._cohorts.items()
+            if all(w is None or w == v for w, v in zip(wanted, k))
+        ]
+        if parts:
+            merged = np.sort(np.concatenate(parts, axis=1), axis=1)
+        else:
+            merged = np.empty((len(COHORT_METRICS), 0), np.float32)
+        self._merged[wanted] = (self._version, merged)
+        return merged
+
+    def percentiles(self, scores: dict, role=None, domain=None, difficulty=None) -> dict:
+        """Percentile rank (0-100) of ``scores`` within the cohort, per metric."""
+        with self._lock:
+            data = self._select(role, domain, difficulty)
+        n = data.shape[1]
+        result = {}
+        for m, metric in enumerate(COHORT_METRICS):
+            if metric not in scores or not n:
+                continue
+            value = np.float32(scores[metric])
+            below = np.searchsorted(data[m], value, side="left")
+            at_or_below = np.searchsorted(data[m], value, side="right")
+            # Ties count half (mid-rank percentile)
+            result[metric] = round(float((below + at_or_below) / 2 / n * 100), 1)
+        return {"cohort_size": n, "percentiles": result}
+
+    def histogram(self, metric: str, bins: int = 10, value_range=(0.0, 10.0),
+                  role=None, domain=None, difficulty=None) -> dict:
+        m = COHORT_METRICS.index(metric)
+        edges = np.linspace(value_range[0], value_range[1], bins + 1, dtype=np.float32)
+        with self._lock:
+            column = self._select(role, domain, difficulty)[m]
+        positions = np.searchsorted(column, edges, side="left")
+        positions[-1] = np.searchsorted(column, edges[-1], side="right")  # closed last bin
+        return {
+            "metric": metric,
+            "edges": [round(float(e), 3) for e in edges],
+            "counts": np.diff(positions).tolist(),
+        }
+
+    def summary(self, role=None, domain=None, difficulty=None) -> dict:
+        with self._lock:
+            data = self._select(role, domain, difficulty)
+        n = data.shape[1]
+        if not n:
+            return {"cohort_size": 0, "metrics": {}}
+
+        # Linear-interpolated quantiles straight from the sorted rows
+        q = np.asarray(SUMMARY_QUANTILES) * (n - 1)
+        lo = np.floor(q).astype(int)
+        hi = np.minimum(lo + 1, n - 1)
+        frac = (q - lo).astype(np.float32)
+        quantiles = data[:, lo] * (1 - frac) + data[:, hi] * frac
+
+        means = data.mean(axis=1, dtype=np.float64)
+        stds = data.std(axis=1, dtype=np.float64)
+
+        return {
+            "cohort_size": n,
+            "metrics": {
+                metric: {
+                    "mean": round(float(means[m]), 2),
+                    "std": round(float(stds[m]), 2),
+                    **{
+                        f"p{int(p * 100)}": round(float(quantiles[m, i]), 2)
+                        for i, p in enumerate(SUMMARY_QUANTILES)
+                    },
+                }
+                for m, metric in enumerate(COHORT_METRICS)
+            },
+        }
+
+    def compare(self, scores: dict, role=None, domain=None, difficulty=None) -> dict:
+        """Candidate vs cohort: percentile rank and distance from the median."""
+        ranking = self.percentiles(scores, role, domain, difficulty)
+        summary = self.summary(role, domain, difficulty)
+        deltas = {
+            metric: round(float(scores[metric]) - stats["p50"], 2)
+            for metric, stats in summary["metrics"].items()
+            if metric in scores
+        }
+        return {
+            "cohort_size": ranking["cohort_size"],
+            "percentiles": ranking["percentiles"],
+            "vs_median": deltas,
+            "cohort": summary["metrics"],
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return sum(c.n for c in self._cohorts.values())
+
+    def cohorts(self) -> list[dict]:
+        with self._lock:
+            self._sync()
+            return [
+                {"role": k[0], "domain": k[1], "difficulty": k[2], "sessions": c.n}
+                for k, c in self._cohorts.items()
+            ]
+
+    # ---------- PERSISTENCE ----------
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            keys = np.array(["\x1f".join(k) for k in self._cohorts], dtype=str)
+            arrays = {f"c{i}": c.view().copy() for i, c in enumerate(self._cohorts.values())}
+            self._unsaved = 0
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp.npz"
+        np.savez(tmp, keys=keys, **arrays)
+        os.replace(tmp, self.path)
+
+    def load(self):
+        with np.load(self.path) as data:
+            keys = data["keys"].tolist()
+            for i, joined in enumerate(keys):
+                view = data[f"c{i}"]
+                cohort = _Cohort(capacity=max(1024, view.shape[1] * 2))
+                cohort.sorted[:, :view.shape[1]] = view
+                cohort.n = view.shape[1]
+                self._cohorts[tuple(joined.split("\x1f"))] = cohort
@@ -0,0 +1,206 @@
+import logging
+
+from app.services.local_llm import LocalLLM
+from app.services.star_evaluation import parse_json_object, to_number, validate_star
+
+logger = logging.getLogger(__name__)
+
+VERDICTS = ("correct", "partial", "incorrect")
+_VERDICT_ALIASES = {
+    "yes": "correct",
+    "partially": "partial",
+    "partially correct": "partial",
+    "partially_correct": "partial",
+    "no": "incorrect",
+}
+
+
+def combined_prompt(question: str, answer: str, followup: bool = True) -> str:
+    if not followup:
+        # The caller streams the follow-up separately (SSE)
+        return f"""
+You are a senior interviewer evaluating one answer.
+
+Question:
+{question}
+
+Candidate answer:
+{answer}
+
+Do two things:
+1. Score the answer on the STAR method, each dimension from 0 to 2.5.
+2. Judge correctness with respect to the question only (score 0 to 10).
+
+Return ONLY this JSON:
+{{
+  "star": {{"situation": <float>, "task": <float>, "action": <float>, "result": <float>}},
+  "correctness": {{"verdict": "correct | partial | incorrect", "score": <float>}}
+}}
+"""
+    return f"""
+You are a senior interviewer evaluating one answer.
+
+Question:
+{question}
+
+Candidate answer:
+{answer}
+
+Do three things:
+1. Score the answer on the STAR method, each dimension from 0 to 2.5.
+2. Judge correctness with respect to the question only (score 0 to 10).
+3. Ask ONE deeper follow-up interview question.
+
+Return ONLY this JSON:
+{{
+  "star": {{"situation": <float>, "task": <float>, "action": <float>, "result": <float>}},
+  "correctness": {{"verdict": "correct | partial | incorrect", "score": <float>}},
+  "follow_up_question": "<question>"
+}}
+"""
+
+
+def repair_prompt(prompt: str, response: str | None, errors: list[str]) -> str:
+    problems = "\n".join(f"- {e}" for e in errors)
+    return f"""{prompt}
+
+Your previous reply did not match the required JSON:
+{response or "(empty)"}
+
+Problems:
+{problems}
+
+Return ONLY the corrected JSON.
+"""
+
+
+def validate_combined(data, followup: bool = True) -> tuple[dict | None, list[str]]:
+    """
+    Validated, normalized evaluation plus the list of schema problems.
+    With ``followup=False`` the follow-up question isn't required (None).
+    """
+    if not isinstance(data, dict):
+        return None, ["response is not a JSON object"]
+
+    errors: list[str] = []
+    star = validate_star(data.get("star"), errors, "star.")
+
+    verdict = score = None
+    correctness = data.get("correctness")
+    if not isinstance(correctness, dict):
+        errors.append("correctness: expected an object with verdict and score")
+    else:
+        raw = str(correctness.get("verdict", "")).strip().lower()
+        verdict = _VERDICT_ALIASES.get(raw, raw)
+        if verdict not in VERDICTS:
+            errors.append(f"correctness.verdict: expected one of {', '.join(VERDICTS)}")
+        score = to_number(correctness.get("score"))
+        if score is None:
+            errors.append("correctness.score: expected a number from 0 to 10")
+
+    question = data.get("follow_up_question")
+    if followup and (not isinstance(question, str) or not question.strip()):
+        errors.append("follow_up_question: expected a non-empty string")
+
+    if errors:
+        return None, errors
+    return {
+        "star": star,
+        "verdict": verdict,
+        "correctness": round(min(max(score, 0.0), 10.0), 2),
+        "follow_up_question": question.strip() if followup else None,
+    }, []
+
+
+class CombinedEvaluator:
+    """
+    One Ollama round trip per answer for the STAR breakdown, the
+    correctness verdict and the follow-up question.
+
+    Output is constrained with ``format: json`` and validated. An
+    invalid reply gets ``repair_attempts`` extra calls that show the
+    model its output and the problems. Returns ``None`` when it still
+    doesn't validate, so callers fall back explicitly.
+    """
+
+    def __init__(self, llm: LocalLLM | None = None, repair_attempts: int = 1):
+        self.llm = llm or LocalLLM()
+        self.repair_attempts = repair_attempts
+
+        self.calls = 0
+        self.repaired = 0
+        self.failed = 0
+
+    @staticmethod
+    def _check(response: str | None, followup: bool = True) -> tuple[dict | None, list[str]]:
+        return validate_combined(parse_json_object(response), followup)
+
+    @classmethod
+    def _acceptable(cls, response: str) -> bool:
+        return cls._check(response)[0] is not None
+
+    @classmethod
+    def _acceptable_without_followup(cls, response: str) -> bool:
+        return cls._check(response, followup=False)[0] is not None
+
+    def _record(self, result: dict | None, attempt: int, errors: list[str]) -> dict | None:
+        if result is None:
+            self.failed += 1
+            logger.warning("Combined evaluation failed validation: %s", "; ".join(errors))
+        elif attempt:
+            self.repaired += 1
+        return result
+
+    def evaluate(self, question: str, answer: str) -> dict | None:
+        self.calls += 1
+        prompt = combined_prompt(question, answer)
+        result, errors, response = None, [], None
+        try:
+            for attempt in range(self.repair_attempts + 1):
+                if attempt == 0:
+                    response = self.llm.generate(
+                        prompt, format="json", validate=self._acceptable, caller="evaluation"
+                    )
+                else:
+                    response = self.llm.generate(
+                        repair_prompt(prompt, response, errors), format="json", cache=False,
+                        caller="evaluation_repair",
+                    )
+                result, errors = self._check(response)
+                if result is not None:
+                    break
+        except Exception as e:
+            errors = [str(e)]
+        return self._record(result, attempt, errors)
+
+    async def aevaluate(self, question: str, answer: str, followup: bool = True) -> dict | None:
+        """``followup=False`` leaves the follow-up question out, for callers that stream it."""
+        self.calls += 1
+        prompt = combined_prompt(question, answer, followup)
+        acceptable = self._acceptable if followup else self._acceptable_without_followup
+        result, errors, response = None, [], None
+        try:
+            for attempt in range(self.repair_attempts + 1):
+                if attempt == 0:
+                    response = await self.llm.agenerate(
+                        prompt, format="json", validate=acceptable, caller="evaluation"
+                    )
+                else:
+                    response = await self.llm.agenerate(
+                        repair_prompt(prompt, response, errors), format="json", cache=False,
+                        caller="evaluation_repair",
+                    )
+                result, errors = self._check(response, followup)
+                if result is not None:
+                    break
+        except Exception as e:
+            errors = [str(e)]
+        return self._record(result, attempt, errors)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "repaired": self.repaired,
+            "failed": self.failed,
+            "fallback_rate": round(self.failed / self.calls, 4) if self.calls else 0.0,
+        }
@@ -0,0 +1,50 @@
+import contextvars
+import time
+
+# Absolute monotonic time by which the current request must be answered.
+# Like ``current_session`` it follows into tasks and asyncio.to_thread.
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "llm_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the request's LLM time budget is spent."""
+
+
+def set_budget(seconds: float | None):
+    """
+    Gives the current request ``seconds`` for all of its LLM calls.
+    Every stage of a turn (queueing, scoring, repair, follow-up) draws
+    from the same budget. An outer, tighter deadline is kept. ``None``
+    or 0 leaves the request without a budget.
+    """
+    if not seconds:
+        return
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    _deadline.set(deadline if outer is None else min(outer, deadline))
+
+
+def clear():
+    """Removes the budget from the current context (for work shared between requests)."""
+    _deadline.set(None)
+
+
+def remaining() -> float | None:
+    """Seconds left in the budget, or None when there is no budget."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_timeout(default: float) -> float:
+    """
+    Timeout for the next call: ``default`` cut down to the remaining
+    budget. Raises ``DeadlineExceeded`` when nothing is left.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("request time budget exhausted")
+    return min(default, left)
@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import numpy as np
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+MAX_SEQ_LENGTH = 256  # same truncation as the sentence-transformers config
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_QUANTIZED_FILE = "model_quantized.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class SentenceTransformerBackend:
+    """Reference PyTorch backend (sentence-transformers)."""
+
+    name = "torch"
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        ).astype(np.float32)
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime backend for CPU-only nodes.
+
+    Expects a directory produced by ``scripts/export_onnx.py``. Mean
+    pooling and L2 normalization mirror the sentence-transformers
+    pipeline so scores stay comparable with the torch backend.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str, quantized: bool = True, threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        model_file = model_dir / (ONNX_QUANTIZED_FILE if quantized else ONNX_MODEL_FILE)
+        if not model_file.exists():
+            raise FileNotFoundError(
+                f"{model_file} not found; run scripts/export_onnx.py first"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.inter_op_num_threads = 1
+        if threads > 0:
+            options.intra_op_num_threads = threads
+
+        self.session = ort.InferenceSession(
+            str(model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real (non-padding) tokens
+        mask = attention_mask[..., None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        pooled = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+def cache_namespace(name: str, onnx_dir: str = "", quantized: bool = True) -> str:
+    """
+    Embedding cache namespace for a backend configuration. ONNX vectors
+    are tied to the exact model file (quantized or not, and re-exports),
+    since int8 and fp32 embeddings differ slightly.
+    """
+    if name != "onnx":
+        return name
+    model_file = Path(onnx_dir).resolve() / (ONNX_QUANTIZED_FILE if quantized else ONNX_MODEL_FILE)
+    try:
+        stat = model_file.stat()
+    except OSError:
+        return f"onnx:{model_file}"
+    return f"onnx:{model_file}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def create_backend(name: str, onnx_dir: str = "", quantized: bool = True, threads: int = 0):
+    if name == "torch":
+        return SentenceTransformerBackend()
+    if name == "onnx":
+        return OnnxBackend(onnx_dir, quantized=quantized, threads=threads)
+    raise ValueError(f"Unknown embedding backend: {name}")
@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+from app.services.semantic_evaluator import SemanticEvaluator
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent similarity requests into batched forward passes.
+
+    Callers await ``similarity()``; a single worker task collects queued
+    pairs for up to ``max_wait_ms`` or ``max_batch_size`` items, scores
+    them with one ``similarity_many`` call in a worker thread, and
+    resolves each caller's future.
+    """
+
+    def __init__(
+        self,
+        semantic: SemanticEvaluator,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self.semantic = semantic
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        # ---- metrics ----
+        self.batches = 0
+        self.items = 0
+        self.last_batch_size = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.batch_size_counts = {b: 0 for b in BATCH_SIZE_BUCKETS}
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def similarity(self, q: str, a: str) -> float:
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self._queue.put_nowait(((q, a), future, time.perf_counter()))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Callers that gave up (e.g. client disconnect) don't need scoring
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            self._record(batch)
+            pairs = [pair for pair, _, _ in batch]
+            try:
+                scores = await asyncio.to_thread(self.semantic.similarity_many, pairs)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future, _), score in zip(batch, scores):
+                if not future.done():
+                    future.set_result(score)
+
+    def _record(self, batch: list):
+        now = time.perf_counter()
+        size = len(batch)
+        self.batches += 1
+        self.items += size
+        self.last_batch_size = size
+        self.total_wait += sum(now - enqueued for _, _, enqueued in batch)
+        bucket = next((b for b in BATCH_SIZE_BUCKETS if size <= b), BATCH_SIZE_BUCKETS[-1])
+        self.batch_size_counts[bucket] += 1
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "batches": self.batches,
+            "items": self.items,
+            "last_batch_size": self.last_batch_size,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "avg_queue_wait_ms": round(self.total_wait / self.items * 1000, 3) if self.items else 0.0,
+            "batch_size_counts": {f"le_{b}": n for b, n in self.batch_size_counts.items()},
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU of sentence embeddings keyed by a hash of the text.
+
+    When ``path`` is set the cache can be saved to / loaded from a
+    single ``.npz`` file (hash keys plus one stacked float32 matrix).
+    ``namespace`` is mixed into every key so vectors from different
+    embedding models (backend, ONNX file) never mix.
+    """
+
+    def __init__(self, max_entries: int = 20_000, path: str | None = None, namespace: str = ""):
+        self.max_entries = max_entries
+        self.path = path
+        self.namespace = namespace
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def key(self, text: str) -> str:
+        raw = f"{self.namespace}\0{text}" if self.namespace else text
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_many(self, texts: list[str]) -> list[np.ndarray | None]:
+        found = []
+        with self._lock:
+            for text in texts:
+                k = self.key(text)
+                vec = self._entries.get(k)
+                if vec is None:
+                    self.misses += 1
+                else:
+                    self._entries.move_to_end(k)
+                    self.hits += 1
+                found.append(vec)
+        return found
+
+    def put_many(self, texts: list[str], vectors: np.ndarray):
+        with self._lock:
+            for text, vec in zip(texts, vectors):
+                k = self.key(text)
+                self._entries[k] = vec
+                self._entries.move_to_end(k)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------- PERSISTENCE ----------
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._entries:
+                return
+            keys = np.array(list(self._entries.keys()))
+            matrix = np.stack(list(self._entries.values())).astype(np.float32)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp.npz"
+        np.savez(tmp, keys=keys, vectors=matrix)
+        os.replace(tmp, self.path)
+
+    def load(self):
+        with np.load(self.path) as data:
+            keys, matrix = data["keys"], data["vectors"]
+        with self._lock:
+            # Keep the most recently saved entries if the file is larger
+            for k, vec in list(zip(keys.tolist(), matrix))[-self.max_entries:]:
+                self._entries[k] = vec
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
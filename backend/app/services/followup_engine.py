@@ -1,4 +1,8 @@
 from app.services.local_llm import LocalLLM
+
+# Asked when the LLM can't produce a follow-up in time
+FALLBACK_FOLLOWUP = "Can you explain that in a bit more detail?"
+
 class FollowUpEngine:
     def __init__(self):
         self.llm = LocalLLM()
@@ -39,7 +43,7 @@ Rules:
 """
 
         try:
-            followup = self.llm.generate(prompt)
+            followup = self.llm.generate(prompt, caller="followup")
             return followup.strip()
         except Exception:
-            return "Can you explain that in a bit more detail?"
+            return FALLBACK_FOLLOWUP
@@ -1,55 +1,58 @@
 from app.services.local_llm import LocalLLM
+from app.utils.running_stats import SessionAggregates
+
+FALLBACK_SUMMARY = "Focus on improving clarity, structure, and conceptual understanding."
+
+# Averages are rounded to this step in the prompt (which is also the LLM
+# cache key), so sessions with near-identical scores share one plan
+PROMPT_SCORE_STEP = 0.5
+
+
+def _bucket(value: float) -> float:
+    return round(value / PROMPT_SCORE_STEP) * PROMPT_SCORE_STEP
 
 
 class ImprovementPlanEngine:
     def __init__(self):
         self.llm = LocalLLM()
 
-    def generate_plan(self, evaluations: list[dict]) -> dict:
-        """
-        Generates a personalized improvement plan
-        based on past evaluations.
-        """
-
-        if not evaluations:
-            return {
-                "summary": "No evaluations available yet.",
-                "focus_areas": [],
-                "action_items": []
-            }
-
-        # Aggregate signals
-        avg_correctness = sum(e["correctness_score"] for e in evaluations) / len(evaluations)
-        avg_confidence = sum(e["confidence_score"] for e in evaluations) / len(evaluations)
-        avg_star = sum(e["star_score"] for e in evaluations) / len(evaluations)
+    def _diagnose(self, aggregates: SessionAggregates) -> tuple[dict, list, list]:
+        # Aggregate signals (maintained incrementally per answer)
+        averages = {
+            "correctness": aggregates.mean("correctness"),
+            "confidence": aggregates.mean("confidence"),
+            "star": aggregates.mean("star"),
+        }
 
         focus_areas = []
         action_items = []
 
         # Rule-based diagnosis
-        if avg_correctness < 6:
+        if averages["correctness"] < 6:
             focus_areas.append("Technical understanding")
             action_items.append("Review core concepts related to recent questions.")
             action_items.append("Practice explaining concepts in simple terms.")
 
-        if avg_confidence < 6:
+        if averages["confidence"] < 6:
             focus_areas.append("Confidence and clarity")
             action_items.append("Reduce filler words and hesitant phrases.")
             action_items.append("Practice answering aloud with structured responses.")
 
-        if avg_star < 2:
+        if averages["star"] < 2:
             focus_areas.append("Answer structure (STAR method)")
             action_items.append("Practice framing answers using Situation, Task, Action, Result.")
 
-        # LLM-enhanced coaching (optional but powerful)
-        try:
-            prompt = f"""
+        return averages, focus_areas, action_items
+
+    def _prompt(self, averages: dict) -> str:
+        averages = {name: _bucket(value) for name, value in averages.items()}
+        return f"""
 You are an interview coach.
 
 Candidate performance summary:
-- Average correctness score: {avg_correctness}/10
-- Average confidence score: {avg_confidence}/10
-- Average STAR score: {avg_star}/4
+- Average correctness score: {averages["correctness"]}/10
+- Average confidence score: {averages["confidence"]}/10
+- Average STAR score: {averages["star"]}/4
 
 Generate:
 1. A short improvement summary
@@ -59,13 +62,64 @@ Generate:
 Respond concisely.
 """
 
-            llm_response = self.llm.generate(prompt)
+    def generate_plan(self, aggregates: SessionAggregates) -> dict:
+        """
+        Generates a personalized improvement plan
+        based on the session's running score aggregates.
+        """
+
+        if not aggregates.count:
+            return self._empty_plan()
+
+        averages, focus_areas, action_items = self._diagnose(aggregates)
+
+        # LLM-enhanced coaching (optional but powerful)
+        try:
+            llm_response = self.llm.generate(self._prompt(averages), caller="improvement")
+        except Exception:
+            llm_response = FALLBACK_SUMMARY
+
+        return {
+            "summary": llm_response,
+            "focus_areas": focus_areas,
+            "action_items": action_items
+        }
+
+    async def agenerate_plan(self, aggregates: SessionAggregates) -> dict:
+        if not aggregates.count:
+            return self._empty_plan()
+
+        averages, focus_areas, action_items = self._diagnose(aggregates)
 
+        try:
+            llm_response = await self.llm.agenerate(self._prompt(averages), caller="improvement")
         except Exception:
-            llm_response = "Focus on improving clarity, structure, and conceptual understanding."
+            llm_response = FALLBACK_SUMMARY
 
         return {
             "summary": llm_response,
             "focus_areas": focus_areas,
             "action_items": action_items
         }
+
+    def diagnose_plan(self, aggregates: SessionAggregates) -> dict:
+        """
+        Rule-based part of the plan only, without the LLM summary
+        (``summary`` is None). Cheap enough to compute inline.
+        """
+        if not aggregates.count:
+            return self._empty_plan()
+
+        _, focus_areas, action_items = self._diagnose(aggregates)
+        return {
+            "summary": None,
+            "focus_areas": focus_areas,
+            "action_items": action_items
+        }
+
+    def _empty_plan(self) -> dict:
+        return {
+            "summary": "No evaluations available yet.",
+            "focus_areas": [],
+            "action_items": []
+        }
@@ -0,0 +1,117 @@
+import threading
+from array import array
+from collections import OrderedDict
+
+from app.utils.metrics import Counter
+
+CONTEXT_REUSED = Counter(
+    "llm_context_reused_total", "Conversation turns that continued from a stored Ollama context"
+)
+CONTEXT_RESET = Counter(
+    "llm_context_reset_total", "Stored Ollama contexts dropped", ("reason",)
+)
+
+
+class _Conversation:
+    __slots__ = ("context", "last_reply")
+
+    def __init__(self, context: array, last_reply: str):
+        self.context = context  # compact int32 tokens, not a list of ints
+        self.last_reply = last_reply
+
+
+class ConversationStore:
+    """
+    Per-session Ollama conversation state.
+
+    ``/api/generate`` returns a ``context`` token array that encodes the
+    prompt and reply so far; sending it back with the next prompt lets
+    Ollama continue the conversation and prefill only the new text
+    instead of the whole transcript.
+
+    Contexts longer than ``max_tokens`` are dropped, so the next turn
+    starts a fresh conversation instead of overflowing the model's
+    window. At most ``max_sessions`` are kept (least recently used
+    first out), and ``evict`` drops sessions as they leave the
+    session store.
+    """
+
+    def __init__(self, max_tokens: int = 3072, max_sessions: int = 1000):
+        self.max_tokens = max_tokens
+        self.max_sessions = max_sessions
+        self._conversations: OrderedDict[str, _Conversation] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.reused = 0
+        self.resets = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_tokens > 0 and self.max_sessions > 0
+
+    def context(self, session_id: str) -> list[int] | None:
+        """The stored context to send with the session's next prompt."""
+        with self._lock:
+            conversation = self._conversations.get(session_id)
+            if conversation is None:
+                return None
+            self._conversations.move_to_end(session_id)
+            self.reused += 1
+        CONTEXT_REUSED.inc()
+        return conversation.context.tolist()
+
+    def last_reply(self, session_id: str) -> str | None:
+        with self._lock:
+            conversation = self._conversations.get(session_id)
+            return conversation.last_reply if conversation else None
+
+    def update(self, session_id: str, context: list[int] | None, reply: str):
+        if not context:
+            return
+        if len(context) > self.max_tokens:
+            self._drop([session_id], "max_tokens")
+            return
+
+        with self._lock:
+            self._conversations.pop(session_id, None)
+            self._conversations[session_id] = _Conversation(array("i", context), reply)
+            overflow = len(self._conversations) - self.max_sessions
+            evicted = [
+                self._conversations.popitem(last=False)[0] for _ in range(max(overflow, 0))
+            ]
+        if evicted:
+            self.resets += len(evicted)
+            CONTEXT_RESET.labels("lru").inc(len(evicted))
+
+    def _drop(self, session_ids, reason: str):
+        with self._lock:
+            dropped = sum(
+                self._conversations.pop(session_id, None) is not None
+                for session_id in session_ids
+            )
+        if dropped:
+            self.resets += dropped
+            CONTEXT_RESET.labels(reason).inc(dropped)
+
+    def evict(self, session_ids):
+        """Session evict listener: forget the sessions' conversations."""
+        self._drop(session_ids, "session_evicted")
+
+    def end(self, session_id: str):
+        self._drop([session_id], "session_ended")
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+    def stats(self) -> dict:
+        with self._lock:
+            tokens = sum(len(c.context) for c in self._conversations.values())
+            return {
+                "enabled": self.enabled,
+                "sessions": len(self._conversations),
+                "context_tokens": tokens,
+                "max_tokens": self.max_tokens,
+                "max_sessions": self.max_sessions,
+                "reused": self.reused,
+                "resets": self.resets,
+            }
@@ -0,0 +1,266 @@
+import asyncio
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+
+from app.services import deadline
+from app.services.deadline import DeadlineExceeded
+from app.utils.metrics import Counter, Gauge, Histogram
+
+# ---------- PRIORITY CLASSES ----------
+INTERACTIVE = 0  # a candidate is waiting on the screen: questions, follow-ups
+SCORING = 1      # answer scoring; degrades to heuristics if shed
+BACKGROUND = 2   # coaching summaries, question pool refills
+
+PRIORITY_NAMES = ("interactive", "scoring", "background")
+
+CALLER_PRIORITY = {
+    "question": INTERACTIVE,
+    "followup": INTERACTIVE,
+    "star": SCORING,
+    "evaluation": SCORING,
+    "evaluation_repair": SCORING,
+    "correctness": SCORING,
+    "improvement": BACKGROUND,
+}
+
+# Session the current request/job works for; used for fair queueing.
+# Set it at the top of a route or job, and it follows into tasks and
+# asyncio.to_thread calls.
+current_session: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "llm_session", default=None
+)
+
+QUEUE_WAIT_SECONDS = Histogram(
+    "llm_queue_wait_seconds", "Time an LLM call waited for a scheduler slot", ("priority",)
+)
+SHED = Counter("llm_shed_total", "LLM calls rejected by admission control", ("priority", "reason"))
+QUEUED = Gauge("llm_queued", "LLM calls waiting for a scheduler slot", ("priority",))
+
+
+class LLMOverloaded(RuntimeError):
+    """Raised when a call is shed instead of waiting for a slot."""
+
+
+class _Waiter:
+    __slots__ = ("priority", "session", "enqueued", "granted", "event", "future", "loop")
+
+    def __init__(self, priority: int, session: str, event=None, future=None, loop=None):
+        self.priority = priority
+        self.session = session
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.event = event
+        self.future = future
+        self.loop = loop
+
+    def wake(self):
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class LLMScheduler:
+    """
+    Global admission control for Ollama calls.
+
+    At most ``max_concurrency`` generations run at once (match it to
+    Ollama's parallel slots). Everything else queues by priority class,
+    and within a class round-robin by session, so one long interview
+    can't starve the others. A call that waits longer than its class's
+    queue timeout, or arrives when its class queue is full, is shed with
+    ``LLMOverloaded`` and the caller falls back. A call whose request
+    budget runs out first raises ``DeadlineExceeded`` instead.
+
+    Works for threads (``slot``) and coroutines (``aslot``) at once; a
+    freed slot is handed straight to the next waiter.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        queue_timeouts: tuple = (30.0, 15.0, 120.0),
+        max_queued: tuple = (0, 0, 32),
+    ):
+        self.max_concurrency = max_concurrency
+        self.queue_timeouts = queue_timeouts  # per class; None/0 = wait forever
+        self.max_queued = max_queued          # per class; 0 = unbounded
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queues = [OrderedDict() for _ in PRIORITY_NAMES]  # session -> deque[_Waiter]
+        self._queued = [0] * len(PRIORITY_NAMES)
+
+        self.admitted = [0] * len(PRIORITY_NAMES)
+        self.shed = [0] * len(PRIORITY_NAMES)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrency > 0
+
+    # ---------- QUEUE (call with the lock held) ----------
+    def _enqueue(self, waiter: _Waiter):
+        queue = self._queues[waiter.priority]
+        queue.setdefault(waiter.session, deque()).append(waiter)
+        self._queued[waiter.priority] += 1
+        QUEUED.labels(PRIORITY_NAMES[waiter.priority]).inc()
+
+    def _remove(self, waiter: _Waiter):
+        queue = self._queues[waiter.priority]
+        waiters = queue.get(waiter.session)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        if not waiters:
+            del queue[waiter.session]
+        self._queued[waiter.priority] -= 1
+        QUEUED.labels(PRIORITY_NAMES[waiter.priority]).dec()
+
+    def _pop_next(self) -> _Waiter | None:
+        for queue in self._queues:
+            if not queue:
+                continue
+            session, waiters = next(iter(queue.items()))
+            waiter = waiters.popleft()
+            if waiters:
+                queue.move_to_end(session)  # round-robin between sessions
+            else:
+                del queue[session]
+            self._queued[waiter.priority] -= 1
+            QUEUED.labels(PRIORITY_NAMES[waiter.priority]).dec()
+            return waiter
+        return None
+
+    def _admit_now(self, priority: int) -> bool:
+        if self._active < self.max_concurrency:
+            self._active += 1
+            self.admitted[priority] += 1
+            return True
+        limit = self.max_queued[priority]
+        if limit and self._queued[priority] >= limit:
+            self._shed(priority, "queue_full")
+        return False
+
+    def _shed(self, priority: int, reason: str):
+        self.shed[priority] += 1
+        SHED.labels(PRIORITY_NAMES[priority], reason).inc()
+        if reason == "deadline":
+            raise DeadlineExceeded("request time budget ran out waiting for the LLM")
+        raise LLMOverloaded(f"LLM busy: {PRIORITY_NAMES[priority]} call shed ({reason})")
+
+    def _wait_limit(self, priority: int) -> tuple[float | None, str]:
+        """How long a waiter may queue, and the shed reason when it runs out."""
+        timeout = self.queue_timeouts[priority] or None
+        left = deadline.remaining()
+        if left is not None and (timeout is None or left < timeout):
+            return max(left, 0.0), "deadline"
+        return timeout, "queue_timeout"
+
+    def _release(self):
+        with self._lock:
+            waiter = self._pop_next()
+            if waiter is None:
+                self._active -= 1
+                return
+            # Hand the slot over without touching _active
+            waiter.granted = True
+            self.admitted[waiter.priority] += 1
+        waiter.wake()
+
+    def _granted(self, waiter: _Waiter):
+        QUEUE_WAIT_SECONDS.labels(PRIORITY_NAMES[waiter.priority]).observe(
+            time.monotonic() - waiter.enqueued
+        )
+
+    # ---------- THREADS ----------
+    @contextmanager
+    def slot(self, priority: int = SCORING):
+        if not self.enabled:
+            yield
+            return
+
+        with self._lock:
+            admitted = self._admit_now(priority)
+            if not admitted:
+                waiter = _Waiter(priority, current_session.get() or "", event=threading.Event())
+                self._enqueue(waiter)
+
+        if not admitted:
+            timeout, reason = self._wait_limit(priority)
+            if not waiter.event.wait(timeout):
+                with self._lock:
+                    if not waiter.granted:
+                        self._remove(waiter)
+                        self._shed(priority, reason)
+            self._granted(waiter)
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    # ---------- COROUTINES ----------
+    @asynccontextmanager
+    async def aslot(self, priority: int = SCORING):
+        if not self.enabled:
+            yield
+            return
+
+        with self._lock:
+            admitted = self._admit_now(priority)
+            if not admitted:
+                loop = asyncio.get_running_loop()
+                waiter = _Waiter(
+                    priority, current_session.get() or "", future=loop.create_future(), loop=loop
+                )
+                self._enqueue(waiter)
+
+        if not admitted:
+            timeout, reason = self._wait_limit(priority)
+            try:
+                await asyncio.wait_for(waiter.future, timeout)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    if not waiter.granted:
+                        self._remove(waiter)
+                        self._shed(priority, reason)
+            except asyncio.CancelledError:
+                with self._lock:
+                    granted = waiter.granted
+                    if not granted:
+                        self._remove(waiter)
+                if granted:
+                    self._release()
+                raise
+            self._granted(waiter)
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "max_concurrency": self.max_concurrency,
+                "active": self._active,
+                "classes": {
+                    name: {
+                        "queued": self._queued[p],
+                        "sessions_waiting": len(self._queues[p]),
+                        "admitted": self.admitted[p],
+                        "shed": self.shed[p],
+                        "queue_timeout_s": self.queue_timeouts[p],
+                        "max_queued": self.max_queued[p],
+                    }
+                    for p, name in enumerate(PRIORITY_NAMES)
+                },
+            }
@@ -1,25 +1,533 @@
 import requests
+import httpx
+import asyncio
 import json
+import threading
+import time
+from typing import AsyncIterator, Callable
+
+from requests.adapters import HTTPAdapter
+
+from app import config
+from app.services import deadline
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.deadline import DeadlineExceeded
+from app.services.llm_cache import LLMCache
+from app.services.llm_context import ConversationStore
+from app.services.llm_scheduler import CALLER_PRIORITY, SCORING, LLMScheduler
+from app.services.singleflight import AsyncSingleFlight, SingleFlight
+from app.utils.metrics import Counter, Gauge, Histogram
+
+
+# ---------- SHARED CONNECTION POOLS ----------
+# One keep-alive pool per process, shared by every LocalLLM instance, so
+# concurrent interviews reuse sockets instead of reconnecting per call.
+_async_client: httpx.AsyncClient | None = None
+_sync_session: requests.Session | None = None
+_sync_lock = threading.Lock()
+_cache: LLMCache | None = None
+
+# One admission queue for every Ollama call in the process
+_scheduler = LLMScheduler(
+    max_concurrency=config.LLM_MAX_CONCURRENCY,
+    queue_timeouts=(
+        config.LLM_QUEUE_TIMEOUT_INTERACTIVE,
+        config.LLM_QUEUE_TIMEOUT_SCORING,
+        config.LLM_QUEUE_TIMEOUT_BACKGROUND,
+    ),
+    max_queued=(0, 0, config.LLM_MAX_QUEUED_BACKGROUND),
+)
+
+# Fails calls fast while Ollama is down or wedged
+_breaker = CircuitBreaker(
+    threshold=config.LLM_BREAKER_THRESHOLD,
+    cooldown=config.LLM_BREAKER_COOLDOWN,
+    max_cooldown=config.LLM_BREAKER_MAX_COOLDOWN,
+)
+
+# Ollama context token arrays for sessions with an ongoing conversation
+_conversations = ConversationStore(
+    max_tokens=config.LLM_CONTEXT_MAX_TOKENS,
+    max_sessions=config.LLM_CONTEXT_MAX_SESSIONS,
+)
+
+# Identical generations in flight at the same time share one request
+_sync_flights = SingleFlight()
+_async_flights = AsyncSingleFlight()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=config.OLLAMA_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=config.OLLAMA_MAX_CONNECTIONS,
+                max_keepalive_connections=config.OLLAMA_MAX_KEEPALIVE,
+                keepalive_expiry=config.OLLAMA_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return _async_client
+
+
+def get_sync_session() -> requests.Session:
+    global _sync_session
+    with _sync_lock:
+        if _sync_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=config.OLLAMA_MAX_KEEPALIVE,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sync_session = session
+    return _sync_session
+
+
+def get_cache() -> LLMCache | None:
+    global _cache
+    if not config.LLM_CACHE_ENABLED:
+        return None
+    with _sync_lock:
+        if _cache is None:
+            _cache = LLMCache(
+                path=config.LLM_CACHE_PATH or None,
+                memory_entries=config.LLM_CACHE_MEMORY_ENTRIES,
+                max_entries=config.LLM_CACHE_MAX_ENTRIES,
+                ttl=config.LLM_CACHE_TTL,
+            )
+    return _cache
+
+
+# ---------- METRICS ----------
+LLM_REQUESTS = Counter(
+    "llm_requests_total", "Ollama generations by caller and outcome", ("caller", "outcome")
+)
+LLM_SECONDS = Histogram(
+    "llm_request_duration_seconds", "Ollama generation time by caller (cache hits excluded)", ("caller",)
+)
+LLM_COALESCED = Counter(
+    "llm_coalesced_total", "Generations that joined an identical in-flight request", ("caller",)
+)
+LLM_IN_FLIGHT = Gauge("llm_requests_in_flight", "Ollama generations awaiting a response", ("caller",))
+LLM_PROMPT_TOKENS = Histogram(
+    "llm_prompt_eval_tokens", "Prompt tokens Ollama had to prefill per generation", ("caller",),
+    buckets=(32, 64, 128, 256, 512, 1024, 2048, 4096, 8192),
+)
+
+
+class _Call:
+    """Times one Ollama request and records its outcome under ``caller``."""
+
+    __slots__ = ("caller", "_in_flight", "_start")
+
+    def __init__(self, caller: str):
+        self.caller = caller
+        self._in_flight = LLM_IN_FLIGHT.labels(caller)
+
+    def __enter__(self):
+        self._in_flight.inc()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._in_flight.dec()
+        LLM_SECONDS.labels(self.caller).observe(time.perf_counter() - self._start)
+        if exc_type is None:
+            outcome = "ok"
+        elif issubclass(exc_type, asyncio.CancelledError):
+            outcome = "cancelled"
+        else:
+            outcome = "error"
+        LLM_REQUESTS.labels(self.caller, outcome).inc()
+
+
+def get_scheduler() -> LLMScheduler:
+    return _scheduler
+
+
+def get_breaker() -> CircuitBreaker:
+    return _breaker
+
+
+def get_conversations() -> ConversationStore:
+    return _conversations
+
+
+# ---------- HEALTH ----------
+class OllamaTimeout(DeadlineExceeded):
+    """Ollama didn't answer within the full OLLAMA_TIMEOUT (not just a request's short budget)."""
+
+
+def _timed_out(timeout: float) -> DeadlineExceeded:
+    # A call cut short by the request's own budget is only held against
+    # Ollama if it had been silent for LLM_BREAKER_SLOW_CALL (see _Guard)
+    if timeout >= config.OLLAMA_TIMEOUT:
+        return OllamaTimeout("Ollama did not answer in time")
+    return DeadlineExceeded("request time budget ran out waiting for Ollama")
+
+
+# Failures that say Ollama itself is unhealthy; they count towards the breaker
+_UNHEALTHY = (
+    OllamaTimeout,
+    requests.ConnectionError,
+    requests.Timeout,
+    httpx.TransportError,
+)
+
+
+def _unhealthy(e: BaseException) -> bool:
+    if isinstance(e, DeadlineExceeded):
+        return isinstance(e, OllamaTimeout)
+    if isinstance(e, _UNHEALTHY):
+        return True
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    return status is not None and status >= 500
+
+
+def _probe() -> bool:
+    response = get_sync_session().get(
+        f"{config.OLLAMA_URL}/api/tags", timeout=config.LLM_BREAKER_PROBE_TIMEOUT
+    )
+    return response.status_code == 200
+
+
+async def _aprobe() -> bool:
+    response = await get_async_client().get(
+        f"{config.OLLAMA_URL}/api/tags", timeout=config.LLM_BREAKER_PROBE_TIMEOUT
+    )
+    return response.status_code == 200
+
+
+class _Guard:
+    """
+    Reports the outcome of one Ollama request to the circuit breaker.
+    Besides errors that say Ollama is unhealthy, a call that times out or
+    is cancelled after waiting LLM_BREAKER_SLOW_CALL with no output from
+    Ollama counts as a failure; turn budgets are shorter than
+    OLLAMA_TIMEOUT, so a wedged Ollama would otherwise never trip it.
+    """
+
+    __slots__ = ("_since",)
+
+    def __enter__(self):
+        self._since = time.monotonic()
+        return self
+
+    def progress(self):
+        """Ollama produced output (a streamed chunk); restarts the silence clock."""
+        self._since = time.monotonic()
+
+    def _stalled(self, exc_type) -> bool:
+        slow = config.LLM_BREAKER_SLOW_CALL
+        return (
+            slow > 0
+            and issubclass(exc_type, (DeadlineExceeded, asyncio.CancelledError))
+            and time.monotonic() - self._since >= slow
+        )
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            _breaker.record_success()
+        elif _unhealthy(exc) or self._stalled(exc_type):
+            _breaker.record_failure()
+
+
+def _priority(caller: str, priority: int | None) -> int:
+    return CALLER_PRIORITY.get(caller, SCORING) if priority is None else priority
+
+
+def coalescing_stats() -> dict:
+    return {
+        "enabled": config.LLM_COALESCE_ENABLED,
+        "excluded_callers": sorted(config.LLM_COALESCE_EXCLUDE),
+        "coalesced": _sync_flights.coalesced + _async_flights.coalesced,
+        "in_flight": _sync_flights.in_flight() + _async_flights.in_flight(),
+        "abandoned": _async_flights.abandoned,
+    }
+
+
+async def close_clients():
+    global _async_client, _sync_session
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    with _sync_lock:
+        if _sync_session is not None:
+            _sync_session.close()
+            _sync_session = None
 
 
 class LocalLLM:
-    def __init__(self, model: str = "mistral"):
+    def __init__(self, model: str = config.OLLAMA_MODEL):
         self.model = model
-        self.url = "http://localhost:11434/api/generate"
+        self.url = f"{config.OLLAMA_URL}/api/generate"
 
-    # ---------- Generic text generation ----------
-    def generate(self, prompt: str) -> str:
+    def _payload(
+        self,
+        prompt: str,
+        stream: bool = False,
+        options: dict | None = None,
+        format: str | None = None,
+        context: list[int] | None = None,
+    ) -> dict:
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False
+            "stream": stream
         }
+        if options:
+            payload["options"] = options
+        if format:
+            payload["format"] = format
+        if context:
+            payload["context"] = context
+        return payload
 
-        response = requests.post(self.url, json=payload, timeout=60)
-        response.raise_for_status()
+    async def _apost(self, payload: dict, caller: str, priority: int | None) -> dict:
+        """One non-streaming Ollama request behind the breaker, deadline and scheduler."""
+        await _breaker.acheck(_aprobe)
+        deadline.call_timeout(config.OLLAMA_TIMEOUT)
+        async with _scheduler.aslot(_priority(caller, priority)):
+            with _Call(caller), _Guard():
+                timeout = deadline.call_timeout(config.OLLAMA_TIMEOUT)
+                try:
+                    # Cancelling the wait closes the connection, which stops Ollama
+                    response = await asyncio.wait_for(
+                        get_async_client().post(self.url, json=payload, timeout=timeout),
+                        timeout,
+                    )
+                except (asyncio.TimeoutError, httpx.TimeoutException):
+                    raise _timed_out(timeout) from None
+                response.raise_for_status()
 
         data = response.json()
-        return data.get("response", "").strip()
+        if "prompt_eval_count" in data:
+            LLM_PROMPT_TOKENS.labels(caller).observe(data["prompt_eval_count"])
+        return data
+
+    # ---------- Generic text generation ----------
+    def _should_coalesce(self, caller: str, coalesce: bool | None) -> bool:
+        if coalesce is not None:
+            return coalesce
+        return config.LLM_COALESCE_ENABLED and caller not in config.LLM_COALESCE_EXCLUDE
+
+    def generate(
+        self,
+        prompt: str,
+        options: dict | None = None,
+        cache: bool = True,
+        format: str | None = None,
+        validate: Callable[[str], bool] | None = None,
+        caller: str = "other",
+        coalesce: bool | None = None,
+        priority: int | None = None,
+    ) -> str:
+        """
+        ``options`` are passed through to Ollama (temperature, seed, ...).
+        Pass ``cache=False`` for prompts that should produce fresh output
+        on every call. ``format="json"`` constrains Ollama to valid JSON.
+        When ``validate`` is given, only responses it accepts are cached.
+        ``caller`` labels the call in the /metrics output.
+
+        Identical requests already in flight are joined rather than sent
+        again. ``coalesce=False`` opts out (for prompts that should vary);
+        the default follows LLM_COALESCE_ENABLED / LLM_COALESCE_EXCLUDE.
+
+        Calls wait for a scheduler slot at ``priority`` (default from the
+        caller) and raise ``LLMOverloaded`` if shed. Each call is capped
+        by OLLAMA_TIMEOUT and the request's remaining budget (see
+        ``deadline``) and raises ``DeadlineExceeded`` past it; while the
+        circuit breaker is open it raises ``LLMUnavailable`` at once.
+        """
+        store = get_cache() if cache else None
+        key = LLMCache.make_key(self.model, prompt, options, format)
+        if store:
+            cached = store.get(key)
+            if cached is not None:
+                LLM_REQUESTS.labels(caller, "cache_hit").inc()
+                return cached
+
+        def fetch() -> str:
+            _breaker.check(_probe)
+            deadline.call_timeout(config.OLLAMA_TIMEOUT)
+            with _scheduler.slot(_priority(caller, priority)), _Call(caller), _Guard():
+                timeout = deadline.call_timeout(config.OLLAMA_TIMEOUT)
+                try:
+                    response = get_sync_session().post(
+                        self.url,
+                        json=self._payload(prompt, options=options, format=format),
+                        timeout=timeout,
+                    )
+                except requests.Timeout:
+                    raise _timed_out(timeout) from None
+                response.raise_for_status()
+
+            text = response.json().get("response", "").strip()
+            if store and text and (validate is None or validate(text)):
+                store.set(key, text)
+            return text
+
+        if not self._should_coalesce(caller, coalesce):
+            return fetch()
+        text, joined = _sync_flights.do(key, fetch)
+        if joined:
+            LLM_COALESCED.labels(caller).inc()
+        return text
+
+    async def agenerate(
+        self,
+        prompt: str,
+        options: dict | None = None,
+        cache: bool = True,
+        format: str | None = None,
+        validate: Callable[[str], bool] | None = None,
+        caller: str = "other",
+        coalesce: bool | None = None,
+        priority: int | None = None,
+    ) -> str:
+        """
+        Non-blocking variant of generate() for async routes.
+        Waits on Ollama without holding a threadpool thread.
+        """
+        store = get_cache() if cache else None
+        key = LLMCache.make_key(self.model, prompt, options, format)
+        if store:
+            cached = store.get_memory(key)
+            if cached is None:
+                cached = await asyncio.to_thread(store.get, key)
+            if cached is not None:
+                LLM_REQUESTS.labels(caller, "cache_hit").inc()
+                return cached
+
+        async def fetch() -> str:
+            data = await self._apost(
+                self._payload(prompt, options=options, format=format), caller, priority
+            )
+            text = data.get("response", "").strip()
+            if store and text and (validate is None or validate(text)):
+                await asyncio.to_thread(store.set, key, text)
+            return text
+
+        if not self._should_coalesce(caller, coalesce):
+            return await fetch()
+        text, joined = await _async_flights.do(key, fetch)
+        if joined:
+            LLM_COALESCED.labels(caller).inc()
+        return text
+
+    # ---------- Per-session conversations ----------
+    def _conversing(self, session_id: str | None) -> bool:
+        return session_id is not None and _conversations.enabled
+
+    async def aconverse(
+        self,
+        session_id: str | None,
+        prompt: str,
+        options: dict | None = None,
+        caller: str = "other",
+        priority: int | None = None,
+    ) -> str:
+        """
+        Continues the session's conversation with ``prompt``.
+
+        Sends the context Ollama returned for the previous turn, so the
+        transcript so far isn't re-sent or re-prefilled; only ``prompt``
+        is new. Never cached, since the reply depends on the history.
+        Identical turns in flight for the same session and context (a
+        double submit) share one generation and one context update.
+        Without a session (or with LLM_CONTEXT_MAX_TOKENS=0) it is a
+        plain, uncached ``agenerate``.
+        """
+        if not self._conversing(session_id):
+            return await self.agenerate(
+                prompt, options=options, cache=False, caller=caller, priority=priority
+            )
+
+        context = _conversations.context(session_id)
+
+        async def fetch() -> str:
+            payload = self._payload(prompt, options=options, context=context)
+            data = await self._apost(payload, caller, priority)
+            text = data.get("response", "").strip()
+            if text:
+                _conversations.update(session_id, data.get("context"), text)
+            return text
+
+        if not self._should_coalesce(caller, None):
+            return await fetch()
+        key = LLMCache.make_key(self.model, prompt, options, None)
+        history = hash(tuple(context)) if context else 0
+        text, joined = await _async_flights.do(f"converse:{session_id}:{history}:{key}", fetch)
+        if joined:
+            LLM_COALESCED.labels(caller).inc()
+        return text
+
+    async def astream(
+        self,
+        prompt: str,
+        caller: str = "other",
+        priority: int | None = None,
+        session_id: str | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yields response tokens as Ollama produces them.
+        Ollama streams one JSON object per line (NDJSON).
+        The scheduler slot is held until the stream ends; closing the
+        generator early closes the connection and stops generation.
+        With ``session_id`` the stream continues that session's
+        conversation, like ``aconverse``.
+        """
+        conversing = self._conversing(session_id)
+        context = _conversations.context(session_id) if conversing else None
+        tokens = []
+        await _breaker.acheck(_aprobe)
+        deadline.call_timeout(config.OLLAMA_TIMEOUT)
+        async with _scheduler.aslot(_priority(caller, priority)):
+            with _Call(caller), _Guard() as guard:
+                timeout = deadline.call_timeout(config.OLLAMA_TIMEOUT)
+                try:
+                    async with get_async_client().stream(
+                        "POST",
+                        self.url,
+                        json=self._payload(prompt, stream=True, context=context),
+                        timeout=timeout,
+                    ) as response:
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            guard.progress()
+                            # The per-read timeout doesn't bound the whole stream
+                            deadline.call_timeout(config.OLLAMA_TIMEOUT)
+                            if not line.strip():
+                                continue
+                            chunk = json.loads(line)
+                            if chunk.get("error"):
+                                raise RuntimeError(chunk["error"])
+                            token = chunk.get("response", "")
+                            if token:
+                                tokens.append(token)
+                                yield token
+                            if chunk.get("done"):
+                                if "prompt_eval_count" in chunk:
+                                    LLM_PROMPT_TOKENS.labels(caller).observe(chunk["prompt_eval_count"])
+                                if conversing:
+                                    reply = "".join(tokens).strip()
+                                    _conversations.update(session_id, chunk.get("context"), reply)
+                                break
+                except httpx.TimeoutException:
+                    # A stalled stream falls back like a slow non-streaming call
+                    raise _timed_out(timeout) from None
+
+    async def awarmup(self):
+        """
+        Asks Ollama to load the model into memory without generating.
+        An empty prompt makes /api/generate return once the model is loaded.
+        """
+        response = await get_async_client().post(
+            self.url, json={"model": self.model, "prompt": "", "stream": False}
+        )
+        response.raise_for_status()
 
     # ---------- GENERALIZED CORRECTNESS EVALUATION ----------
     def evaluate_correctness(self, question: str, answer: str) -> dict:
@@ -53,7 +561,7 @@ Rules:
 - Be concise
 """
 
-        raw_response = self.generate(prompt)
+        raw_response = self.generate(prompt, caller="correctness")
 
         # Try to parse JSON safely
         try:
@@ -0,0 +1,425 @@
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from app import config
+from app.utils.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+BANK_DRAWS = Counter("question_bank_draws_total", "Questions requested from the bank", ("outcome",))
+
+ANY = "*"  # tag value matching every role / domain / difficulty / mode
+TAGS = ("role", "domain", "difficulty", "mode")
+
+# After this many rejected weight checks in one draw, take the next unasked
+# question regardless of weight (bounds the cost of very skewed weights)
+_MAX_REJECTIONS = 32
+
+
+def normalize_tag(value: str | None, tag: str = "") -> str:
+    """Lower-cased, whitespace-collapsed tag; a role drops its " (Company)" suffix."""
+    if value is None:
+        return ANY
+    value = " ".join(str(value).split()).lower()
+    if tag == "role" and value.endswith(")") and " (" in value:
+        value = value[:value.rindex(" (")]
+    return value or ANY
+
+
+def read_questions(path: str | Path) -> Iterator[dict]:
+    """
+    Questions from a JSON or JSONL file. Accepted shapes:
+
+    - ``{"behavioral": ["...", ...], ...}``: the original layout, the
+      key is the interview mode and every other tag is ``*``
+    - ``[{"text": "...", "role": ..., "domain": ..., "difficulty": ...,
+      "mode": ..., "weight": 1.0}, ...]`` or one such object per line
+      (.jsonl); missing tags are ``*``, plain strings are untagged
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            items = (json.loads(line) for line in f if line.strip())
+        else:
+            data = json.load(f)
+            if isinstance(data, dict):
+                items = ({"text": t, "mode": mode} for mode, texts in data.items() for t in texts)
+            else:
+                items = iter(data)
+        for item in items:
+            yield {"text": item} if isinstance(item, str) else item
+
+
+class _Bucket:
+    """Every question matching one normalized key, loaded once per generation."""
+
+    __slots__ = ("ids", "texts", "weights", "max_weight", "generation", "_prob", "_alias")
+
+    def __init__(self, rows: list[tuple], generation: int):
+        self.ids = array("q", (r[0] for r in rows))
+        self.texts = [r[1] for r in rows]
+        self.weights = array("d", (r[2] for r in rows))
+        self.max_weight = max(self.weights, default=0.0)
+        self.generation = generation
+        self._prob: array | None = None
+        self._alias: array | None = None
+
+    def sample(self, rng) -> int:
+        """Weighted index in O(1), from an alias table built on first use."""
+        if self._prob is None:
+            self._build_alias()
+        i = rng.randrange(len(self.ids))
+        return i if rng.random() < self._prob[i] else self._alias[i]
+
+    def _build_alias(self):
+        # Vose's alias method
+        n = len(self.weights)
+        total = sum(self.weights)
+        prob = array("d", (w * n / total for w in self.weights))
+        alias = array("q", range(n))
+        small = [i for i in range(n) if prob[i] < 1.0]
+        large = [i for i in range(n) if prob[i] >= 1.0]
+        while small and large:
+            s, g = small.pop(), large[-1]
+            alias[s] = g
+            prob[g] -= 1.0 - prob[s]
+            if prob[g] < 1.0:
+                small.append(large.pop())
+        for i in small + large:
+            prob[i] = 1.0
+        self._prob, self._alias = prob, alias
+
+
+class _Shuffle:
+    """
+    Virtual Fisher-Yates over one bucket: positions ``[0, remaining)``
+    hold the not-yet-drawn indices. Only swapped positions are stored,
+    so state grows with draws, not with the bucket.
+    """
+
+    __slots__ = ("generation", "remaining", "swaps")
+
+    def __init__(self, size: int, generation: int):
+        self.generation = generation
+        self.remaining = size
+        self.swaps: dict[int, int] = {}
+
+    def at(self, pos: int) -> int:
+        return self.swaps.get(pos, pos)
+
+    def remove(self, pos: int):
+        last = self.remaining - 1
+        self.swaps[pos] = self.swaps.pop(last, last)
+        if pos == last:
+            del self.swaps[pos]
+        self.remaining = last
+
+
+class _SessionDraws:
+    __slots__ = ("asked", "shuffles")
+
+    def __init__(self):
+        self.asked: set[int] = set()  # question ids; stable across reloads
+        self.shuffles: dict[tuple, _Shuffle] = {}
+
+
+class QuestionBank:
+    """
+    Tagged interview questions in SQLite, shared by every session.
+
+    Rows are indexed on (role, domain, difficulty, mode); a tag of ``*``
+    matches anything. ``take()`` loads the questions matching a key once
+    (one indexed query, then cached in memory) and draws from them
+    weighted by ``weight``, without repeating a question within a
+    session. Each draw is O(1) expected: a uniform pick among the unasked
+    questions through a virtual Fisher-Yates shuffle, accepted with
+    probability ``weight / max_weight``.
+
+    ``source`` (JSON/JSONL) is upserted into the database whenever its
+    mtime changes; writes to the database from other processes (e.g.
+    ``scripts/import_questions.py``) are picked up too. Both are checked
+    at most every ``reload_interval`` seconds. Question ids survive
+    reloads, so sessions keep their no-repeat history.
+    """
+
+    def __init__(
+        self,
+        path: str = "",
+        source: str = "",
+        reload_interval: float = 30.0,
+        cache_buckets: int = 256,
+        max_sessions: int = 10_000,
+    ):
+        self.path = path  # empty = in-memory database, filled from source
+        self.source = source
+        self.reload_interval = reload_interval
+        self.cache_buckets = cache_buckets
+        self.max_sessions = max_sessions
+        self._db = None
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[tuple, _Bucket] = OrderedDict()
+        self._sessions: OrderedDict[str, _SessionDraws] = OrderedDict()
+        self._data_version = None
+        self._checked = None
+        self.generation = 0
+        self.drawn = 0
+        self.rejections = 0
+        self.reloads = 0
+
+    # ---------- DATABASE ----------
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use so importing the app creates no files
+        if self._db is None:
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            db = sqlite3.connect(self.path or ":memory:", check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA busy_timeout=5000")
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS questions (
+                    id INTEGER PRIMARY KEY,
+                    role TEXT NOT NULL DEFAULT '*',
+                    domain TEXT NOT NULL DEFAULT '*',
+                    difficulty TEXT NOT NULL DEFAULT '*',
+                    mode TEXT NOT NULL DEFAULT '*',
+                    text TEXT NOT NULL,
+                    weight REAL NOT NULL DEFAULT 1.0,
+                    source TEXT NOT NULL DEFAULT '',
+                    batch INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_key
+                    ON questions(role, domain, difficulty, mode, text);
+                CREATE TABLE IF NOT EXISTS sources (
+                    name TEXT PRIMARY KEY,
+                    mtime REAL NOT NULL
+                );
+                """
+            )
+            self._db = db
+        return self._db
+
+    def import_questions(self, items: Iterable[dict], source: str = "") -> int:
+        """
+        Upserts questions. With a ``source`` name, rows previously imported
+        from that source but missing from ``items`` are deleted, so
+        re-importing a file mirrors it. Returns the number of questions.
+        """
+        with self._lock:
+            db = self._connect()
+            batch = time.time_ns()
+            rows = []
+            for item in items:
+                text = " ".join(str(item.get("text", "")).split())
+                weight = float(item.get("weight", 1.0))
+                if not text or weight <= 0:
+                    continue
+                tags = [normalize_tag(item.get(tag), tag) for tag in TAGS]
+                rows.append((*tags, text, weight, source, batch))
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany(
+                    """
+                    INSERT INTO questions (role, domain, difficulty, mode, text, weight, source, batch)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(role, domain, difficulty, mode, text)
+                    DO UPDATE SET weight = excluded.weight, source = excluded.source, batch = excluded.batch
+                    """,
+                    rows,
+                )
+                if source:
+                    db.execute("DELETE FROM questions WHERE source = ? AND batch != ?", (source, batch))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            self._invalidate()
+            return len(rows)
+
+    def import_file(self, path: str | Path) -> int:
+        path = Path(path)
+        mtime = path.stat().st_mtime
+        count = self.import_questions(read_questions(path), source=str(path))
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO sources (name, mtime) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET mtime = excluded.mtime",
+                (str(path), mtime),
+            )
+        return count
+
+    def _invalidate(self):
+        # Call with the lock held
+        self.generation += 1
+        self._buckets.clear()
+
+    # ---------- RELOAD ----------
+    def reload(self, force: bool = False):
+        """Re-imports ``source`` if it changed and drops buckets if the database did."""
+        now = time.monotonic()
+        if not force and self._checked is not None and now - self._checked < self.reload_interval:
+            return
+        self._checked = now
+        with self._lock:
+            db = self._connect()
+        if self.source:
+            try:
+                mtime = os.stat(self.source).st_mtime
+                row = db.execute("SELECT mtime FROM sources WHERE name = ?", (str(Path(self.source)),)).fetchone()
+                if row is None or row[0] != mtime:
+                    count = self.import_file(self.source)
+                    self.reloads += 1
+                    logger.info("Question bank: imported %d questions from %s", count, self.source)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning("Question bank: could not import %s: %s", self.source, e)
+        with self._lock:
+            # Changes whenever another connection commits
+            version = db.execute("PRAGMA data_version").fetchone()[0]
+            if self._data_version is not None and version != self._data_version:
+                self._invalidate()
+                self.reloads += 1
+            self._data_version = version
+
+    # ---------- SAMPLING ----------
+    def _bucket(self, key: tuple) -> _Bucket:
+        # Call with the lock held
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            self._buckets.move_to_end(key)
+            return bucket
+        rows = self._db.execute(
+            """
+            SELECT id, text, weight FROM questions
+            WHERE role IN (?, '*') AND domain IN (?, '*')
+              AND difficulty IN (?, '*') AND mode IN (?, '*')
+            ORDER BY id
+            """,
+            key,
+        ).fetchall()
+        bucket = self._buckets[key] = _Bucket(rows, self.generation)
+        while len(self._buckets) > self.cache_buckets:
+            self._buckets.popitem(last=False)
+        return bucket
+
+    def _draws(self, session_id: str) -> _SessionDraws:
+        draws = self._sessions.get(session_id)
+        if draws is None:
+            draws = self._sessions[session_id] = _SessionDraws()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return draws
+
+    def _draw(self, bucket: _Bucket, shuffle: _Shuffle, asked: set[int], rng: random.Random) -> int | None:
+        rejected = 0
+        while shuffle.remaining:
+            pos = rng.randrange(shuffle.remaining)
+            i = shuffle.at(pos)
+            if bucket.ids[i] in asked:
+                # Asked through another key or before a reload
+                shuffle.remove(pos)
+                continue
+            if rejected < _MAX_REJECTIONS and rng.random() * bucket.max_weight > bucket.weights[i]:
+                rejected += 1
+                continue
+            self.rejections += rejected
+            shuffle.remove(pos)
+            return i
+        self.rejections += rejected
+        return None
+
+    def take(
+        self,
+        session_id: str | None,
+        role: str | None = None,
+        domain: str | None = None,
+        difficulty: str | None = None,
+        mode: str | None = None,
+        rng: random.Random | None = None,
+    ) -> str | None:
+        """
+        A question matching the tags that ``session_id`` hasn't been asked,
+        or None if there is none left. Without a session id the draw is
+        independent (repeats possible).
+        """
+        self.reload()
+        key = tuple(normalize_tag(v, tag) for tag, v in zip(TAGS, (role, domain, difficulty, mode)))
+        rng = rng or random
+        with self._lock:
+            bucket = self._bucket(key)
+            if not bucket.ids:
+                BANK_DRAWS.labels("empty").inc()
+                return None
+            if session_id is None:
+                i = bucket.sample(rng)
+            else:
+                draws = self._draws(session_id)
+                shuffle = draws.shuffles.get(key)
+                if shuffle is None or shuffle.generation != bucket.generation:
+                    shuffle = draws.shuffles[key] = _Shuffle(len(bucket.ids), bucket.generation)
+                i = self._draw(bucket, shuffle, draws.asked, rng)
+                if i is None:
+                    BANK_DRAWS.labels("exhausted").inc()
+                    return None
+                draws.asked.add(bucket.ids[i])
+            self.drawn += 1
+        BANK_DRAWS.labels("hit").inc()
+        return bucket.texts[i]
+
+    # ---------- SESSIONS ----------
+    def end(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def evict(self, session_ids: list[str]):
+        with self._lock:
+            for sid in session_ids:
+                self._sessions.pop(sid, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._db.execute("SELECT COUNT(*) FROM questions").fetchone()[0] if self._db else None
+            return {
+                "path": self.path or ":memory:",
+                "source": self.source,
+                "questions": total,
+                "generation": self.generation,
+                "reloads": self.reloads,
+                "cached_buckets": len(self._buckets),
+                "cached_questions": sum(len(b.ids) for b in self._buckets.values()),
+                "sessions": len(self._sessions),
+                "drawn": self.drawn,
+                "rejections": self.rejections,
+            }
+
+
+# One bank per process, shared by the interview routes and QuestionEngine
+_bank: QuestionBank | None = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = QuestionBank(
+                    path=config.QUESTION_BANK_PATH,
+                    source=config.QUESTION_BANK_SOURCE,
+                    reload_interval=config.QUESTION_BANK_RELOAD_INTERVAL,
+                    cache_buckets=config.QUESTION_BANK_CACHE_BUCKETS,
+                    max_sessions=config.SESSION_MAX_SESSIONS,
+                )
+    return _bank
@@ -1,17 +1,16 @@
-import json
-import random
-from pathlib import Path
+from app.services.question_bank import QuestionBank, get_question_bank
 
 
 class QuestionEngine:
-    def __init__(self):
-        data_path = Path(__file__).resolve().parents[2] / "data" / "questions.json"
-        with open(data_path, "r", encoding="utf-8") as f:
-            self.questions = json.load(f)
+    """Random question for an interview mode (hr / technical / behavioral), from the shared QuestionBank."""
 
-    def get_question(self, role: str) -> str:
-        role = role.lower()
-        if role not in self.questions:
-            raise ValueError("Invalid interview role")
+    def __init__(self, bank: QuestionBank | None = None):
+        self.bank = bank or get_question_bank()
 
-        return random.choice(self.questions[role])
+    def get_question(self, role: str, session_id: str | None = None) -> str:
+        """With a ``session_id``, never returns the same question twice to that session."""
+        question = self.bank.take(session_id, mode=role)
+        if question is None:
+            raise ValueError("No question available for this interview role")
+
+        return question
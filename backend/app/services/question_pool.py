@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+
+from app.services.llm_scheduler import BACKGROUND
+from app.services.local_llm import LocalLLM
+
+logger = logging.getLogger(__name__)
+
+
+def opening_question_prompt(role: str, domain: str, difficulty: str, mode: str) -> str:
+    return f"""
+You are a professional technical interviewer.
+
+Generate ONE clear interview question.
+
+Role: {role}
+Domain: {domain}
+Difficulty: {difficulty}
+Focus: {mode}
+
+Rules:
+- Ask only ONE question
+- Open-ended
+- Interview style
+- No explanation
+"""
+
+
+def pool_key(role: str, domain: str, difficulty: str, mode: str) -> tuple:
+    return tuple(v.strip() for v in (role, domain, difficulty, mode))
+
+
+class QuestionPool:
+    """
+    Pre-generated opening questions per (role, domain, difficulty, mode).
+
+    ``take()`` is a dict lookup plus a deque pop. A background worker
+    keeps every known key topped up to ``target`` whenever it falls
+    below ``low_water``. Keys are learned from traffic, and only the
+    ``max_keys`` most recently used are kept warm.
+    """
+
+    def __init__(
+        self,
+        llm: LocalLLM,
+        low_water: int = 2,
+        target: int = 4,
+        max_keys: int = 64,
+        refill_concurrency: int = 1,
+        refill_interval: float = 30.0,
+    ):
+        self.llm = llm
+        self.low_water = low_water
+        self.target = max(target, low_water)
+        self.max_keys = max_keys
+        self.refill_concurrency = refill_concurrency
+        self.refill_interval = refill_interval
+
+        self._pools: OrderedDict[tuple, deque] = OrderedDict()
+        self._below_since: dict[tuple, float] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+
+        # ---- metrics ----
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.failures = 0
+        self.refills = 0
+        self.last_refill_lag = 0.0
+        self.max_refill_lag = 0.0
+        self._total_refill_lag = 0.0
+
+    # ---------- LIFECYCLE ----------
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    # ---------- SERVE ----------
+    def take(self, role: str, domain: str, difficulty: str, mode: str) -> str | None:
+        key = pool_key(role, domain, difficulty, mode)
+        pool = self._touch(key)
+
+        question = pool.popleft() if pool else None
+        if question is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        if len(pool) < self.low_water:
+            self._below_since.setdefault(key, time.monotonic())
+            if self._wakeup is not None:
+                self._wakeup.set()
+        return question
+
+    def _touch(self, key: tuple) -> deque:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = deque()
+            while len(self._pools) > self.max_keys:
+                evicted, _ = self._pools.popitem(last=False)
+                self._below_since.pop(evicted, None)
+        self._pools.move_to_end(key)
+        return pool
+
+    # ---------- REFILL ----------
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self.refill_concurrency)
+
+        async def refill(key):
+            async with semaphore:
+                await self._refill(key)
+
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.refill_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            low = [k for k, pool in self._pools.items() if len(pool) < self.low_water]
+            if low:
+                await asyncio.gather(*(refill(k) for k in low))
+
+    async def _refill(self, key: tuple):
+        role, domain, difficulty, mode = key
+        prompt = opening_question_prompt(role, domain, difficulty, mode)
+
+        while key in self._pools and len(self._pools[key]) < self.target:
+            try:
+                # Pooled questions should differ: no cache, no coalescing
+                question = await self.llm.agenerate(
+                    prompt, cache=False, caller="question", coalesce=False, priority=BACKGROUND
+                )
+            except Exception as e:
+                self.failures += 1
+                logger.warning("Question pool refill failed for %s: %s", key, e)
+                return
+            if not question:
+                self.failures += 1
+                return
+            pool = self._pools.get(key)
+            if pool is None:
+                return
+            pool.append(question)
+            self.generated += 1
+
+        since = self._below_since.pop(key, None)
+        if since is not None:
+            lag = time.monotonic() - since
+            self.refills += 1
+            self.last_refill_lag = lag
+            self.max_refill_lag = max(self.max_refill_lag, lag)
+            self._total_refill_lag += lag
+
+    def stats(self) -> dict:
+        served = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / served, 4) if served else 0.0,
+            "generated": self.generated,
+            "failures": self.failures,
+            "keys": len(self._pools),
+            "pooled_questions": sum(len(p) for p in self._pools.values()),
+            "keys_below_low_water": len(self._below_since),
+            "refills": self.refills,
+            "last_refill_lag_s": round(self.last_refill_lag, 3),
+            "max_refill_lag_s": round(self.max_refill_lag, 3),
+            "avg_refill_lag_s": round(self._total_refill_lag / self.refills, 3) if self.refills else 0.0,
+        }
@@ -2,14 +2,22 @@ import os
 from fpdf import FPDF
 from datetime import datetime
 
+from app.utils.metrics import Histogram
+
 REPORT_DIR = "reports"
 
+PDF_SECONDS = Histogram("report_pdf_duration_seconds", "PDF report render time")
+
 
 class PDFReportGenerator:
     def __init__(self):
         os.makedirs(REPORT_DIR, exist_ok=True)
 
     def generate(self, session: dict, analytics: dict, improvement: dict) -> str:
+        with PDF_SECONDS.time():
+            return self._render(session, analytics, improvement)
+
+    def _render(self, session: dict, analytics: dict, improvement: dict) -> str:
         pdf = FPDF()
         pdf.set_auto_page_break(auto=True, margin=15)
         pdf.add_page()
@@ -0,0 +1,285 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.improvement_plan import ImprovementPlanEngine
+from app.services.llm_scheduler import current_session
+from app.services.report_generator import PDFReportGenerator
+from app.utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+JOB_WAIT_SECONDS = Histogram("report_job_queue_wait_seconds", "Time a report job waits for a worker")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class ReportJobQueue:
+    """
+    Background production of improvement plans and PDF reports.
+
+    A fixed number of worker tasks drain the queue, so a burst of
+    finished interviews can't take more than ``concurrency`` LLM calls
+    and PDF renders at once. Rendering uses its own small thread pool,
+    which leaves the default executor free for live scoring work.
+
+    With ``db_path`` (the shared session database) every status change
+    is also written to a ``report_jobs`` table, so any worker can answer
+    status polls for a job another worker is running. The owning worker
+    touches its unfinished rows every ``heartbeat`` seconds; a queued or
+    running row left untouched for three heartbeats belonged to a worker
+    that died or restarted, and is reported as failed.
+    """
+
+    def __init__(
+        self,
+        improvement_engine: ImprovementPlanEngine,
+        report_generator: PDFReportGenerator,
+        concurrency: int = 2,
+        max_jobs: int = 1000,
+        db_path: str | None = None,
+        heartbeat: float = 10.0,
+    ):
+        self.improvement_engine = improvement_engine
+        self.report_generator = report_generator
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self.heartbeat = heartbeat
+
+        self.jobs: OrderedDict[str, dict] = OrderedDict()
+        self._by_session: dict[str, str] = {}
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._render_pool = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="report"
+        )
+        self._db = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA busy_timeout=5000")
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS report_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_report_jobs_session
+                    ON report_jobs(session_id, updated_at);
+                """
+            )
+
+    # ---------- LIFECYCLE ----------
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+        if self._db is not None:
+            self._recover()
+            self._workers.append(asyncio.create_task(self._beat()))
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # ---------- JOBS ----------
+    async def submit(self, session, analytics: dict) -> dict:
+        job = {
+            "job_id": str(uuid.uuid4()),
+            "session_id": session["session_id"],
+            "status": QUEUED,
+            "stage": "queued",
+            "progress": 0,
+            "improvement": None,
+            "error": None,
+            "created_at": time.time(),
+            "finished_at": None,
+        }
+        self.jobs[job["job_id"]] = job
+        self._by_session[job["session_id"]] = job["job_id"]
+        self._trim()
+
+        await self._publish(job)
+        self._queue.put_nowait((job, session, analytics))
+        return job
+
+    def get(self, job_id: str) -> dict | None:
+        job = self.jobs.get(job_id)
+        if job is None and self._db is not None:
+            job = self._load("SELECT data, updated_at FROM report_jobs WHERE job_id = ?", job_id)
+        return job
+
+    def for_session(self, session_id: str) -> dict | None:
+        job_id = self._by_session.get(session_id)
+        if job_id and job_id in self.jobs:
+            return self.jobs[job_id]
+        if self._db is not None:
+            return self._load(
+                "SELECT data, updated_at FROM report_jobs WHERE session_id = ? ORDER BY updated_at DESC LIMIT 1",
+                session_id,
+            )
+        return None
+
+    def _trim(self):
+        # Forget the oldest finished jobs once over the limit
+        if len(self.jobs) <= self.max_jobs:
+            return
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= self.max_jobs:
+                break
+            job = self.jobs[job_id]
+            if job["status"] in (DONE, FAILED):
+                del self.jobs[job_id]
+                if self._by_session.get(job["session_id"]) == job_id:
+                    del self._by_session[job["session_id"]]
+
+    # ---------- SHARED STATUS ----------
+    def _load(self, query: str, arg: str) -> dict | None:
+        with self._db_lock:
+            row = self._db.execute(query, (arg,)).fetchone()
+        if row is None:
+            return None
+        job = json.loads(row[0])
+        if job["status"] in (QUEUED, RUNNING) and row[1] < time.time() - self._stale_after:
+            job = self._orphaned(job)
+        return job
+
+    @property
+    def _stale_after(self) -> float:
+        return 3 * self.heartbeat
+
+    def _orphaned(self, job: dict) -> dict:
+        job.update(
+            status=FAILED,
+            stage="failed",
+            error="the worker running this report stopped before it finished",
+            finished_at=time.time(),
+        )
+        self._save(job)
+        return job
+
+    def _recover(self):
+        """Fails the unfinished jobs of workers that are gone (e.g. before a restart)."""
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT data FROM report_jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (QUEUED, RUNNING, time.time() - self._stale_after),
+            ).fetchall()
+        for (data,) in rows:
+            self._orphaned(json.loads(data))
+        if rows:
+            logger.warning("Marked %d orphaned report jobs as failed", len(rows))
+
+    def _touch(self, job_ids: list[str]):
+        with self._db_lock:
+            self._db.executemany(
+                "UPDATE report_jobs SET updated_at = ? WHERE job_id = ? AND status IN (?, ?)",
+                [(time.time(), job_id, QUEUED, RUNNING) for job_id in job_ids],
+            )
+
+    async def _beat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            unfinished = [j for j, job in self.jobs.items() if job["status"] in (QUEUED, RUNNING)]
+            if unfinished:
+                await asyncio.to_thread(self._touch, unfinished)
+
+    def _save(self, job: dict):
+        with self._db_lock:
+            self._db.execute(
+                """
+                INSERT INTO report_jobs (job_id, session_id, status, data, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    status = excluded.status, data = excluded.data, updated_at = excluded.updated_at
+                """,
+                (job["job_id"], job["session_id"], job["status"], json.dumps(job, default=str), time.time()),
+            )
+            if job["status"] in (DONE, FAILED):
+                # Same limit as in memory: keep the newest max_jobs finished jobs
+                self._db.execute(
+                    """
+                    DELETE FROM report_jobs WHERE job_id IN (
+                        SELECT job_id FROM report_jobs WHERE status IN (?, ?)
+                        ORDER BY updated_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (DONE, FAILED, self.max_jobs),
+                )
+
+    async def _publish(self, job: dict):
+        if self._db is not None:
+            # Snapshot: the worker keeps updating the job while this is written
+            await asyncio.to_thread(self._save, dict(job))
+
+    # ---------- WORKERS ----------
+    async def _worker(self):
+        while True:
+            job, session, analytics = await self._queue.get()
+            try:
+                await self._run(job, session, analytics)
+            except Exception as e:
+                logger.exception("Report job %s failed", job["job_id"])
+                job["status"] = FAILED
+                job["stage"] = "failed"
+                job["error"] = str(e)
+                job["finished_at"] = time.time()
+                await self._publish(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: dict, session, analytics: dict):
+        JOB_WAIT_SECONDS.observe(time.time() - job["created_at"])
+        current_session.set(job["session_id"])
+        job["status"] = RUNNING
+        job["stage"] = "improvement_plan"
+        job["progress"] = 10
+        await self._publish(job)
+
+        improvement = await self.improvement_engine.agenerate_plan(session["aggregates"])
+        job["improvement"] = improvement
+        job["stage"] = "rendering"
+        job["progress"] = 60
+        await self._publish(job)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self._render_pool,
+            lambda: self.report_generator.generate(
+                session=session, analytics=analytics, improvement=improvement
+            ),
+        )
+
+        job["status"] = DONE
+        job["stage"] = "done"
+        job["progress"] = 100
+        job["finished_at"] = time.time()
+        await self._publish(job)
+
+    def stats(self) -> dict:
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in self.jobs.values():
+            counts[job["status"]] += 1
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "concurrency": self.concurrency,
+            **counts,
+        }
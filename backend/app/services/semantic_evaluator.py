@@ -1,10 +1,95 @@
-from sentence_transformers import SentenceTransformer, util
+import threading
+
+import numpy as np
+
+from app import config
+from app.services.embedding_backends import cache_namespace, create_backend
+from app.services.embedding_cache import EmbeddingCache
+from app.utils.metrics import Counter, Histogram
+
+SIMILARITY_SECONDS = Histogram(
+    "embedding_similarity_duration_seconds", "Relevance scoring time per call", ("op",)
+)
+ENCODE_SECONDS = Histogram(
+    "embedding_encode_duration_seconds", "Model forward pass time for cache misses"
+)
+ENCODED_TEXTS = Counter("embedding_encoded_texts_total", "Texts run through the embedding model")
 
 class SemanticEvaluator:
-    def __init__(self):
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+    def __init__(self, backend: str = config.EMBEDDING_BACKEND):
+        # The backend (and torch/onnxruntime) load on first use or via
+        # load(), so importing the app stays fast.
+        self.backend_name = backend
+        self._backend = None
+        self._load_lock = threading.Lock()
+        self.load_error: Exception | None = None
+        self.cache = EmbeddingCache(
+            max_entries=config.EMBEDDING_CACHE_ENTRIES,
+            path=config.EMBEDDING_CACHE_PATH or None,
+            namespace=cache_namespace(backend, config.ONNX_MODEL_DIR, config.ONNX_QUANTIZED),
+        )
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._backend is not None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self.load()
+        return self._backend
+
+    def load(self):
+        with self._load_lock:
+            if self._backend is not None:
+                return
+            try:
+                self._backend = create_backend(
+                    self.backend_name,
+                    onnx_dir=config.ONNX_MODEL_DIR,
+                    quantized=config.ONNX_QUANTIZED,
+                    threads=config.ONNX_THREADS,
+                )
+                self.load_error = None
+            except Exception as e:
+                self.load_error = e
+                raise
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Unit-normalized embeddings for ``texts``, one row per text.
+        Only texts missing from the cache go through the model, in a
+        single batched forward pass.
+        """
+        vectors = self.cache.get_many(texts)
+
+        missing = list(dict.fromkeys(
+            t for t, v in zip(texts, vectors) if v is None
+        ))
+        if missing:
+            with ENCODE_SECONDS.time():
+                encoded = self.backend.encode(missing)
+            ENCODED_TEXTS.inc(len(missing))
+            self.cache.put_many(missing, encoded)
+            fresh = dict(zip(missing, encoded))
+            vectors = [v if v is not None else fresh[t] for t, v in zip(texts, vectors)]
+
+        return np.stack(vectors)
 
     def similarity(self, q: str, a: str) -> float:
-        embeddings = self.model.encode([q, a], convert_to_tensor=True)
-        score = util.cos_sim(embeddings[0], embeddings[1])
-        return float(score) * 10  # scale to 0–10
+        with SIMILARITY_SECONDS.labels("single").time():
+            return self._similarity_many([(q, a)])[0]
+
+    def similarity_many(self, pairs: list[tuple[str, str]]) -> list[float]:
+        with SIMILARITY_SECONDS.labels("batch").time():
+            return self._similarity_many(pairs)
+
+    def _similarity_many(self, pairs: list[tuple[str, str]]) -> list[float]:
+        if not pairs:
+            return []
+        questions, answers = zip(*pairs)
+        embeddings = self.encode(list(questions) + list(answers))
+        q_emb, a_emb = embeddings[:len(pairs)], embeddings[len(pairs):]
+        # Rows are unit length, so the row-wise dot product is the cosine
+        scores = np.einsum("ij,ij->i", q_emb, a_emb)
+        return [float(s) * 10 for s in scores]  # scale to 0–10
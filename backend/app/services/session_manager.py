@@ -1,24 +1,106 @@
+import asyncio
+import logging
+import time
 import uuid
 
+from app import config
+from app.services.session_model import Session
+from app.services.session_store import create_store
+
+logger = logging.getLogger(__name__)
+
 class SessionManager:
-    def __init__(self):
-        self.sessions = {}
+    def __init__(self, store=None):
+        self.store = store or create_store(
+            config.SESSION_STORE,
+            path=config.SESSION_DB_PATH,
+            cache_entries=config.SESSION_CACHE_ENTRIES,
+            max_sessions=config.SESSION_MAX_SESSIONS,
+            max_bytes=config.SESSION_MAX_BYTES,
+        )
+        self.store.on_evict = self._notify_evicted
+        self._evict_listeners = []
+        self._sweeper: asyncio.Task | None = None
 
     def create_session(self, role, domain, difficulty, mode):
-        session_id = str(uuid.uuid4())
-        self.sessions[session_id] = {
-            "session_id": session_id,
-            "role": role,
-            "domain": domain,
-            "difficulty": difficulty,
-            "mode": mode,
-            "questions": [],
-            "answers": [],
-            "evaluations": [],   # ✅ ALWAYS INITIALIZED
-            "start_time": None,
-            "end_time": None
-        }
-        return self.sessions[session_id]
+        session = Session(
+            session_id=str(uuid.uuid4()),
+            role=role,
+            domain=domain,
+            difficulty=difficulty,
+            mode=mode,
+            start_time=time.time(),
+        )
+        self.store.create(session)
+        return session
 
     def get_session(self, session_id):
-        return self.sessions.get(session_id)
+        return self.store.load(session_id)
+
+    # Writes go through the store so every worker sees them
+    def add_question(self, session_id, question):
+        self.store.append_question(session_id, question)
+
+    def record_turn(self, session_id, answer, evaluation, next_question=None):
+        self.store.append_turn(session_id, answer, evaluation, next_question)
+
+    def end_session(self, session_id):
+        self.store.set_end_time(session_id, time.time())
+
+    # ---------- ASYNC ----------
+    # A SQLite write can wait up to busy_timeout for another worker's
+    # lock; async routes use these so the event loop never blocks on it.
+    async def acreate_session(self, role, domain, difficulty, mode):
+        return await asyncio.to_thread(self.create_session, role, domain, difficulty, mode)
+
+    async def aget_session(self, session_id):
+        return await asyncio.to_thread(self.get_session, session_id)
+
+    async def aadd_question(self, session_id, question):
+        await asyncio.to_thread(self.add_question, session_id, question)
+
+    async def arecord_turn(self, session_id, answer, evaluation, next_question=None):
+        await asyncio.to_thread(self.record_turn, session_id, answer, evaluation, next_question)
+
+    async def aend_session(self, session_id):
+        await asyncio.to_thread(self.end_session, session_id)
+
+    # ---------- EVICTION ----------
+    def add_evict_listener(self, listener):
+        """``listener(session_ids)`` runs whenever sessions are evicted."""
+        self._evict_listeners.append(listener)
+
+    def _notify_evicted(self, session_ids):
+        for listener in self._evict_listeners:
+            try:
+                listener(session_ids)
+            except Exception:
+                logger.exception("Session evict listener failed")
+
+    def sweep(self):
+        return self.store.sweep(config.SESSION_IDLE_TTL, config.SESSION_COMPLETED_TTL)
+
+    def start_sweeper(self, interval: float = config.SESSION_SWEEP_INTERVAL):
+        async def run():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    evicted = await asyncio.to_thread(self.sweep)
+                    if evicted:
+                        logger.info("Evicted %d expired sessions", len(evicted))
+                except Exception:
+                    logger.exception("Session sweep failed")
+
+        self._sweeper = asyncio.create_task(run())
+
+    async def stop_sweeper(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    def stats(self):
+        return self.store.stats()
@@ -0,0 +1,150 @@
+import sys
+import time
+from array import array
+
+from app.utils.running_stats import SessionAggregates
+
+# Per-turn numeric scores, each stored as one typed array per session
+SCORE_FIELDS = (
+    "relevance_score",
+    "correctness_score",
+    "confidence_score",
+    "star_score",
+    "readiness_score",
+)
+STAR_DIMENSIONS = ("situation", "task", "action", "result")
+
+_CORE_KEYS = frozenset(SCORE_FIELDS) | {"star_breakdown", "feedback"}
+_ARRAY_BYTES = sys.getsizeof(array("d"))
+_AGGREGATE_BYTES = (
+    sys.getsizeof(SessionAggregates())
+    + sum(sys.getsizeof(stat) for stat in SessionAggregates().stats.values())
+)
+
+
+def _str_bytes(text: str) -> int:
+    return sys.getsizeof(text)
+
+
+class Session:
+    """
+    Compact interview session.
+
+    Questions and answers are plain lists of strings. Scores are typed
+    ``array('d')`` columns instead of one dict per turn. Feedback lines
+    come from a small fixed set, so they are interned and stored as
+    tuples. ``session["key"]`` still works for the dict-style callers
+    (routes, report generator), and ``evaluations`` rebuilds the
+    per-turn dicts on demand.
+    """
+
+    __slots__ = (
+        "session_id", "role", "domain", "difficulty", "mode",
+        "questions", "answers", "scores", "star", "feedback", "extras", "aggregates",
+        "start_time", "end_time", "last_access", "nbytes",
+    )
+
+    def __init__(self, session_id, role, domain, difficulty, mode, start_time=None, end_time=None):
+        self.session_id = session_id
+        self.role = role
+        self.domain = domain
+        self.difficulty = difficulty
+        self.mode = mode
+        self.questions: list[str] = []
+        self.answers: list[str] = []
+        self.scores = {field: array("d") for field in SCORE_FIELDS}
+        self.star = array("d")  # len(STAR_DIMENSIONS) values per turn
+        self.feedback: list[tuple[str, ...]] = []
+        self.extras: dict[int, dict] | None = None  # rare non-score evaluation keys
+        self.aggregates = SessionAggregates()  # running stats, updated per turn
+        self.start_time = start_time
+        self.end_time = end_time
+        self.last_access = time.monotonic()
+        self.nbytes = (
+            sys.getsizeof(self)
+            + sum(_str_bytes(v) for v in (session_id, role, domain, difficulty, mode))
+            + _ARRAY_BYTES * (len(SCORE_FIELDS) + 1)
+            + _AGGREGATE_BYTES
+        )
+
+    # ---------- DICT-STYLE ACCESS ----------
+    def __getitem__(self, key):
+        if key == "evaluations":
+            return self.evaluations
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    @property
+    def turns(self) -> int:
+        return len(self.answers)
+
+    @property
+    def completed(self) -> bool:
+        return self.end_time is not None
+
+    # ---------- MUTATION ----------
+    def add_question(self, question: str):
+        self.questions.append(question)
+        self.nbytes += _str_bytes(question) + 8
+
+    def add_turn(self, answer: str, evaluation: dict):
+        idx = len(self.answers)
+        self.answers.append(answer)
+        for field in SCORE_FIELDS:
+            self.scores[field].append(float(evaluation.get(field, 0)))
+
+        breakdown = evaluation.get("star_breakdown") or {}
+        for dim in STAR_DIMENSIONS:
+            self.star.append(float(breakdown.get(dim, 0)))
+
+        self.feedback.append(tuple(sys.intern(f) for f in evaluation.get("feedback", [])))
+        self.aggregates.add(evaluation)
+
+        extra = {k: v for k, v in evaluation.items() if k not in _CORE_KEYS}
+        if extra:
+            if self.extras is None:
+                self.extras = {}
+            self.extras[idx] = extra
+
+        self.nbytes += (
+            _str_bytes(answer) + 8
+            + 8 * (len(SCORE_FIELDS) + len(STAR_DIMENSIONS))
+            + sys.getsizeof(self.feedback[-1])
+            + (sys.getsizeof(extra) if extra else 0)
+        )
+
+    # ---------- VIEWS ----------
+    def evaluation(self, idx: int) -> dict:
+        n = len(STAR_DIMENSIONS)
+        star = self.star[idx * n:(idx + 1) * n]
+        evaluation = {field: self.scores[field][idx] for field in SCORE_FIELDS}
+        evaluation["star_breakdown"] = dict(zip(STAR_DIMENSIONS, star))
+        evaluation["feedback"] = list(self.feedback[idx])
+        if self.extras and idx in self.extras:
+            evaluation.update(self.extras[idx])
+        return evaluation
+
+    @property
+    def evaluations(self) -> list[dict]:
+        return [self.evaluation(i) for i in range(len(self.answers))]
+
+    def to_dict(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "role": self.role,
+            "domain": self.domain,
+            "difficulty": self.difficulty,
+            "mode": self.mode,
+            "questions": list(self.questions),
+            "answers": list(self.answers),
+            "evaluations": self.evaluations,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+        }
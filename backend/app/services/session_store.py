@@ -0,0 +1,404 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from app.services.session_model import Session
+
+
+class SessionNotFound(KeyError):
+    """Write to a session that no longer exists (swept or evicted mid-turn)."""
+
+
+class InMemorySessionStore:
+    """
+    Sessions live in this process only (single worker, lost on restart).
+
+    Bounded by ``max_sessions`` and an approximate ``max_bytes``; when
+    either is exceeded the least recently used sessions are evicted.
+    ``sweep()`` drops idle and completed sessions past their TTL. It
+    runs on a worker thread, so every method takes the lock.
+    """
+
+    def __init__(self, max_sessions: int = 10_000, max_bytes: int = 256 * 1024 * 1024):
+        self.sessions: OrderedDict[str, Session] = OrderedDict()
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.on_evict = None
+        self.evicted_lru = 0
+        self.evicted_ttl = 0
+        self._lock = threading.RLock()
+
+    def create(self, session: Session):
+        with self._lock:
+            self.sessions[session.session_id] = session
+            self.total_bytes += session.nbytes
+            self._enforce_cap()
+
+    def load(self, session_id: str) -> Session | None:
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is not None:
+                self.sessions.move_to_end(session_id)
+                session.last_access = time.monotonic()
+            return session
+
+    def _mutate(self, session_id: str, mutate):
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                raise SessionNotFound(session_id)
+            before = session.nbytes
+            mutate(session)
+            session.last_access = time.monotonic()
+            self.total_bytes += session.nbytes - before
+            self._enforce_cap()
+
+    def append_question(self, session_id: str, question: str):
+        self._mutate(session_id, lambda s: s.add_question(question))
+
+    def append_turn(self, session_id: str, answer: str, evaluation: dict, next_question: str | None):
+        def mutate(session):
+            session.add_turn(answer, evaluation)
+            if next_question is not None:
+                session.add_question(next_question)
+
+        self._mutate(session_id, mutate)
+
+    def set_end_time(self, session_id: str, end_time: float):
+        self._mutate(session_id, lambda s: setattr(s, "end_time", end_time))
+
+    # ---------- EVICTION ----------
+    def _remove(self, session_ids: list[str]):
+        for session_id in session_ids:
+            session = self.sessions.pop(session_id, None)
+            if session is not None:
+                self.total_bytes -= session.nbytes
+        if session_ids and self.on_evict:
+            self.on_evict(session_ids)
+
+    def _enforce_cap(self):
+        evicted = []
+        while self.sessions and (
+            len(self.sessions) > self.max_sessions or self.total_bytes > self.max_bytes
+        ):
+            session_id, session = self.sessions.popitem(last=False)
+            self.total_bytes -= session.nbytes
+            evicted.append(session_id)
+        if evicted:
+            self.evicted_lru += len(evicted)
+            if self.on_evict:
+                self.on_evict(evicted)
+
+    def sweep(self, idle_ttl: float, completed_ttl: float) -> list[str]:
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                session_id for session_id, s in self.sessions.items()
+                if now - s.last_access > (completed_ttl if s.completed else idle_ttl)
+            ]
+            self._remove(expired)
+            self.evicted_ttl += len(expired)
+        return expired
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "live_sessions": sum(1 for s in self.sessions.values() if not s.completed),
+                "sessions_in_memory": len(self.sessions),
+                "approx_bytes": self.total_bytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes,
+                "evicted_lru": self.evicted_lru,
+                "evicted_ttl": self.evicted_ttl,
+            }
+
+
+class SQLiteSessionStore:
+    """
+    Sessions shared by every worker through one SQLite file in WAL mode.
+
+    Questions and turns are separate rows, so each answer is one small
+    INSERT instead of rewriting the session. Each session row has a
+    ``version`` that every write bumps. ``load()`` serves a cached copy
+    while its version still matches the database, which costs a single
+    primary-key lookup. The read cache is LRU-bounded by entry count and
+    approximate bytes. ``sweep()`` deletes sessions past their TTL from
+    the database.
+    """
+
+    def __init__(self, path: str, cache_entries: int = 1024, max_cache_bytes: int = 64 * 1024 * 1024):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, tuple[int, Session]] = OrderedDict()
+        self.cache_entries = cache_entries
+        self.max_cache_bytes = max_cache_bytes
+        self.cache_bytes = 0
+        self.on_evict = None
+        self.evicted_ttl = 0
+
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                role TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                difficulty TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                start_time REAL,
+                end_time REAL,
+                version INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS questions (
+                session_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (session_id, idx)
+            );
+            CREATE TABLE IF NOT EXISTS turns (
+                session_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                answer TEXT NOT NULL,
+                evaluation TEXT NOT NULL,
+                PRIMARY KEY (session_id, idx)
+            );
+            """
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(sessions)")}
+        if "updated_at" not in columns:
+            self._db.execute("ALTER TABLE sessions ADD COLUMN updated_at REAL")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated_at)"
+        )
+
+    # ---------- CACHE ----------
+    def _cache_put(self, session_id: str, version: int, session: Session):
+        self._cache_drop(session_id)
+        self._cache[session_id] = (version, session)
+        self.cache_bytes += session.nbytes
+        self._trim_cache()
+
+    def _trim_cache(self):
+        while self._cache and (
+            len(self._cache) > self.cache_entries or self.cache_bytes > self.max_cache_bytes
+        ):
+            _, (_, dropped) = self._cache.popitem(last=False)
+            self.cache_bytes -= dropped.nbytes
+
+    def _cache_drop(self, session_id: str):
+        cached = self._cache.pop(session_id, None)
+        if cached is not None:
+            self.cache_bytes -= cached[1].nbytes
+
+    def _version(self, session_id: str) -> int | None:
+        row = self._db.execute(
+            "SELECT version FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _bump(self, session_id: str) -> int:
+        self._db.execute(
+            "UPDATE sessions SET version = version + 1, updated_at = ? WHERE session_id = ?",
+            (time.time(), session_id),
+        )
+        return self._version(session_id)
+
+    def _apply(self, session_id: str, old_version: int | None, new_version: int, mutate):
+        # Patch our cached copy only if nobody else wrote in between
+        cached = self._cache.get(session_id)
+        if cached and cached[0] == old_version:
+            session = cached[1]
+            before = session.nbytes
+            mutate(session)
+            session.last_access = time.monotonic()
+            self.cache_bytes += session.nbytes - before
+            self._cache[session_id] = (new_version, session)
+            self._cache.move_to_end(session_id)
+            self._trim_cache()
+        else:
+            self._cache_drop(session_id)
+
+    def _write(self, session_id: str, statements, mutate):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                old_version = self._version(session_id)
+                if old_version is None:
+                    raise SessionNotFound(session_id)
+                statements()
+                new_version = self._bump(session_id)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._apply(session_id, old_version, new_version, mutate)
+
+    # ---------- STORE API ----------
+    def create(self, session: Session):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?)",
+                (
+                    session.session_id, session.role, session.domain,
+                    session.difficulty, session.mode,
+                    session.start_time, session.end_time, time.time(),
+                ),
+            )
+            self._cache_put(session.session_id, 0, session)
+
+    def load(self, session_id: str) -> Session | None:
+        with self._lock:
+            version = self._version(session_id)
+            if version is None:
+                self._cache_drop(session_id)
+                return None
+
+            cached = self._cache.get(session_id)
+            if cached and cached[0] == version:
+                self._cache.move_to_end(session_id)
+                cached[1].last_access = time.monotonic()
+                return cached[1]
+
+            session = self._read(session_id)
+            self._cache_put(session_id, version, session)
+            return session
+
+    def _read(self, session_id: str) -> Session:
+        row = self._db.execute(
+            """
+            SELECT role, domain, difficulty, mode, start_time, end_time
+            FROM sessions WHERE session_id = ?
+            """,
+            (session_id,),
+        ).fetchone()
+        session = Session(session_id, *row)
+
+        for (question,) in self._db.execute(
+            "SELECT text FROM questions WHERE session_id = ? ORDER BY idx", (session_id,)
+        ):
+            session.add_question(question)
+        for answer, evaluation in self._db.execute(
+            "SELECT answer, evaluation FROM turns WHERE session_id = ? ORDER BY idx", (session_id,)
+        ):
+            session.add_turn(answer, json.loads(evaluation))
+        return session
+
+    def append_question(self, session_id: str, question: str):
+        self._write(
+            session_id,
+            lambda: self._insert_question(session_id, question),
+            lambda s: s.add_question(question),
+        )
+
+    def append_turn(self, session_id: str, answer: str, evaluation: dict, next_question: str | None):
+        def statements():
+            self._db.execute(
+                """
+                INSERT INTO turns
+                SELECT ?, COALESCE(MAX(idx) + 1, 0), ?, ?
+                FROM turns WHERE session_id = ?
+                """,
+                (session_id, answer, json.dumps(evaluation), session_id),
+            )
+            if next_question is not None:
+                self._insert_question(session_id, next_question)
+
+        def mutate(session):
+            session.add_turn(answer, evaluation)
+            if next_question is not None:
+                session.add_question(next_question)
+
+        self._write(session_id, statements, mutate)
+
+    def _insert_question(self, session_id: str, question: str):
+        self._db.execute(
+            """
+            INSERT INTO questions
+            SELECT ?, COALESCE(MAX(idx) + 1, 0), ?
+            FROM questions WHERE session_id = ?
+            """,
+            (session_id, question, session_id),
+        )
+
+    def set_end_time(self, session_id: str, end_time: float):
+        self._write(
+            session_id,
+            lambda: self._db.execute(
+                "UPDATE sessions SET end_time = ? WHERE session_id = ?",
+                (end_time, session_id),
+            ),
+            lambda s: setattr(s, "end_time", end_time),
+        )
+
+    # ---------- EVICTION ----------
+    def sweep(self, idle_ttl: float, completed_ttl: float) -> list[str]:
+        now = time.time()
+        with self._lock:
+            expired = [
+                session_id for (session_id,) in self._db.execute(
+                    """
+                    SELECT session_id FROM sessions
+                    WHERE (end_time IS NULL AND updated_at < ?)
+                       OR (end_time IS NOT NULL AND updated_at < ?)
+                    """,
+                    (now - idle_ttl, now - completed_ttl),
+                )
+            ]
+            if expired:
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    for table in ("turns", "questions", "sessions"):
+                        self._db.executemany(
+                            f"DELETE FROM {table} WHERE session_id = ?",
+                            [(session_id,) for session_id in expired],
+                        )
+                    self._db.execute("COMMIT")
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+                for session_id in expired:
+                    self._cache_drop(session_id)
+        self.evicted_ttl += len(expired)
+        if expired and self.on_evict:
+            self.on_evict(expired)
+        return expired
+
+    def stats(self) -> dict:
+        with self._lock:
+            (live,) = self._db.execute(
+                "SELECT COUNT(*) FROM sessions WHERE end_time IS NULL"
+            ).fetchone()
+            (total,) = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()
+        return {
+            "backend": "sqlite",
+            "live_sessions": live,
+            "stored_sessions": total,
+            "sessions_in_memory": len(self._cache),
+            "approx_bytes": self.cache_bytes,
+            "max_cache_entries": self.cache_entries,
+            "max_bytes": self.max_cache_bytes,
+            "evicted_ttl": self.evicted_ttl,
+        }
+
+
+def create_store(
+    kind: str,
+    path: str = "",
+    cache_entries: int = 1024,
+    max_sessions: int = 10_000,
+    max_bytes: int = 256 * 1024 * 1024,
+):
+    if kind == "memory":
+        return InMemorySessionStore(max_sessions=max_sessions, max_bytes=max_bytes)
+    if kind == "sqlite":
+        return SQLiteSessionStore(path, cache_entries=cache_entries, max_cache_bytes=max_bytes)
+    raise ValueError(f"Unknown session store: {kind}")
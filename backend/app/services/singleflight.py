@@ -0,0 +1,135 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, TypeVar
+
+from app.services import deadline
+from app.services.deadline import DeadlineExceeded
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls from threads.
+
+    The first caller for a key runs ``fn``; callers that arrive while it
+    is in flight wait for that result (or exception) instead of starting
+    their own. The key is forgotten as soon as the call finishes.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Returns ``(result, joined)``; ``joined`` is True for coalesced callers."""
+        with self._lock:
+            call = self._calls.get(key)
+            joined = call is not None
+            if joined:
+                self.coalesced += 1
+            else:
+                call = self._calls[key] = _Call()
+
+        if joined:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent identical coroutine calls on the event loop.
+
+    The shared work runs as its own task and every caller awaits it
+    through ``asyncio.shield``, so one caller being cancelled (client
+    disconnect) doesn't cancel the result the others are waiting for.
+    When the last waiting caller is cancelled the work is cancelled
+    too, instead of finishing for nobody.
+
+    The work runs without a request budget (see ``deadline``); each
+    caller applies its own deadline to its wait instead, and gets
+    ``DeadlineExceeded`` when that runs out.
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+        self.coalesced = 0
+        self.abandoned = 0
+
+    @staticmethod
+    async def _run(fn: Callable[[], Awaitable[T]]) -> T:
+        # The task's context is a copy, so this leaves the caller's budget alone
+        deadline.clear()
+        return await fn()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        task = self._tasks.get(key)
+        joined = task is not None
+        if joined:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._run(fn))
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        left = deadline.remaining()
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(task), None if left is None else max(left, 0.0)
+            ), joined
+        except asyncio.CancelledError:
+            self._leave(task)
+            raise
+        except asyncio.TimeoutError:
+            if task.done():
+                raise  # the shared work itself timed out
+            self._leave(task)
+            raise DeadlineExceeded("request time budget ran out waiting for a shared LLM call") from None
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _leave(self, task: asyncio.Task):
+        # A caller gave up; cancel the work if nobody else is waiting for it
+        if self._waiters[task] == 1 and not task.done():
+            self.abandoned += 1
+            task.cancel()
+
+    def _finished(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
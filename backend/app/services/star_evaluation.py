@@ -1,11 +1,88 @@
+import json
+
 from app.services.local_llm import LocalLLM
 
+STAR_KEYS = ("situation", "task", "action", "result")
+STAR_MAX = 2.5
+
+# Cue phrases for the heuristic fallback, one list per STAR dimension
+_STAR_CUES = {
+    "situation": ("when i", "at my", "in my previous", "our team", "the project", "we had", "context"),
+    "task": ("i needed to", "my goal", "responsible for", "i was asked", "the challenge", "objective", "had to"),
+    "action": ("i implemented", "i built", "i designed", "i led", "i optimized", "i analyzed", "i used", "i decided"),
+    "result": ("as a result", "resulted in", "improved", "reduced", "increased", "saved", "%", "outcome"),
+}
+
+
+# ---------- PARSING ----------
+def parse_json_object(text: str | None) -> dict | None:
+    """The JSON object in an LLM response, or None if there isn't one."""
+    if not text:
+        return None
+    try:
+        data = json.loads(text)
+    except ValueError:
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        try:
+            data = json.loads(text[start:end + 1])
+        except ValueError:
+            return None
+    return data if isinstance(data, dict) else None
+
+
+def to_number(value) -> float | None:
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def validate_star(data, errors: list[str], path: str = "") -> dict | None:
+    """Checks a STAR breakdown, clamping scores into range. Problems go to ``errors``."""
+    if not isinstance(data, dict):
+        errors.append(f"{path or 'response'}: expected an object with keys {', '.join(STAR_KEYS)}")
+        return None
+    breakdown = {}
+    for key in STAR_KEYS:
+        value = to_number(data.get(key))
+        if value is None:
+            errors.append(f"{path}{key}: expected a number from 0 to {STAR_MAX}")
+            continue
+        breakdown[key] = round(min(max(value, 0.0), STAR_MAX), 2)
+    return breakdown if len(breakdown) == len(STAR_KEYS) else None
+
+
+def heuristic_star(answer: str) -> dict:
+    """Keyword estimate of the STAR breakdown for when the LLM output is unusable."""
+    text = answer.lower()
+    return {
+        key: round(min(sum(1 for cue in cues if cue in text) * 0.8, STAR_MAX), 2)
+        for key, cues in _STAR_CUES.items()
+    }
+
+
+def star_result(breakdown: dict, fallback: bool = False) -> dict:
+    result = {
+        "star_score": round(sum(breakdown.values()), 2),
+        "breakdown": breakdown,
+    }
+    if fallback:
+        result["fallback"] = True
+    return result
+
+
 class STAREvaluator:
     def __init__(self):
         self.llm = LocalLLM()
 
-    def evaluate(self, question: str, answer: str) -> dict:
-        prompt = f"""
+    def _prompt(self, question: str, answer: str) -> str:
+        return f"""
 You are an interview evaluator.
 
 Evaluate the candidate answer using the STAR method.
@@ -31,26 +108,37 @@ Return STRICT JSON:
 }}
 """
 
+    @staticmethod
+    def _parse(response: str | None) -> dict | None:
+        return validate_star(parse_json_object(response), [])
+
+    def _score(self, response: str | None, answer: str) -> dict:
+        breakdown = self._parse(response)
+        if breakdown is None:
+            # Flag the estimate instead of silently scoring zero
+            return star_result(heuristic_star(answer), fallback=True)
+        return star_result(breakdown)
+
+    def evaluate(self, question: str, answer: str) -> dict:
+        try:
+            response = self.llm.generate(
+                self._prompt(question, answer),
+                format="json",
+                validate=lambda text: self._parse(text) is not None,
+                caller="star",
+            )
+        except Exception:
+            response = None
+        return self._score(response, answer)
+
+    async def aevaluate(self, question: str, answer: str) -> dict:
         try:
-            response = self.llm.generate(prompt)
-            scores = eval(response)  # trusted internal LLM call
+            response = await self.llm.agenerate(
+                self._prompt(question, answer),
+                format="json",
+                validate=lambda text: self._parse(text) is not None,
+                caller="star",
+            )
         except Exception:
-            scores = {
-                "situation": 0.0,
-                "task": 0.0,
-                "action": 0.0,
-                "result": 0.0
-            }
-
-        total = round(
-            scores["situation"]
-            + scores["task"]
-            + scores["action"]
-            + scores["result"],
-            2
-        )
-
-        return {
-            "star_score": total,
-            "breakdown": scores
-        }
+            response = None
+        return self._score(response, answer)
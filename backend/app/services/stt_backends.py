@@ -0,0 +1,117 @@
+import json
+import wave
+from pathlib import Path
+
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+
+class GoogleSTTBackend:
+    """Original backend: Google Web Speech via speech_recognition (needs network, whole files only)."""
+
+    name = "google"
+    streaming = False
+
+    def __init__(self):
+        import speech_recognition as sr
+
+        self.sr = sr
+
+    def transcribe_file(self, path: str) -> str:
+        recognizer = self.sr.Recognizer()
+        with self.sr.AudioFile(path) as source:
+            audio = recognizer.record(source)
+        return recognizer.recognize_google(audio)
+
+
+class VoskStream:
+    """
+    Incremental recognizer for one utterance.
+
+    ``feed`` takes raw 16-bit mono PCM as it arrives and returns the
+    current partial hypothesis; finished segments accumulate as Vosk
+    detects pauses, so ``finish`` only has to decode the tail.
+    """
+
+    def __init__(self, recognizer, sample_rate: int):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.segments: list[str] = []
+        self.partial = ""
+        self.audio_bytes = 0
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.audio_bytes / (self.sample_rate * SAMPLE_WIDTH)
+
+    @property
+    def text(self) -> str:
+        return " ".join(s for s in (*self.segments, self.partial) if s)
+
+    def feed(self, pcm: bytes) -> str:
+        if not pcm:
+            return self.text
+        self.audio_bytes += len(pcm)
+        if self.recognizer.AcceptWaveform(pcm):
+            segment = json.loads(self.recognizer.Result()).get("text", "")
+            if segment:
+                self.segments.append(segment)
+            self.partial = ""
+        else:
+            self.partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return self.text
+
+    def finish(self) -> str:
+        segment = json.loads(self.recognizer.FinalResult()).get("text", "")
+        if segment:
+            self.segments.append(segment)
+        self.partial = ""
+        return self.text
+
+
+class VoskBackend:
+    """
+    Offline, CPU-only recognition with Vosk (Kaldi).
+
+    Expects an unpacked model directory (e.g. vosk-model-small-en-us-0.15
+    from alphacephei.com/vosk/models). The model is loaded once and
+    shared; each stream gets its own lightweight recognizer.
+    """
+
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, model_dir: str, sample_rate: int = 16000):
+        import vosk
+
+        if not Path(model_dir).is_dir():
+            raise FileNotFoundError(
+                f"Vosk model not found at {model_dir}; download one and set VOSK_MODEL_DIR"
+            )
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(model_dir)
+        self.sample_rate = sample_rate
+
+    def open_stream(self, sample_rate: int | None = None) -> VoskStream:
+        sample_rate = sample_rate or self.sample_rate
+        return VoskStream(self.vosk.KaldiRecognizer(self.model, sample_rate), sample_rate)
+
+    def transcribe_file(self, path: str, chunk_frames: int = 4000) -> str:
+        with wave.open(path, "rb") as wav:
+            if wav.getnchannels() != 1 or wav.getsampwidth() != SAMPLE_WIDTH:
+                raise ValueError("expected 16-bit mono WAV audio")
+            stream = self.open_stream(wav.getframerate())
+            while True:
+                frames = wav.readframes(chunk_frames)
+                if not frames:
+                    break
+                stream.feed(frames)
+        return stream.finish()
+
+
+def create_stt_backend(name: str, model_dir: str = "", sample_rate: int = 16000):
+    if name == "google":
+        return GoogleSTTBackend()
+    if name == "vosk":
+        return VoskBackend(model_dir, sample_rate=sample_rate)
+    raise ValueError(f"Unknown speech-to-text backend: {name}")
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from app.utils.metrics import Counter
+
+TTS_CACHE = Counter("tts_cache_total", "Text-to-speech cache lookups", ("outcome",))
+
+
+def speech_key(text: str, settings: dict) -> str:
+    """Content address of one rendering: the text plus every setting that changes the audio."""
+    payload = json.dumps({"text": text, **settings}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    Content-addressed audio files on disk, ``<dir>/<key[:2]>/<key>.wav``.
+
+    Bounded by ``max_bytes`` and ``max_files``; least recently used
+    files are deleted first. Reads bump the file's mtime, so the LRU
+    order survives restarts (the index is rebuilt from the directory).
+    ``max_bytes=0`` disables the cache.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, max_files: int = 5000):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._index: OrderedDict[str, int] = OrderedDict()  # key -> size, oldest first
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        if self.enabled:
+            self._load()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.max_files > 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.wav"
+
+    def _load(self):
+        if not self.directory.exists():
+            return
+        files = sorted(
+            (p.stat().st_mtime, p.stem, p.stat().st_size) for p in self.directory.glob("*/*.wav")
+        )
+        for _, key, size in files:
+            self._index[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    def get(self, key: str, count: bool = True) -> bytes | None:
+        """Cached audio for ``key``; ``count=False`` for re-checks that shouldn't skew the hit rate."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            known = key in self._index
+            if known:
+                self._index.move_to_end(key)
+        if known:
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except FileNotFoundError:
+                self._forget(key)
+            else:
+                if count:
+                    self.hits += 1
+                    TTS_CACHE.labels("hit").inc()
+                return data
+        if count:
+            self.misses += 1
+            TTS_CACHE.labels("miss").inc()
+        return None
+
+    def put(self, key: str, data: bytes):
+        if not self.enabled or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self.total_bytes += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._evict()
+
+    def _forget(self, key: str):
+        with self._lock:
+            self.total_bytes -= self._index.pop(key, 0)
+
+    def _evict(self):
+        # Call with the lock held (or during _load)
+        while self._index and (
+            self.total_bytes > self.max_bytes or len(self._index) > self.max_files
+        ):
+            key, size = self._index.popitem(last=False)
+            self.total_bytes -= size
+            self.evicted += 1
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "files": len(self._index),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "max_files": self.max_files,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evicted": self.evicted,
+            }
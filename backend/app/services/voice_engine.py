@@ -1,21 +1,326 @@
-import speech_recognition as sr
-import pyttsx3
+import asyncio
+import logging
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from app import config
+from app.services.singleflight import AsyncSingleFlight
+from app.services.stt_backends import SAMPLE_WIDTH, create_stt_backend
+from app.services.tts_cache import AudioCache, speech_key
+from app.utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+TTS_RENDER_SECONDS = Histogram("tts_render_seconds", "Time to synthesize one text to audio")
+
+_MAX_HEADER_BYTES = 64 * 1024
+
+
+class AudioFormatError(ValueError):
+    """Uploaded audio isn't 16-bit mono PCM (raw or WAV)."""
+
+
+def _parse_wav_header(data: bytes) -> tuple[int, int] | None:
+    """``(sample_rate, data_offset)`` once the header is complete, else None."""
+    if len(data) < 12:
+        return None
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise AudioFormatError("not a WAV file")
+    sample_rate = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id, size = data[offset:offset + 4], struct.unpack("<I", data[offset + 4:offset + 8])[0]
+        if chunk_id == b"data":
+            if sample_rate is None:
+                raise AudioFormatError("WAV data before fmt chunk")
+            return sample_rate, offset + 8
+        if chunk_id == b"fmt ":
+            if offset + 24 > len(data):
+                return None
+            audio_format, channels, sample_rate = struct.unpack("<HHI", data[offset + 8:offset + 16])
+            bits = struct.unpack("<H", data[offset + 22:offset + 24])[0]
+            if audio_format != 1 or channels != 1 or bits != SAMPLE_WIDTH * 8:
+                raise AudioFormatError("expected 16-bit mono PCM WAV audio")
+        offset += 8 + size + (size & 1)
+    return None
+
+
+class TranscriptionStream:
+    """
+    One candidate answer being transcribed while it is uploaded.
+
+    Accepts raw 16-bit mono PCM at ``sample_rate``, or a WAV stream
+    whose header arrives with the first chunks. Chunks may split samples
+    anywhere; a trailing odd byte is held for the next chunk.
+    """
+
+    def __init__(self, recognizer_factory, sample_rate: int, session_id: str | None = None):
+        self.stream_id = str(uuid.uuid4())
+        self.session_id = session_id
+        self.sample_rate = sample_rate
+        self._factory = recognizer_factory
+        self._recognizer = None
+        self._pending = b""
+        self._header_done = False
+        self.lock = threading.Lock()  # chunks are decoded in order, one at a time
+        self.created = self.last_used = time.monotonic()
+        self.transcribe_seconds = 0.0
+
+    @property
+    def audio_seconds(self) -> float:
+        return self._recognizer.audio_seconds if self._recognizer else 0.0
+
+    @property
+    def text(self) -> str:
+        return self._recognizer.text if self._recognizer else ""
+
+    def _pcm(self, data: bytes) -> bytes:
+        data = self._pending + data
+        if not self._header_done:
+            if data[:4] == b"RIFF" or (len(data) < 4 and b"RIFF".startswith(data)):
+                header = _parse_wav_header(data)
+                if header is None:
+                    if len(data) > _MAX_HEADER_BYTES:
+                        raise AudioFormatError("WAV header too large")
+                    self._pending = data
+                    return b""
+                self.sample_rate, offset = header
+                data = data[offset:]
+            self._header_done = True
+            self._recognizer = self._factory(self.sample_rate)
+        usable = len(data) - len(data) % SAMPLE_WIDTH
+        self._pending = data[usable:]
+        return data[:usable]
+
+    def feed(self, data: bytes) -> str:
+        """Decodes a chunk (CPU-bound; call off the event loop) and returns the partial transcript."""
+        with self.lock:
+            start = time.perf_counter()
+            pcm = self._pcm(data)
+            text = self._recognizer.feed(pcm) if pcm else self.text
+            self.transcribe_seconds += time.perf_counter() - start
+            self.last_used = time.monotonic()
+            return text
+
+    def finish(self) -> str:
+        with self.lock:
+            if self._recognizer is None:
+                return ""
+            start = time.perf_counter()
+            text = self._recognizer.finish()
+            self.transcribe_seconds += time.perf_counter() - start
+            return text
+
+    def info(self) -> dict:
+        return {
+            "stream_id": self.stream_id,
+            "session_id": self.session_id,
+            "sample_rate": self.sample_rate,
+            "audio_seconds": round(self.audio_seconds, 3),
+            "transcribe_seconds": round(self.transcribe_seconds, 3),
+            "transcript": self.text,
+        }
+
+
+def audio_media_type(data: bytes) -> str:
+    # pyttsx3 on macOS writes AIFF whatever the file name says
+    return "audio/aiff" if data[:4] == b"FORM" else "audio/wav"
+
 
 class VoiceEngine:
+    def __init__(self, stt_backend: str = config.STT_BACKEND):
+        # The STT model and the TTS engine load on first use
+        self.stt_backend_name = stt_backend
+        self._stt = None
+        self._stt_lock = threading.Lock()
+
+        self._streams: dict[str, TranscriptionStream] = {}
+        self._streams_lock = threading.Lock()
+
+        # pyttsx3 drives a platform event loop that must stay on one thread
+        self._tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts")
+        self._tts_engine = None
+        self._tts_flights = AsyncSingleFlight()
+        self._prefetches: set[asyncio.Task] = set()
+        self.tts_cache = AudioCache(
+            config.TTS_CACHE_DIR,
+            max_bytes=config.TTS_CACHE_MAX_BYTES,
+            max_files=config.TTS_CACHE_MAX_FILES,
+        )
+        self.rendered = 0
+
+    # ---------- SPEECH TO TEXT ----------
+    @property
+    def stt(self):
+        if self._stt is None:
+            with self._stt_lock:
+                if self._stt is None:
+                    self._stt = create_stt_backend(
+                        self.stt_backend_name,
+                        model_dir=config.VOSK_MODEL_DIR,
+                        sample_rate=config.STT_SAMPLE_RATE,
+                    )
+        return self._stt
+
     def speech_to_text(self, audio_file_path: str) -> str:
-        recognizer = sr.Recognizer()
+        return self.stt.transcribe_file(audio_file_path)
+
+    # ---------- STREAMING ----------
+    def open_stream(self, sample_rate: int | None = None, session_id: str | None = None) -> TranscriptionStream:
+        if not self.stt.streaming:
+            raise RuntimeError(f"STT backend '{self.stt.name}' does not support streaming")
+        self.sweep()
+        stream = TranscriptionStream(
+            self.stt.open_stream, sample_rate or config.STT_SAMPLE_RATE, session_id
+        )
+        with self._streams_lock:
+            if len(self._streams) >= config.VOICE_MAX_STREAMS:
+                raise OverflowError("too many open transcription streams")
+            self._streams[stream.stream_id] = stream
+        return stream
+
+    def get_stream(self, stream_id: str) -> TranscriptionStream | None:
+        with self._streams_lock:
+            return self._streams.get(stream_id)
+
+    def close_stream(self, stream_id: str) -> TranscriptionStream | None:
+        with self._streams_lock:
+            return self._streams.pop(stream_id, None)
+
+    def sweep(self) -> int:
+        """Drops streams idle for longer than VOICE_STREAM_IDLE_TTL (abandoned uploads)."""
+        cutoff = time.monotonic() - config.VOICE_STREAM_IDLE_TTL
+        with self._streams_lock:
+            stale = [sid for sid, s in self._streams.items() if s.last_used < cutoff]
+            for sid in stale:
+                del self._streams[sid]
+        return len(stale)
+
+    # ---------- TEXT TO SPEECH ----------
+    def speech_settings(self, voice: str | None = None, rate: int | None = None) -> dict:
+        """Everything besides the text that changes the rendered audio (part of the cache key)."""
+        return {
+            "engine": f"pyttsx3-{sys.platform}",
+            "voice": voice if voice is not None else config.TTS_VOICE,
+            "rate": rate if rate is not None else config.TTS_RATE,
+        }
+
+    def _render(self, text: str, settings: dict) -> bytes:
+        """Synthesizes ``text`` to WAV bytes. Runs on the TTS thread only."""
+        if self._tts_engine is None:
+            import pyttsx3
+
+            self._tts_engine = pyttsx3.init()
+            self._default_voice = self._tts_engine.getProperty("voice")
+            self._default_rate = self._tts_engine.getProperty("rate")
+
+        engine = self._tts_engine
+        engine.setProperty("voice", settings["voice"] or self._default_voice)
+        engine.setProperty("rate", settings["rate"] or self._default_rate)
 
-        with sr.AudioFile(audio_file_path) as source:
-            audio = recognizer.record(source)
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            with TTS_RENDER_SECONDS.time():
+                engine.save_to_file(text, path)
+                engine.runAndWait()
+            with open(path, "rb") as f:
+                data = f.read()
+        finally:
+            os.unlink(path)
+        if not data:
+            raise RuntimeError("TTS engine produced no audio")
+        self.rendered += 1
+        return data
+
+    def _render_cached(self, key: str, text: str, settings: dict) -> bytes:
+        # Runs on the TTS thread: finishes and fills the cache even if the requester left
+        data = self.tts_cache.get(key, count=False)
+        if data is None:
+            data = self._render(text, settings)
+            self.tts_cache.put(key, data)
+        return data
+
+    def _check_text(self, text: str) -> str:
+        text = " ".join(text.split())
+        if not text:
+            raise ValueError("nothing to say")
+        if len(text) > config.TTS_MAX_CHARS:
+            raise ValueError(f"text longer than {config.TTS_MAX_CHARS} characters")
+        return text
+
+    def speech_id(self, text: str, voice: str | None = None, rate: int | None = None) -> str:
+        """Content address of the audio ``text_to_speech`` would return (usable as an ETag)."""
+        return speech_key(self._check_text(text), self.speech_settings(voice, rate))
+
+    def text_to_speech(self, text: str, voice: str | None = None, rate: int | None = None) -> tuple[str, bytes]:
+        """
+        Renders ``text`` to audio bytes, synthesizing only on a cache miss.
+        Returns ``(speech_id, audio)``. Blocks until done; async code
+        should use ``atext_to_speech``.
+        """
+        text = self._check_text(text)
+        settings = self.speech_settings(voice, rate)
+        key = speech_key(text, settings)
+        data = self.tts_cache.get(key)
+        if data is None:
+            data = self._tts_executor.submit(self._render_cached, key, text, settings).result()
+        return key, data
+
+    async def atext_to_speech(
+        self, text: str, voice: str | None = None, rate: int | None = None
+    ) -> tuple[str, bytes]:
+        """Non-blocking ``text_to_speech``; concurrent requests for the same audio share one render."""
+        text = self._check_text(text)
+        settings = self.speech_settings(voice, rate)
+        key = speech_key(text, settings)
 
-        return recognizer.recognize_google(audio)
-    def __init__(self):
+        async def render() -> bytes:
+            data = await asyncio.to_thread(self.tts_cache.get, key)
+            if data is None:
+                loop = asyncio.get_running_loop()
+                data = await loop.run_in_executor(
+                    self._tts_executor, self._render_cached, key, text, settings
+                )
+            return data
+
+        data, _ = await self._tts_flights.do(key, render)
+        return key, data
+
+    def prefetch(self, text: str):
+        """Renders ``text`` in the background (TTS_PREFETCH) so the first play is a cache hit."""
+        if not config.TTS_PREFETCH or not self.tts_cache.enabled:
+            return
+        task = asyncio.create_task(self._prefetch(text))
+        self._prefetches.add(task)
+        task.add_done_callback(self._prefetches.discard)
+
+    async def _prefetch(self, text: str):
         try:
-            self.engine = pyttsx3.init()
-        except Exception:
-            self.engine = None
-
-    def text_to_speech(self, text: str):
-        if self.engine:
-            self.engine.say(text)
-            self.engine.runAndWait()
\ No newline at end of file
+            await self.atext_to_speech(text)
+        except Exception as e:
+            logger.warning("TTS prefetch failed: %s", e)
+
+    def close(self):
+        for task in self._prefetches:
+            task.cancel()
+        self._tts_executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._streams_lock:
+            open_streams = len(self._streams)
+        return {
+            "stt_backend": self.stt_backend_name,
+            "stt_loaded": self._stt is not None,
+            "open_streams": open_streams,
+            "max_streams": config.VOICE_MAX_STREAMS,
+            "tts_rendered": self.rendered,
+            "tts_prefetching": len(self._prefetches),
+            "tts_cache": self.tts_cache.stats(),
+        }
@@ -0,0 +1,93 @@
+import math
+
+
+class RunningStat:
+    """
+    O(1) streaming summary of one metric: count, mean and variance
+    (Welford), min/max and an exponentially weighted moving average.
+    """
+
+    __slots__ = ("count", "mean", "_m2", "min", "max", "ewma", "alpha")
+
+    def __init__(self, alpha: float = 0.3):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.ewma = 0.0
+        self.alpha = alpha
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.ewma = value if self.count == 1 else (
+            self.alpha * value + (1 - self.alpha) * self.ewma
+        )
+
+    @property
+    def variance(self) -> float:
+        # Sample variance; undefined (0) for a single observation
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 2),
+            "std": round(self.std, 2),
+            "variance": round(self.variance, 4),
+            "min": round(self.min, 2),
+            "max": round(self.max, 2),
+            "ewma": round(self.ewma, 2),
+            # Positive when recent answers beat the session average
+            "trend": round(self.ewma - self.mean, 2),
+        }
+
+
+# Session metrics tracked incrementally, keyed by evaluation field
+AGGREGATE_FIELDS = {
+    "relevance": "relevance_score",
+    "correctness": "correctness_score",
+    "confidence": "confidence_score",
+    "star": "star_score",
+    "readiness": "readiness_score",
+}
+
+
+class SessionAggregates:
+    __slots__ = ("stats",)
+
+    def __init__(self):
+        self.stats = {name: RunningStat() for name in AGGREGATE_FIELDS}
+
+    @classmethod
+    def from_evaluations(cls, evaluations: list[dict]) -> "SessionAggregates":
+        aggregates = cls()
+        for evaluation in evaluations:
+            aggregates.add(evaluation)
+        return aggregates
+
+    def add(self, evaluation: dict):
+        for name, field in AGGREGATE_FIELDS.items():
+            self.stats[name].add(float(evaluation.get(field, 0)))
+
+    @property
+    def count(self) -> int:
+        return self.stats["readiness"].count
+
+    def mean(self, name: str) -> float:
+        return self.stats[name].mean
+
+    def to_dict(self) -> dict:
+        return {name: stat.to_dict() for name, stat in self.stats.items()}
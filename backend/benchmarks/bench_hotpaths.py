@@ -0,0 +1,240 @@
+"""
+Micro-benchmarks for the scoring and reporting hot paths.
+
+Times, in-process and without Ollama (LLM calls go to benchmarks/fake_llm.py):
+- SemanticEvaluator.similarity   short and 2,000-word answers, cold and cached
+- AnswerEvaluator.evaluate       short and 2,000-word answers
+- AnalyticsEngine.generate_metrics  5, 50 and 500-turn sessions
+- PDFReportGenerator.generate    5 and 50-turn sessions, short and long answers
+
+Run from the backend directory:
+    python benchmarks/bench_hotpaths.py --save-baseline
+    python benchmarks/bench_hotpaths.py            # compares with the baseline
+
+The baseline is machine-specific: record it on the machine the numbers
+are compared on. A case regresses when its median is more than
+--threshold slower than the baseline median (and by more than the
+--min-delta-ms noise floor); the script then exits with code 1.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_llm import FakeLLM, install  # noqa: E402
+
+from app.services.analytics_engine import AnalyticsEngine  # noqa: E402
+from app.services.answer_evaluation import AnswerEvaluator  # noqa: E402
+from app.services.improvement_plan import ImprovementPlanEngine  # noqa: E402
+from app.services.report_generator import PDFReportGenerator  # noqa: E402
+from app.services.session_model import Session  # noqa: E402
+
+DEFAULT_BASELINE = BACKEND_DIR / "benchmarks" / "baseline.json"
+
+QUESTION = "Tell me about a time you improved the performance of a system you owned."
+WORDS = (
+    "I implemented a cache layer for the service because read latency was too high "
+    "and the team needed to meet a strict deadline so I analyzed traces designed a "
+    "new index reduced p99 latency by forty percent and led the rollout across regions "
+    "while monitoring errors memory throughput and cost together with the on-call engineers"
+).split()
+
+
+# ---------- INPUTS ----------
+def make_answer(words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def make_evaluation(rng: random.Random) -> dict:
+    star = {k: round(rng.uniform(0, 2.5), 2) for k in ("situation", "task", "action", "result")}
+    correctness = round(rng.uniform(0, 10), 2)
+    confidence = round(rng.uniform(0, 10), 2)
+    star_score = round(sum(star.values()), 2)
+    return {
+        "relevance_score": round(rng.uniform(0, 10), 2),
+        "correctness_score": correctness,
+        "confidence_score": confidence,
+        "star_score": star_score,
+        "star_breakdown": star,
+        "readiness_score": round(correctness * 0.5 + confidence * 0.2 + star_score * 0.3, 2),
+        "feedback": ["Answer is too brief. Add more explanation."] if rng.random() < 0.5
+        else ["Strong answer with good structure and clarity."],
+    }
+
+
+def make_session(turns: int, answer_words: int = 60) -> Session:
+    rng = random.Random(turns)
+    session = Session(f"bench-{turns}-{answer_words}", "Software Engineer", "Software / IT",
+                      "Medium", "DSA", start_time=time.time() - 1800, end_time=time.time())
+    for i in range(turns):
+        session.add_question(f"{QUESTION} ({i + 1})")
+        session.add_turn(make_answer(answer_words, seed=i), make_evaluation(rng))
+    return session
+
+
+# ---------- TIMING ----------
+def measure(fn, repeat: int, warmup: int = 1) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4),
+        "runs": repeat,
+    }
+
+
+def cases(evaluator: AnswerEvaluator, quick: bool):
+    """Yields (name, callable, repeat)."""
+    scale = 0.2 if quick else 1.0
+
+    def n(count: int) -> int:
+        return max(3, int(count * scale))
+
+    short_answer = make_answer(60)
+    long_answer = make_answer(2000)
+    semantic = evaluator.semantic
+
+    counter = iter(range(10**9))
+
+    def cold(answer):
+        # Unique suffix per call so the embedding cache never hits
+        return lambda: semantic.similarity(QUESTION, f"{answer} #{next(counter)}")
+
+    yield "similarity.short.cold", cold(short_answer), n(50)
+    yield "similarity.2000w.cold", cold(long_answer), n(20)
+    yield "similarity.2000w.cached", lambda: semantic.similarity(QUESTION, long_answer), n(200)
+
+    yield "evaluate.short", lambda: evaluator.evaluate(QUESTION, f"{short_answer} #{next(counter)}"), n(50)
+    yield "evaluate.2000w", lambda: evaluator.evaluate(QUESTION, f"{long_answer} #{next(counter)}"), n(20)
+
+    analytics = AnalyticsEngine()
+    for turns in (5, 50, 500):
+        session = make_session(turns)
+        yield f"generate_metrics.{turns}turns", lambda s=session: analytics.generate_metrics(s), n(500)
+
+    improvement_engine = ImprovementPlanEngine()
+    reports = PDFReportGenerator()
+    for turns, words in ((5, 60), (50, 60), (50, 2000)):
+        session = make_session(turns, words)
+        metrics = analytics.generate_metrics(session)
+        plan = improvement_engine.diagnose_plan(session["aggregates"])
+        label = "short" if words < 1000 else "2000w"
+        yield (
+            f"pdf.{turns}turns.{label}",
+            lambda s=session, m=metrics, p=plan: reports.generate(s, m, p),
+            n(10 if words < 1000 else 3),
+        )
+
+
+def run(quick: bool, latency_ms: float) -> dict:
+    evaluator = AnswerEvaluator()
+    install(evaluator, FakeLLM(latency_ms))
+    evaluator.semantic.load()
+
+    results = {}
+    for name, fn, repeat in cases(evaluator, quick):
+        results[name] = measure(fn, repeat)
+        print(f"  {name:<32} {results[name]['median_ms']:>10.3f} ms", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "evaluation_mode": evaluator.mode,
+            "llm_latency_ms": latency_ms,
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+# ---------- COMPARISON ----------
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> tuple[str, int]:
+    lines = [
+        f"{'case':<32} {'baseline':>10} {'current':>10} {'change':>8}  status",
+        "-" * 72,
+    ]
+    regressions = 0
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            lines.append(f"{name:<32} {'-':>10} {now['median_ms']:>10.3f} {'':>8}  new")
+            continue
+        old, new = before["median_ms"], now["median_ms"]
+        change = (new - old) / old if old else 0.0
+        if change > threshold and new - old > min_delta_ms:
+            status = "REGRESSION"
+            regressions += 1
+        elif change < -threshold and old - new > min_delta_ms:
+            status = "faster"
+        else:
+            status = "ok"
+        lines.append(f"{name:<32} {old:>10.3f} {new:>10.3f} {change:>+8.1%}  {status}")
+
+    for name in baseline["results"]:
+        if name not in current["results"]:
+            lines.append(f"{name:<32} {'':>10} {'-':>10} {'':>8}  missing")
+    return "\n".join(lines), regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown (0.15 = 15%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ignore changes below this")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fake LLM delay per call")
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions")
+    parser.add_argument("--output", help="also write the results JSON here")
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline).resolve()
+    output_path = Path(args.output).resolve() if args.output else None
+
+    # The PDF generator writes into ./reports; keep that out of the tree
+    os.chdir(tempfile.mkdtemp(prefix="bench-"))
+    current = run(args.quick, args.latency_ms)
+
+    if output_path:
+        output_path.write_text(json.dumps(current, indent=2))
+
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(current, indent=2))
+        print(f"Baseline saved to {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        print(json.dumps(current["results"], indent=2))
+        print(f"No baseline at {baseline_path}; run with --save-baseline first.")
+        return
+
+    report, regressions = compare(
+        current, json.loads(baseline_path.read_text()), args.threshold, args.min_delta_ms
+    )
+    print(report)
+    if regressions:
+        print(f"\n{regressions} case(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Speech-to-text throughput benchmark: real-time factor on sample WAV files.
+
+For every 16-bit mono WAV file given (or found in a given directory):
+- file    one transcribe_file() call over the whole recording
+- stream  the recording fed in --chunk-ms pieces, as the upload endpoints
+          do, plus the time finish() takes once the last chunk is in
+
+RTF = processing seconds / audio seconds; below 1.0 keeps up with live
+speech. For streaming, "chunk max" is the slowest single chunk: if it
+stays under --chunk-ms the transcript never falls behind the speaker,
+and "finalize" is what the candidate waits for after they stop talking.
+
+Run from the backend directory (needs vosk and a model, see VOSK_MODEL_DIR):
+    python benchmarks/bench_stt.py samples/ --model-dir models/vosk-model-small-en-us-0.15
+    python benchmarks/bench_stt.py a.wav b.wav --parallel 4   # concurrent streams
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app import config  # noqa: E402
+from app.services.stt_backends import create_stt_backend  # noqa: E402
+
+
+def find_wavs(paths: list[str]) -> list[Path]:
+    files = []
+    for p in map(Path, paths):
+        files.extend(sorted(p.rglob("*.wav")) if p.is_dir() else [p])
+    return files
+
+
+def read_wav(path: Path) -> tuple[bytes, int]:
+    with wave.open(str(path), "rb") as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit mono WAV")
+        return wav.readframes(wav.getnframes()), wav.getframerate()
+
+
+def bench_file(backend, path: Path) -> dict:
+    pcm, rate = read_wav(path)
+    audio = len(pcm) / (2 * rate)
+    start = time.perf_counter()
+    text = backend.transcribe_file(str(path))
+    elapsed = time.perf_counter() - start
+    return {"file": path.name, "mode": "file", "audio_s": audio, "wall_s": elapsed,
+            "rtf": elapsed / audio if audio else 0.0, "words": len(text.split())}
+
+
+def bench_stream(backend, path: Path, chunk_ms: int) -> dict:
+    pcm, rate = read_wav(path)
+    audio = len(pcm) / (2 * rate)
+    step = int(rate * chunk_ms / 1000) * 2
+    stream = backend.open_stream(rate)
+
+    chunk_times = []
+    start = time.perf_counter()
+    for i in range(0, len(pcm), step):
+        t = time.perf_counter()
+        stream.feed(pcm[i:i + step])
+        chunk_times.append(time.perf_counter() - t)
+    t = time.perf_counter()
+    text = stream.finish()
+    finalize = time.perf_counter() - t
+    elapsed = time.perf_counter() - start
+    return {"file": path.name, "mode": "stream", "audio_s": audio, "wall_s": elapsed,
+            "rtf": elapsed / audio if audio else 0.0, "words": len(text.split()),
+            "chunk_max_ms": max(chunk_times, default=0.0) * 1000, "finalize_ms": finalize * 1000}
+
+
+def print_table(results: list[dict]):
+    print(f"{'file':<28} {'mode':<7} {'audio s':>8} {'wall s':>8} {'RTF':>7} {'chunk max':>10} {'finalize':>9} {'words':>6}")
+    for r in results:
+        chunk = f"{r['chunk_max_ms']:.0f}ms" if "chunk_max_ms" in r else "-"
+        final = f"{r['finalize_ms']:.0f}ms" if "finalize_ms" in r else "-"
+        print(f"{r['file'][:28]:<28} {r['mode']:<7} {r['audio_s']:>8.2f} {r['wall_s']:>8.2f} "
+              f"{r['rtf']:>7.3f} {chunk:>10} {final:>9} {r['words']:>6}")
+
+
+def summarize(results: list[dict], wall: float, parallel: int) -> dict:
+    summary = {}
+    for mode in ("file", "stream"):
+        rows = [r for r in results if r["mode"] == mode]
+        if not rows:
+            continue
+        audio = sum(r["audio_s"] for r in rows)
+        busy = sum(r["wall_s"] for r in rows)
+        summary[mode] = {"files": len(rows), "audio_s": round(audio, 2), "rtf": round(busy / audio, 4)}
+        if mode == "stream":
+            finals = sorted(r["finalize_ms"] for r in rows)
+            summary[mode]["finalize_p50_ms"] = round(statistics.median(finals), 1)
+            summary[mode]["finalize_max_ms"] = round(finals[-1], 1)
+    if parallel > 1:
+        audio = sum(r["audio_s"] for r in results)
+        summary["aggregate"] = {"parallel": parallel, "audio_s_per_wall_s": round(audio / wall, 2)}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="+", help="WAV files or directories")
+    parser.add_argument("--backend", default=config.STT_BACKEND)
+    parser.add_argument("--model-dir", default=config.VOSK_MODEL_DIR)
+    parser.add_argument("--mode", choices=("file", "stream", "both"), default="both")
+    parser.add_argument("--chunk-ms", type=int, default=250, help="streaming chunk size")
+    parser.add_argument("--parallel", type=int, default=1, help="files transcribed concurrently")
+    parser.add_argument("--json", help="write all results to this file")
+    args = parser.parse_args()
+
+    files = find_wavs(args.paths)
+    if not files:
+        parser.error("no WAV files found")
+
+    start = time.perf_counter()
+    backend = create_stt_backend(args.backend, model_dir=args.model_dir)
+    print(f"Loaded {args.backend} backend in {time.perf_counter() - start:.2f}s")
+
+    jobs = []
+    if args.mode in ("file", "both"):
+        jobs += [lambda p=p: bench_file(backend, p) for p in files]
+    if args.mode in ("stream", "both"):
+        if not backend.streaming:
+            parser.error(f"{args.backend} backend does not stream")
+        jobs += [lambda p=p: bench_stream(backend, p, args.chunk_ms) for p in files]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+        results = list(pool.map(lambda job: job(), jobs))
+    wall = time.perf_counter() - start
+
+    print_table(results)
+    summary = summarize(results, wall, args.parallel)
+    print(f"\n{json.dumps(summary, indent=2)}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"results": results, "summary": summary}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Offline stand-in for ``LocalLLM`` used by the benchmarks.
+
+Returns canned responses shaped like the real prompts expect (combined
+evaluation JSON, STAR JSON, or a plain question) after a configurable
+delay, so scoring paths can be timed without Ollama.
+"""
+import asyncio
+import json
+import time
+
+JUDGEMENT = {
+    "star": {"situation": 1.5, "task": 1.5, "action": 2.0, "result": 1.0},
+    "correctness": {"verdict": "partial", "score": 6.5},
+}
+# /answer/stream asks for the judgement without the follow-up
+JUDGEMENT_RESPONSE = json.dumps(JUDGEMENT)
+COMBINED_RESPONSE = json.dumps({
+    **JUDGEMENT,
+    "follow_up_question": "How would you change that design at ten times the load?",
+})
+STAR_RESPONSE = json.dumps({"situation": 1.5, "task": 1.5, "action": 2.0, "result": 1.0})
+TEXT_RESPONSE = "How would you change that design at ten times the load?"
+
+
+class FakeLLM:
+    def __init__(self, latency_ms: float = 0.0, model: str = "fake"):
+        self.latency = latency_ms / 1000
+        self.model = model
+        self.calls = 0
+
+    @staticmethod
+    def _respond(prompt: str) -> str:
+        # Combined prompts mention STAR too, so they are matched first
+        if '"correctness"' in prompt:
+            return COMBINED_RESPONSE if "follow_up_question" in prompt else JUDGEMENT_RESPONSE
+        if "STAR" in prompt:
+            return STAR_RESPONSE
+        return TEXT_RESPONSE
+
+    def generate(self, prompt: str, options=None, cache=True, format=None, validate=None, caller=None, priority=None) -> str:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def agenerate(self, prompt: str, options=None, cache=True, format=None, validate=None, caller=None, priority=None) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def aconverse(self, session_id, prompt: str, options=None, caller=None, priority=None) -> str:
+        return await self.agenerate(prompt)
+
+    async def astream(self, prompt: str, caller=None, priority=None, session_id=None):
+        text = self._respond(prompt)
+        words = text.split(" ")
+        for word in words:
+            if self.latency:
+                await asyncio.sleep(self.latency / len(words))
+            yield word + " "
+
+    async def awarmup(self):
+        return None
+
+
+def install(evaluator, llm: FakeLLM):
+    """Points an ``AnswerEvaluator`` at the fake for every LLM call it makes."""
+    evaluator.star.llm = llm
+    if evaluator.combined is not None:
+        evaluator.combined.llm = llm
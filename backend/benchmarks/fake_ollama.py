@@ -0,0 +1,229 @@
+"""
+Stand-in for Ollama's HTTP API, for load tests.
+
+Serves ``/api/generate`` (plain and NDJSON streaming) and ``/api/tags``
+with sampled latency and optional fault injection:
+- ``--latency``: ``fixed:S``, ``uniform:LO:HI``, ``normal:MEAN:STD`` or
+  ``lognormal:MEDIAN:SIGMA`` (seconds per generation)
+- ``--error-rate``: fraction of generations that fail (HTTP 500, or an
+  ``error`` chunk part-way through a stream)
+- ``--stall-rate`` / ``--stall-seconds``: fraction that hang first
+
+Responses follow the prompt: combined-evaluation JSON, STAR JSON, or a
+question. Runs standalone too:
+    python benchmarks/fake_ollama.py --port 11434 --latency lognormal:0.8:0.4
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_llm import FakeLLM  # noqa: E402
+
+
+def parse_latency(spec: str):
+    """Returns ``sample(rng) -> seconds`` for a latency spec string."""
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def _final(request: dict, prompt: str, text: str) -> dict:
+    """Closing fields of a reply; one fake token per word, so sent contexts grow like Ollama's."""
+    new = len(prompt.split())
+    context = list(request.get("context") or []) + list(range(new + len(text.split())))
+    return {"done": True, "context": context, "prompt_eval_count": new, "eval_count": len(text.split())}
+
+
+class FakeOllama:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 11500,
+        latency: str = "fixed:0.5",
+        error_rate: float = 0.0,
+        stall_rate: float = 0.0,
+        stall_seconds: float = 30.0,
+        seed: int | None = None,
+    ):
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.streams = 0
+        self.errors = 0
+        self.stalls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # ---------- LIFECYCLE ----------
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ---------- FAULTS ----------
+    def _plan(self, stream: bool) -> tuple[float, bool, bool]:
+        """(latency, fail, stall) for one request, drawn under the lock."""
+        with self._lock:
+            self.requests += 1
+            self.streams += stream
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            latency = self.sample_latency(self._rng)
+            fail = self._rng.random() < self.error_rate
+            stall = self._rng.random() < self.stall_rate
+            self.errors += fail
+            self.stalls += stall
+        return latency, fail, stall
+
+    def _done(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "streams": self.streams,
+            "errors_injected": self.errors,
+            "stalls_injected": self.stalls,
+            "max_in_flight": self.max_in_flight,
+        }
+
+    # ---------- HTTP ----------
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _chunk(self, body: dict):
+                data = (json.dumps(body) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json(200, {"models": [{"name": "fake"}]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path != "/api/generate":
+                    self._send_json(404, {"error": "not found"})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                prompt = request.get("prompt") or ""
+                if not prompt:
+                    # Warm-up / model load request
+                    self._send_json(200, {"response": "", "done": True})
+                    return
+
+                stream = bool(request.get("stream"))
+                latency, fail, stall = fake._plan(stream)
+                try:
+                    if stall:
+                        time.sleep(fake.stall_seconds)
+                    text = FakeLLM._respond(prompt)
+                    final = _final(request, prompt, text)
+                    if stream:
+                        self._stream(text, latency, fail, final)
+                    else:
+                        time.sleep(latency)
+                        if fail:
+                            self._send_json(500, {"error": "injected failure"})
+                        else:
+                            self._send_json(200, {"response": text, **final})
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    fake._done()
+
+            def _stream(self, text: str, latency: float, fail: bool, final: dict):
+                words = text.split(" ")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i, word in enumerate(words):
+                    time.sleep(latency / len(words))
+                    if fail and i == len(words) // 2:
+                        self._chunk({"error": "injected failure"})
+                        break
+                    self._chunk({"response": word + " ", "done": False})
+                else:
+                    self._chunk({"response": "", **final})
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", default="fixed:0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--stall-seconds", type=float, default=30.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    server = FakeOllama(
+        args.host, args.port, args.latency, args.error_rate,
+        args.stall_rate, args.stall_seconds, args.seed,
+    )
+    print(f"Fake Ollama on {server.url} (latency {args.latency})")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(server.stats()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+End-to-end load test against a simulated Ollama.
+
+Starts benchmarks/fake_ollama.py and (unless --base-url is given) the
+backend under uvicorn pointed at it, then drives complete interviews:
+    /interview/start -> N x /interview/answer -> /interview/end -> report download
+with a fixed number of concurrent users. Each --concurrency level runs
+--flows interviews and prints throughput and p50/p95/p99 per endpoint,
+then a sweep summary to spot the saturation point.
+
+Run from the backend directory:
+    python benchmarks/load_test.py --concurrency 1,8,32 --flows 64 \\
+        --latency lognormal:0.8:0.4 --env REPORT_WORKERS=4
+Server configuration is passed with repeated --env KEY=VALUE.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_ollama import FakeOllama  # noqa: E402
+
+PROFILES = [
+    ("Software Engineer", "Software / IT", "Medium", "DSA"),
+    ("Software Engineer", "Software / IT", "Hard", "System Design"),
+    ("Data Analyst", "Data", "Easy", "Behavioral"),
+    ("Product Manager", "Product", "Medium", "Behavioral"),
+]
+WORDS = (
+    "I implemented a cache for the service because latency was high and the team needed "
+    "to ship so I analyzed traces designed an index reduced p99 by forty percent and led "
+    "the rollout while monitoring errors and cost"
+).split()
+
+
+# ---------- RECORDING ----------
+def percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def add(self, endpoint: str, seconds: float, status: int | None, ok: bool):
+        self.latencies[endpoint].append(seconds)
+        self.statuses[endpoint][status or 0] += 1
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def summary(self, wall: float) -> dict:
+        rows = {}
+        for endpoint, values in self.latencies.items():
+            values = sorted(values)
+            rows[endpoint] = {
+                "count": len(values),
+                "errors": self.errors[endpoint],
+                "rps": round(len(values) / wall, 2) if wall else 0.0,
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1),
+                "statuses": dict(self.statuses[endpoint]),
+            }
+        return rows
+
+
+async def timed(recorder: Recorder, endpoint: str, request) -> httpx.Response | None:
+    t0 = time.perf_counter()
+    try:
+        response = await request
+    except httpx.HTTPError:
+        recorder.add(endpoint, time.perf_counter() - t0, None, False)
+        return None
+    recorder.add(endpoint, time.perf_counter() - t0, response.status_code, response.is_success)
+    return response
+
+
+# ---------- FLOW ----------
+async def stream_answer(client: httpx.AsyncClient, recorder: Recorder, payload: dict) -> bool:
+    t0 = time.perf_counter()
+    ok, status = False, None
+    try:
+        async with client.stream("POST", "/interview/answer/stream", json=payload) as response:
+            status = response.status_code
+            async for line in response.aiter_lines():
+                if line.startswith("event: done"):
+                    ok = True
+                elif line.startswith("event: error"):
+                    break
+    except httpx.HTTPError:
+        pass
+    recorder.add("answer/stream", time.perf_counter() - t0, status, ok)
+    return ok
+
+
+async def interview(client: httpx.AsyncClient, recorder: Recorder, args, rng: random.Random) -> bool:
+    role, domain, difficulty, mode = rng.choice(PROFILES)
+    response = await timed(recorder, "start", client.post("/interview/start", json={
+        "role": role, "domain": domain, "difficulty": difficulty, "mode": mode,
+    }))
+    if response is None or not response.is_success:
+        return False
+    session_id = response.json()["session_id"]
+
+    for _ in range(args.answers):
+        answer = " ".join(rng.choice(WORDS) for _ in range(args.answer_words))
+        payload = {"session_id": session_id, "answer": answer}
+        if args.stream:
+            if not await stream_answer(client, recorder, payload):
+                return False
+        else:
+            response = await timed(recorder, "answer", client.post("/interview/answer", json=payload))
+            if response is None or not response.is_success:
+                return False
+
+    ended = time.perf_counter()
+    response = await timed(recorder, "end", client.post("/interview/end", json={"session_id": session_id}))
+    if response is None or not response.is_success:
+        return False
+
+    # Poll until the background job has rendered the PDF
+    deadline = ended + args.report_timeout
+    while time.perf_counter() < deadline:
+        response = await timed(recorder, "report (poll)", client.get(f"/interview/report/{session_id}"))
+        if response is None or response.status_code != 202:
+            break
+        await asyncio.sleep(args.poll_interval)
+    ok = response is not None and response.status_code == 200
+    recorder.add("report (end->pdf)", time.perf_counter() - ended, response.status_code if response else None, ok)
+    return ok
+
+
+async def run_level(base_url: str, concurrency: int, args) -> dict:
+    recorder = Recorder()
+    remaining = iter(range(args.flows))
+    completed = failed = 0
+
+    async def user(worker: int):
+        nonlocal completed, failed
+        rng = random.Random(args.seed * 1000 + worker)
+        for _ in remaining:
+            t0 = time.perf_counter()
+            ok = await interview(client, recorder, args, rng)
+            recorder.add("flow", time.perf_counter() - t0, 200 if ok else None, ok)
+            if ok:
+                completed += 1
+            else:
+                failed += 1
+
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(user(i) for i in range(concurrency)))
+        wall = time.perf_counter() - t0
+
+    return {
+        "concurrency": concurrency,
+        "flows": args.flows,
+        "completed": completed,
+        "failed": failed,
+        "wall_s": round(wall, 2),
+        "flows_per_s": round(completed / wall, 3) if wall else 0.0,
+        "endpoints": recorder.summary(wall),
+    }
+
+
+# ---------- REPORTING ----------
+def print_level(result: dict):
+    print(
+        f"\n=== concurrency {result['concurrency']}: {result['completed']}/{result['flows']} flows "
+        f"in {result['wall_s']}s ({result['flows_per_s']} flows/s, {result['failed']} failed) ==="
+    )
+    print(f"{'endpoint':<20} {'count':>6} {'err':>5} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for endpoint, row in result["endpoints"].items():
+        print(
+            f"{endpoint:<20} {row['count']:>6} {row['errors']:>5} {row['rps']:>8.2f} "
+            f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+        )
+
+
+def print_sweep(results: list[dict], answer_endpoint: str):
+    print(f"\n{'concurrency':>11} {'flows/s':>9} {'failed':>7} {answer_endpoint + ' p95':>18} {'flow p95':>10}")
+    for r in results:
+        answer = r["endpoints"].get(answer_endpoint, {})
+        flow = r["endpoints"].get("flow", {})
+        print(
+            f"{r['concurrency']:>11} {r['flows_per_s']:>9.3f} {r['failed']:>7} "
+            f"{answer.get('p95_ms', 0):>18.1f} {flow.get('p95_ms', 0):>10.1f}"
+        )
+
+
+# ---------- SERVER ----------
+def start_backend(args, ollama_url: str) -> tuple[subprocess.Popen, str]:
+    env = dict(os.environ)
+    env.update({
+        "OLLAMA_URL": ollama_url,
+        # Each run starts from an empty state in its own directory
+        "LLM_CACHE_PATH": "",
+        "COHORT_STORE_PATH": "",
+    })
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    cmd = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--app-dir", str(BACKEND_DIR),
+        "--host", "127.0.0.1", "--port", str(args.port),
+        "--workers", str(args.workers),
+        "--log-level", "warning",
+    ]
+    process = subprocess.Popen(cmd, cwd=workdir, env=env)
+    return process, f"http://127.0.0.1:{args.port}"
+
+
+def wait_ready(base_url: str, timeout: float):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health/ready", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"Backend at {base_url} not ready after {timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", help="use a running backend instead of starting one")
+    parser.add_argument("--port", type=int, default=8100, help="port for the spawned backend")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the spawned backend")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="backend setting, repeatable")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated levels to sweep")
+    parser.add_argument("--flows", type=int, default=32, help="interviews per level")
+    parser.add_argument("--answers", type=int, default=3, help="answers per interview")
+    parser.add_argument("--answer-words", type=int, default=80)
+    parser.add_argument("--stream", action="store_true", help="use /interview/answer/stream")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout")
+    parser.add_argument("--report-timeout", type=float, default=120.0)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ollama-port", type=int, default=11500)
+    parser.add_argument("--latency", default="lognormal:0.5:0.4", help="fake Ollama latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--stall-seconds", type=float, default=30.0)
+    parser.add_argument("--ready-timeout", type=float, default=180.0)
+    parser.add_argument("--json", help="write all results to this file")
+    args = parser.parse_args()
+
+    ollama = FakeOllama(
+        port=args.ollama_port, latency=args.latency, error_rate=args.error_rate,
+        stall_rate=args.stall_rate, stall_seconds=args.stall_seconds, seed=args.seed,
+    )
+    ollama.start()
+
+    process = None
+    base_url = args.base_url
+    try:
+        if base_url is None:
+            process, base_url = start_backend(args, ollama.url)
+        wait_ready(base_url, args.ready_timeout)
+
+        results = []
+        for level in (int(c) for c in args.concurrency.split(",")):
+            result = asyncio.run(run_level(base_url, level, args))
+            result["ollama"] = ollama.stats()
+            results.append(result)
+            print_level(result)
+
+        print_sweep(results, "answer/stream" if args.stream else "answer")
+        print(f"\nFake Ollama: {json.dumps(ollama.stats())}")
+        if args.json:
+            Path(args.json).write_text(json.dumps({"args": vars(args), "levels": results}, indent=2))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        ollama.stop()
+
+
+if __name__ == "__main__":
+    main()
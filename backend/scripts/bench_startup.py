@@ -0,0 +1,102 @@
+"""
+Startup-time benchmark for the backend.
+
+Measures, in a fresh interpreter each run:
+- import time of ``app.main`` (and whether torch got pulled in eagerly)
+- time until /health/live answers
+- time until /health/ready answers (embedding model loaded)
+- latency of the first /interview/start (only with --with-llm)
+
+Run from the backend directory:
+    python scripts/bench_startup.py --runs 3 --output startup_bench.jsonl
+Each run's numbers are appended as one JSON line so trends can be tracked.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app.main
+import_s = time.perf_counter() - t0
+heavy = any(m in sys.modules for m in ("torch", "sentence_transformers"))
+
+from fastapi.testclient import TestClient
+
+result = {"import_s": import_s, "heavy_imports_at_import": heavy}
+t0 = time.perf_counter()
+with TestClient(app.main.app) as client:
+    client.get("/health/live").raise_for_status()
+    result["live_s"] = time.perf_counter() - t0
+
+    while client.get("/health/ready").status_code != 200:
+        if time.perf_counter() - t0 > READY_TIMEOUT:
+            break
+        time.sleep(0.05)
+    else:
+        result["ready_s"] = time.perf_counter() - t0
+
+    if WITH_LLM:
+        t1 = time.perf_counter()
+        r = client.post("/interview/start", json={
+            "role": "Software Engineer", "domain": "Software / IT",
+            "difficulty": "Medium", "mode": "DSA",
+        })
+        result["first_start_s"] = time.perf_counter() - t1
+        result["first_start_status"] = r.status_code
+
+print(json.dumps(result))
+"""
+
+
+def run_once(with_llm: bool, ready_timeout: float) -> dict:
+    code = CHILD.replace("READY_TIMEOUT", repr(ready_timeout)).replace("WITH_LLM", repr(with_llm))
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--with-llm", action="store_true", help="also time the first /interview/start")
+    parser.add_argument("--ready-timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="append results to this JSONL file")
+    args = parser.parse_args()
+
+    runs = [run_once(args.with_llm, args.ready_timeout) for _ in range(args.runs)]
+
+    keys = [k for k in ("import_s", "live_s", "ready_s", "first_start_s") if k in runs[0]]
+    summary = {
+        "timestamp": time.time(),
+        "runs": args.runs,
+        "heavy_imports_at_import": any(r["heavy_imports_at_import"] for r in runs),
+    }
+    for key in keys:
+        values = [r[key] for r in runs if key in r]
+        summary[key] = {
+            "median": round(statistics.median(values), 4),
+            "min": round(min(values), 4),
+            "max": round(max(values), 4),
+        }
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Parity check between the torch and ONNX embedding backends.
+
+Scores a fixed set of interview question/answer pairs with both
+backends and fails (exit code 1) if any relevance score differs by more
+than --tolerance on the 0-10 scale.
+
+Run from the backend directory after scripts/export_onnx.py:
+    python scripts/check_embedding_parity.py --onnx-dir onnx/all-MiniLM-L6-v2
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.embedding_backends import OnnxBackend, SentenceTransformerBackend  # noqa: E402
+
+PAIRS = [
+    ("Explain how a hash map works.",
+     "A hash map stores key-value pairs in buckets chosen by hashing the key; "
+     "collisions are handled with chaining or open addressing."),
+    ("Explain how a hash map works.",
+     "I enjoy hiking on weekends with my friends."),
+    ("Tell me about a challenge you faced and how you handled it.",
+     "Our release was blocked by a flaky test suite, so I led an effort to "
+     "quarantine the flaky tests and we shipped on time."),
+    ("What is the difference between REST and SOAP?",
+     "REST uses plain HTTP verbs and usually JSON, while SOAP is a protocol "
+     "with XML envelopes and strict contracts."),
+    ("Describe a time you worked in a team.",
+     "I designed the API while two teammates built the frontend; we met daily."),
+    ("Explain time complexity with an example.",
+     "Binary search is O(log n) because it halves the search space each step."),
+    ("Why do you want this role?",
+     "I used your product at my last job and I want to help build it."),
+    ("What are your strengths and weaknesses?",
+     "um I don't know"),
+]
+
+
+def scores(backend, pairs):
+    q = backend.encode([p[0] for p in pairs])
+    a = backend.encode([p[1] for p in pairs])
+    return np.einsum("ij,ij->i", q, a) * 10
+
+
+def timed(backend, pairs, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        scores(backend, pairs)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torch vs ONNX embedding parity")
+    parser.add_argument("--onnx-dir", default="onnx/all-MiniLM-L6-v2")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--no-quantized", action="store_true")
+    args = parser.parse_args()
+
+    torch_backend = SentenceTransformerBackend()
+    onnx_backend = OnnxBackend(args.onnx_dir, quantized=not args.no_quantized, threads=args.threads)
+
+    reference = scores(torch_backend, PAIRS)
+    candidate = scores(onnx_backend, PAIRS)
+    diff = np.abs(reference - candidate)
+
+    for (q, _), r, c, d in zip(PAIRS, reference, candidate, diff):
+        flag = "FAIL" if d > args.tolerance else "ok"
+        print(f"{flag:4}  torch={r:6.3f}  onnx={c:6.3f}  diff={d:.3f}  {q[:50]}")
+
+    print(f"max diff {diff.max():.4f} (tolerance {args.tolerance})")
+    print(f"torch {timed(torch_backend, PAIRS) * 1000:.1f} ms/batch, "
+          f"onnx {timed(onnx_backend, PAIRS) * 1000:.1f} ms/batch")
+
+    sys.exit(1 if diff.max() > args.tolerance else 0)
+
+
+if __name__ == "__main__":
+    main()
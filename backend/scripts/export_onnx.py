@@ -0,0 +1,89 @@
+"""
+One-time export of all-MiniLM-L6-v2 to ONNX with int8 dynamic quantization.
+
+Run from the backend directory:
+    python scripts/export_onnx.py --output onnx/all-MiniLM-L6-v2
+
+Writes model.onnx, model_quantized.onnx and tokenizer.json into the
+output directory. Point ONNX_MODEL_DIR at it and set
+EMBEDDING_BACKEND=onnx to use it; check accuracy first with
+scripts/check_embedding_parity.py.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.embedding_backends import (  # noqa: E402
+    MAX_SEQ_LENGTH,
+    MODEL_NAME,
+    ONNX_MODEL_FILE,
+    ONNX_QUANTIZED_FILE,
+)
+
+
+def export(output: Path, opset: int):
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    output.mkdir(parents=True, exist_ok=True)
+
+    st_model = SentenceTransformer(MODEL_NAME, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    # Only tokenizer.json is needed at runtime (tokenizers library)
+    tokenizer.save_pretrained(str(output))
+
+    sample = tokenizer(
+        ["export sample"], return_tensors="pt", padding=True,
+        truncation=True, max_length=MAX_SEQ_LENGTH,
+    )
+    inputs = (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"])
+    dynamic = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            inputs,
+            str(output / ONNX_MODEL_FILE),
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": dynamic,
+                "attention_mask": dynamic,
+                "token_type_ids": dynamic,
+                "last_hidden_state": dynamic,
+            },
+            opset_version=opset,
+        )
+    print(f"exported {output / ONNX_MODEL_FILE}")
+
+
+def quantize(output: Path):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(
+        str(output / ONNX_MODEL_FILE),
+        str(output / ONNX_QUANTIZED_FILE),
+        weight_type=QuantType.QInt8,
+    )
+    print(f"quantized {output / ONNX_QUANTIZED_FILE}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export MiniLM to (quantized) ONNX")
+    parser.add_argument("--output", default="onnx/all-MiniLM-L6-v2")
+    parser.add_argument("--opset", type=int, default=14)
+    parser.add_argument("--skip-quantize", action="store_true")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    export(output, args.opset)
+    if not args.skip_quantize:
+        quantize(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Loads questions into the question bank database (QUESTION_BANK_PATH).
+
+Each file is JSON or JSONL, in any layout ``read_questions`` accepts.
+Re-importing a file replaces what that file contributed before: new
+questions are added, changed weights updated, removed ones deleted.
+Running servers pick the changes up within QUESTION_BANK_RELOAD_INTERVAL.
+
+--synthetic N fills the bank with N generated questions spread over
+the frontend's roles, domains, difficulties and modes, and --bench
+times draws against it (e.g. to check a 100k+ bank stays O(1) per draw).
+
+Run from the backend directory:
+    python scripts/import_questions.py data/extra_questions.jsonl
+    python scripts/import_questions.py --db /tmp/bank.sqlite3 --synthetic 200000 --bench 20000
+"""
+import argparse
+import itertools
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app import config  # noqa: E402
+from app.services.question_bank import QuestionBank  # noqa: E402
+
+ROLES = ["Software Engineer", "Data Scientist", "Product Manager", "Backend Developer", "ML Engineer"]
+DOMAINS = ["Software / IT", "AI / ML / Data", "Product / Business"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+MODES = ["DSA", "Development", "System Design", "Behavioral", "HR"]
+
+
+def synthetic(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    keys = list(itertools.product(ROLES, DOMAINS, DIFFICULTIES, MODES))
+    for i in range(n):
+        role, domain, difficulty, mode = rng.choice(keys)
+        yield {
+            "text": f"[{i}] {mode} question for a {difficulty.lower()} {role} interview ({domain})?",
+            "role": role if rng.random() < 0.8 else None,
+            "domain": domain,
+            "difficulty": difficulty,
+            "mode": mode,
+            "weight": rng.choice((0.5, 1.0, 1.0, 2.0)),
+        }
+
+
+def bench(bank: QuestionBank, draws: int, per_session: int = 10):
+    rng = random.Random(1)
+    keys = list(itertools.product(ROLES, DOMAINS, DIFFICULTIES, MODES))
+    cold = time.perf_counter()
+    for key in keys:
+        bank.take(None, *key)
+    cold = time.perf_counter() - cold
+
+    hits = 0
+    start = time.perf_counter()
+    for _ in range(draws // per_session):
+        session_id = str(uuid.uuid4())
+        key = rng.choice(keys)
+        for _ in range(per_session):
+            hits += bank.take(session_id, *key, rng=rng) is not None
+        bank.end(session_id)
+    elapsed = time.perf_counter() - start
+    total = draws // per_session * per_session
+    print(f"Loaded {len(keys)} keys in {cold:.2f}s; "
+          f"{total} draws in {elapsed:.3f}s ({elapsed / max(total, 1) * 1e6:.1f} us/draw, {hits} served)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*", help="JSON / JSONL question files")
+    parser.add_argument("--db", default=config.QUESTION_BANK_PATH)
+    parser.add_argument("--synthetic", type=int, default=0, help="generate this many questions")
+    parser.add_argument("--bench", type=int, default=0, help="time this many draws afterwards")
+    args = parser.parse_args()
+    if not args.files and not args.synthetic:
+        parser.error("nothing to import")
+
+    bank = QuestionBank(path=args.db)
+    for path in args.files:
+        start = time.perf_counter()
+        count = bank.import_file(path)
+        print(f"{path}: {count} questions in {time.perf_counter() - start:.2f}s")
+    if args.synthetic:
+        start = time.perf_counter()
+        count = bank.import_questions(synthetic(args.synthetic), source="synthetic")
+        print(f"synthetic: {count} questions in {time.perf_counter() - start:.2f}s")
+    print(f"{bank.stats()['questions']} questions in {args.db or ':memory:'}")
+
+    if args.bench:
+        bench(bank, args.bench)
+
+
+if __name__ == "__main__":
+    main()
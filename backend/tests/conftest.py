@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Run from anywhere: the app package lives in the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
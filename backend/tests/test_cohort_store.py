@@ -0,0 +1,22 @@
+from app.services.cohort_store import CohortStore
+
+SCORES = {"correctness": 6.0, "confidence": 4.0, "star": 7.0, "readiness": 5.5, "relevance": 6.5}
+
+
+def test_workers_share_cohorts_through_sqlite(tmp_path):
+    db_path = str(tmp_path / "sessions.sqlite3")
+    first = CohortStore(path=str(tmp_path / "cohorts.npz"), db_path=db_path)
+    second = CohortStore(db_path=db_path)
+
+    assert first.add("Software Engineer", "Software / IT", "Easy", SCORES) is False
+    second.add("software engineer", "Software / IT", "easy", {**SCORES, "readiness": 8.0})
+
+    for store in (first, second):
+        assert len(store) == 2
+        summary = store.summary("Software Engineer", "Software / IT", "Easy")
+        assert summary["cohort_size"] == 2
+        assert summary["metrics"]["readiness"]["p50"] == 6.75
+
+    # A restarted worker rebuilds everything from the table
+    assert len(CohortStore(db_path=db_path)) == 2
+    assert not (tmp_path / "cohorts.npz").exists()
@@ -0,0 +1,20 @@
+from app.services.combined_evaluation import combined_prompt, validate_combined
+
+SCORES = {
+    "star": {"situation": 1, "task": 1.5, "action": 2, "result": 2.5},
+    "correctness": {"verdict": "Partially correct", "score": 6},
+}
+
+
+def test_follow_up_required_by_default():
+    result, errors = validate_combined(SCORES)
+    assert result is None
+    assert errors == ["follow_up_question: expected a non-empty string"]
+
+
+def test_streaming_judgement_needs_no_follow_up():
+    assert "follow_up_question" not in combined_prompt("Q?", "A.", followup=False)
+    result, errors = validate_combined(SCORES, followup=False)
+    assert errors == []
+    assert result["verdict"] == "partial"
+    assert result["follow_up_question"] is None
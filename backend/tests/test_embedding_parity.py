@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app import config
+from app.services.embedding_backends import (
+    ONNX_MODEL_FILE,
+    ONNX_QUANTIZED_FILE,
+    cache_namespace,
+)
+
+# Same pairs and tolerance as scripts/check_embedding_parity.py
+sys.path.insert(0, str(config.BACKEND_DIR / "scripts"))
+from check_embedding_parity import PAIRS, scores  # noqa: E402
+
+TOLERANCE = 0.25
+
+
+def _onnx_dir() -> Path:
+    return config.BACKEND_DIR / config.ONNX_MODEL_DIR
+
+
+@pytest.fixture(scope="module")
+def reference():
+    pytest.importorskip("sentence_transformers")
+    from app.services.embedding_backends import SentenceTransformerBackend
+
+    return scores(SentenceTransformerBackend(), PAIRS)
+
+
+@pytest.mark.parametrize("quantized", [True, False], ids=["int8", "fp32"])
+def test_onnx_scores_match_torch(reference, quantized):
+    pytest.importorskip("onnxruntime")
+    model_file = _onnx_dir() / (ONNX_QUANTIZED_FILE if quantized else ONNX_MODEL_FILE)
+    if not model_file.exists():
+        pytest.skip(f"{model_file} not exported (scripts/export_onnx.py)")
+    from app.services.embedding_backends import OnnxBackend
+
+    candidate = scores(OnnxBackend(str(_onnx_dir()), quantized=quantized), PAIRS)
+    assert np.abs(reference - candidate).max() <= TOLERANCE
+
+
+def test_cache_namespace_separates_onnx_models(tmp_path):
+    (tmp_path / ONNX_MODEL_FILE).write_bytes(b"fp32")
+    (tmp_path / ONNX_QUANTIZED_FILE).write_bytes(b"int8")
+
+    quantized = cache_namespace("onnx", str(tmp_path), quantized=True)
+    assert quantized != cache_namespace("onnx", str(tmp_path), quantized=False)
+    assert quantized != cache_namespace("onnx", str(tmp_path / "other"), quantized=True)
+    assert cache_namespace("torch", str(tmp_path)) == "torch"
+
+    # A re-export of the same file gets a fresh namespace
+    (tmp_path / ONNX_QUANTIZED_FILE).write_bytes(b"int8, re-exported")
+    assert cache_namespace("onnx", str(tmp_path), quantized=True) != quantized
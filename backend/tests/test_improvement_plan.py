@@ -0,0 +1,35 @@
+import asyncio
+
+from app.services.improvement_plan import ImprovementPlanEngine
+from app.utils.running_stats import SessionAggregates
+
+
+class _LLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def agenerate(self, prompt, caller="other"):
+        self.prompts.append(prompt)
+        return "Practice more."
+
+
+def _aggregates(*correctness: float) -> SessionAggregates:
+    return SessionAggregates.from_evaluations(
+        {"correctness_score": c, "confidence_score": 6.0, "star_score": 2.0, "readiness_score": 6.0}
+        for c in correctness
+    )
+
+
+def test_close_averages_share_one_prompt():
+    engine = ImprovementPlanEngine()
+    engine.llm = _LLM()
+
+    # 7.1666... and 7.17 land in the same 0.5 bucket
+    asyncio.run(engine.agenerate_plan(_aggregates(7.0, 7.0, 7.5)))
+    asyncio.run(engine.agenerate_plan(_aggregates(7.17)))
+    asyncio.run(engine.agenerate_plan(_aggregates(8.0)))
+
+    first, second, third = engine.llm.prompts
+    assert first == second
+    assert "Average correctness score: 7.0/10" in first
+    assert third != first
@@ -0,0 +1,93 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import deadline, local_llm
+from app.services.circuit_breaker import CLOSED, CircuitBreaker
+from app.services.deadline import DeadlineExceeded
+from app.services.local_llm import LocalLLM, OllamaTimeout
+
+
+def _slow_ollama(delay: float, stream: bool = False) -> httpx.AsyncClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        if stream:
+            return httpx.Response(200, text='{"response": "Why?", "done": true}\n')
+        return httpx.Response(200, json={"response": "Why?", "done": True})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    monkeypatch.setattr(local_llm, "_breaker", breaker)
+    return breaker
+
+
+def _budgeted(coro_fn, budget: float):
+    async def run():
+        deadline.set_budget(budget)
+        return await coro_fn()
+
+    return asyncio.run(run())
+
+
+def test_request_budget_does_not_trip_breaker(monkeypatch, breaker):
+    monkeypatch.setattr(local_llm, "_async_client", _slow_ollama(0.3))
+    llm = LocalLLM()
+    for _ in range(5):
+        with pytest.raises(DeadlineExceeded) as info:
+            _budgeted(lambda: llm.agenerate("q", cache=False, coalesce=False), 0.05)
+        assert not isinstance(info.value, OllamaTimeout)
+    assert breaker.stats()["state"] == CLOSED
+
+    # A request with budget to spare still gets through
+    assert _budgeted(lambda: llm.agenerate("q", cache=False, coalesce=False), 5) == "Why?"
+
+
+def test_full_ollama_timeout_trips_breaker(monkeypatch, breaker):
+    monkeypatch.setattr(local_llm, "_async_client", _slow_ollama(0.3))
+    monkeypatch.setattr(local_llm.config, "OLLAMA_TIMEOUT", 0.05)
+    llm = LocalLLM()
+    for _ in range(2):
+        with pytest.raises(OllamaTimeout):
+            asyncio.run(llm.agenerate("q", cache=False, coalesce=False))
+    assert breaker.stats()["state"] != CLOSED
+
+
+def test_stalled_stream_raises_deadline(monkeypatch, breaker):
+    async def stalled(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("stalled", request=request)
+
+    monkeypatch.setattr(local_llm, "_async_client", httpx.AsyncClient(transport=httpx.MockTransport(stalled)))
+    llm = LocalLLM()
+
+    async def consume():
+        return [token async for token in llm.astream("q")]
+
+    # Within a short budget: a plain DeadlineExceeded the routes fall back on
+    with pytest.raises(DeadlineExceeded) as info:
+        _budgeted(consume, 5)
+    assert not isinstance(info.value, OllamaTimeout)
+    assert breaker.stats()["state"] == CLOSED
+
+    # With the full OLLAMA_TIMEOUT it counts against Ollama
+    with pytest.raises(OllamaTimeout):
+        asyncio.run(consume())
+
+
+def test_budget_shorter_than_ollama_timeout_still_trips_breaker(monkeypatch, breaker):
+    # Like the defaults: the turn budget runs out well before OLLAMA_TIMEOUT
+    monkeypatch.setattr(local_llm, "_async_client", _slow_ollama(0.5))
+    monkeypatch.setattr(local_llm.config, "LLM_BREAKER_SLOW_CALL", 0.05)
+    llm = LocalLLM()
+    with pytest.raises(DeadlineExceeded):
+        _budgeted(lambda: llm.agenerate("q", cache=False, coalesce=False), 0.1)
+    assert breaker.stats()["state"] == CLOSED
+
+    # Coalesced: the shared call is cancelled once its last waiter gives up
+    with pytest.raises(DeadlineExceeded):
+        _budgeted(lambda: llm.agenerate("q", cache=False, coalesce=True), 0.1)
+    assert breaker.stats()["state"] != CLOSED
@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+import httpx
+
+from app.services import local_llm
+from app.services.llm_context import ConversationStore
+from app.services.local_llm import LocalLLM
+
+
+def test_double_submit_shares_one_turn(monkeypatch):
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"response": "Why?", "context": [1, 2, len(requests)], "done": True})
+
+    monkeypatch.setattr(local_llm, "_async_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(local_llm, "_conversations", ConversationStore())
+    monkeypatch.setattr(local_llm.config, "LLM_COALESCE_ENABLED", True)
+    monkeypatch.setattr(local_llm.config, "LLM_COALESCE_EXCLUDE", frozenset())
+    llm = LocalLLM()
+
+    async def main():
+        return await asyncio.gather(*(llm.aconverse("s1", "Follow up", caller="followup") for _ in range(2)))
+
+    assert asyncio.run(main()) == ["Why?", "Why?"]
+    assert len(requests) == 1
+
+    # The next turn continues from the stored context and is not joined with the last one
+    assert asyncio.run(llm.aconverse("s1", "Follow up", caller="followup")) == "Why?"
+    assert len(requests) == 2 and requests[1]["context"] == [1, 2, 1]
+
+
+def test_without_session_follow_ups_are_not_cached(monkeypatch):
+    replies = iter(["Why?", "How?"])
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"response": next(replies), "done": True})
+
+    monkeypatch.setattr(local_llm, "_async_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(local_llm.config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(local_llm.config, "LLM_CACHE_PATH", "")
+    monkeypatch.setattr(local_llm, "_cache", None)
+    llm = LocalLLM()
+
+    first = asyncio.run(llm.aconverse(None, "Follow up", caller="followup"))
+    second = asyncio.run(llm.aconverse(None, "Follow up", caller="followup"))
+    assert (first, second) == ("Why?", "How?")
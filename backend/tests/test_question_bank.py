@@ -0,0 +1,63 @@
+import json
+import os
+import random
+import time
+from collections import Counter
+
+from app.services.question_bank import QuestionBank
+
+
+def test_unsessioned_draws_follow_weights():
+    bank = QuestionBank()
+    bank.import_questions(
+        [{"text": f"q{i}", "mode": "DSA", "weight": w} for i, w in enumerate((1.0, 2.0, 0.5, 4.5))],
+        source="test",
+    )
+    rng = random.Random(0)
+    counts = Counter(bank.take(None, mode="DSA", rng=rng) for _ in range(40000))
+
+    assert set(counts) == {"q0", "q1", "q2", "q3"}
+    for text, weight in (("q0", 1.0), ("q1", 2.0), ("q2", 0.5), ("q3", 4.5)):
+        assert abs(counts[text] / 40000 - weight / 8.0) < 0.01
+
+
+def _questions(n: int, start: int = 0) -> list[dict]:
+    return [{"text": f"q{i}", "mode": "DSA"} for i in range(start, start + n)]
+
+
+def test_sessions_never_repeat_a_question():
+    bank = QuestionBank()
+    bank.import_questions(_questions(50), source="test")
+    rng = random.Random(0)
+
+    first = [bank.take("s1", mode="DSA", rng=rng) for _ in range(50)]
+    assert sorted(first) == sorted(f"q{i}" for i in range(50))
+    assert bank.take("s1", mode="DSA", rng=rng) is None
+
+    # Other sessions draw independently
+    assert bank.take("s2", mode="DSA", rng=rng) is not None
+    bank.end("s1")
+    assert bank.take("s1", mode="DSA", rng=rng) is not None
+
+
+def test_reload_keeps_each_sessions_history(tmp_path):
+    source = tmp_path / "questions.json"
+    source.write_text(json.dumps(_questions(10)))
+    bank = QuestionBank(path=str(tmp_path / "bank.sqlite3"), source=str(source))
+    bank.reload(force=True)
+    rng = random.Random(1)
+
+    asked = {bank.take("s1", mode="DSA", rng=rng) for _ in range(6)}
+    assert len(asked) == 6
+
+    # The file grows and is re-imported: the buckets are rebuilt, the history is not
+    source.write_text(json.dumps(_questions(15)))
+    os.utime(source, (time.time() + 5, time.time() + 5))
+    generation = bank.generation
+    bank.reload(force=True)
+    assert bank.generation > generation
+
+    rest = [bank.take("s1", mode="DSA", rng=rng) for _ in range(9)]
+    assert None not in rest and not asked & set(rest)
+    assert asked | set(rest) == {f"q{i}" for i in range(15)}
+    assert bank.take("s1", mode="DSA", rng=rng) is None
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+from app.services.report_jobs import DONE, FAILED, RUNNING, ReportJobQueue
+
+
+class _Plans:
+    async def agenerate_plan(self, aggregates):
+        return {"summary": "practice STAR"}
+
+
+class _Reports:
+    def generate(self, session, analytics, improvement):
+        return "report.pdf"
+
+
+def test_job_status_visible_to_other_workers(tmp_path):
+    db_path = str(tmp_path / "sessions.sqlite3")
+    other = ReportJobQueue(_Plans(), _Reports(), db_path=db_path)
+
+    async def main():
+        queue = ReportJobQueue(_Plans(), _Reports(), db_path=db_path)
+        queue.start()
+        job = await queue.submit({"session_id": "s1", "aggregates": None}, {})
+        assert other.get(job["job_id"])["session_id"] == "s1"
+        await queue._queue.join()
+        await queue.stop()
+        return job["job_id"]
+
+    job_id = asyncio.run(main())
+    assert other.get(job_id)["status"] == DONE
+    assert other.for_session("s1")["improvement"] == {"summary": "practice STAR"}
+    assert other.get("unknown") is None
+
+
+def test_jobs_of_a_dead_worker_are_failed(tmp_path):
+    db_path = str(tmp_path / "sessions.sqlite3")
+
+    async def crash():
+        # Submitted but never run: the worker died before picking it up
+        queue = ReportJobQueue(_Plans(), _Reports(), db_path=db_path)
+        queue._queue = asyncio.Queue()
+        return (await queue.submit({"session_id": "s1", "aggregates": None}, {}))["job_id"]
+
+    job_id = asyncio.run(crash())
+    live = ReportJobQueue(_Plans(), _Reports(), db_path=db_path, heartbeat=60)
+    assert live.for_session("s1")["status"] == "queued"
+
+    # Once it has missed three heartbeats it reads as failed...
+    stale = ReportJobQueue(_Plans(), _Reports(), db_path=db_path, heartbeat=0)
+    assert stale.for_session("s1")["status"] == FAILED
+
+    # ...and a restarted worker fails it for everyone at startup
+    job_id = asyncio.run(crash())
+    time.sleep(0.05)
+
+    async def restart():
+        queue = ReportJobQueue(_Plans(), _Reports(), db_path=db_path, heartbeat=0.01)
+        queue.start()
+        await queue.stop()
+
+    asyncio.run(restart())
+    assert live.get(job_id)["status"] == FAILED
+
+
+def test_heartbeat_keeps_running_jobs_alive(tmp_path):
+    db_path = str(tmp_path / "sessions.sqlite3")
+
+    class _SlowPlans:
+        async def agenerate_plan(self, aggregates):
+            await asyncio.sleep(0.3)
+            return {"summary": "practice STAR"}
+
+    async def main():
+        queue = ReportJobQueue(_SlowPlans(), _Reports(), db_path=db_path, heartbeat=0.05)
+        queue.start()
+        await queue.submit({"session_id": "s1", "aggregates": None}, {})
+        await asyncio.sleep(0.2)
+        other = ReportJobQueue(_Plans(), _Reports(), db_path=db_path, heartbeat=0.05)
+        assert other.for_session("s1")["status"] == RUNNING
+        await queue._queue.join()
+        await queue.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+import threading
+
+import pytest
+
+from app.services.session_model import Session
+from app.services.session_store import InMemorySessionStore, SQLiteSessionStore, SessionNotFound
+
+
+def _session(session_id: str = "s1") -> Session:
+    return Session(session_id, "Software Engineer", "Software / IT", "Easy", "DSA", 0.0)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemorySessionStore()
+    return SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+
+
+def test_write_to_swept_session_raises_not_found(store):
+    store.create(_session())
+    store.append_question("s1", "Q1?")
+    assert store.sweep(idle_ttl=-1, completed_ttl=-1) == ["s1"]
+    with pytest.raises(SessionNotFound):
+        store.append_turn("s1", "answer", {"readiness_score": 5.0}, "Q2?")
+    assert store.load("s1") is None
+
+
+def test_memory_sweep_races_with_loads():
+    store = InMemorySessionStore()
+    for i in range(2000):
+        store.create(_session(f"s{i}"))
+    errors = []
+
+    def sweep():
+        try:
+            for _ in range(50):
+                store.sweep(idle_ttl=3600, completed_ttl=3600)
+        except Exception as e:  # "OrderedDict mutated during iteration" without the lock
+            errors.append(e)
+
+    thread = threading.Thread(target=sweep)
+    thread.start()
+    for _ in range(20):
+        for i in range(2000):
+            store.load(f"s{i}")
+    thread.join()
+    assert not errors
+    assert store.total_bytes == sum(s.nbytes for s in store.sessions.values())
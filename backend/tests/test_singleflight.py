@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from app.services import deadline
+from app.services.deadline import DeadlineExceeded
+from app.services.singleflight import AsyncSingleFlight
+
+
+async def _call(flights: AsyncSingleFlight, budget: float, work):
+    deadline.set_budget(budget)
+    result, _ = await flights.do("key", work)
+    return result
+
+
+def test_each_waiter_keeps_its_own_deadline():
+    seen = []
+
+    async def work():
+        seen.append(deadline.remaining())
+        await asyncio.sleep(0.2)
+        return "done"
+
+    async def main():
+        flights = AsyncSingleFlight()
+        tight = asyncio.create_task(_call(flights, 0.05, work))
+        await asyncio.sleep(0)
+        loose = asyncio.create_task(_call(flights, 5, work))
+        results = await asyncio.gather(tight, loose, return_exceptions=True)
+        return flights, results
+
+    flights, (tight, loose) = asyncio.run(main())
+    assert isinstance(tight, DeadlineExceeded)
+    assert loose == "done"
+    assert seen == [None]  # the shared work doesn't inherit the leader's budget
+    assert flights.coalesced == 1 and flights.abandoned == 0
+
+
+def test_work_cancelled_when_every_waiter_runs_out():
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        flights = AsyncSingleFlight()
+        with pytest.raises(DeadlineExceeded):
+            await asyncio.create_task(_call(flights, 0.05, work))
+        await asyncio.sleep(0.01)
+        return flights
+
+    flights = asyncio.run(main())
+    assert cancelled == [True]
+    assert flights.abandoned == 1 and flights.in_flight() == 0
@@ -1,3 +1,5 @@
+import json
+import time
 import requests
 
 BASE_URL = "http://127.0.0.1:8000"
@@ -26,6 +28,43 @@ def submit_answer(session_id, answer):
     return res.json()
 
 
+# ---------------- SUBMIT ANSWER (STREAMING) ----------------
+def submit_answer_stream(session_id, answer):
+    """
+    Yields (event, data) pairs from /interview/answer/stream as they arrive:
+    "scores" first, then one "token" per follow-up chunk, then
+    "evaluation" and "done".
+    """
+    payload = {
+        "session_id": session_id,
+        "answer": answer
+    }
+    with requests.post(
+        f"{BASE_URL}/interview/answer/stream", json=payload, stream=True
+    ) as res:
+        res.raise_for_status()
+
+        event, data = None, []
+        for line in res.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data.append(line[len("data:"):].strip())
+            elif not line and event:
+                parsed = json.loads("\n".join(data))
+                if event == "error":
+                    raise RuntimeError(parsed.get("detail", "Streaming failed"))
+                yield event, parsed
+                event, data = None, []
+
+
+# ---------------- LIVE SESSION METRICS ----------------
+def get_live_metrics(session_id):
+    res = requests.get(f"{BASE_URL}/interview/{session_id}/metrics")
+    res.raise_for_status()
+    return res.json()
+
+
 # ---------------- END INTERVIEW (RETURNS ANALYTICS + REPORT URL) ----------------
 def end_interview(session_id):
     payload = {
@@ -36,6 +75,41 @@ def end_interview(session_id):
     return res.json()
 
 
+# ---------------- REPORT JOB STATUS ----------------
+def get_report_status(job_id):
+    res = requests.get(f"{BASE_URL}/interview/jobs/{job_id}")
+    res.raise_for_status()
+    return res.json()
+
+
+def wait_for_report(job_id, timeout=120, interval=1.0):
+    """Polls the report job until it is done/failed or timeout expires."""
+    deadline = time.time() + timeout
+    status = get_report_status(job_id)
+    while status["status"] in ("queued", "running") and time.time() < deadline:
+        time.sleep(interval)
+        status = get_report_status(job_id)
+    return status
+
+
+# ---------------- COHORT RANKING ----------------
+def get_session_ranking(session_id, scope="cohort"):
+    res = requests.get(
+        f"{BASE_URL}/analytics/ranking/{session_id}",
+        params={"scope": scope}
+    )
+    res.raise_for_status()
+    return res.json()
+
+
+# ---------------- QUESTION AUDIO ----------------
+def get_question_audio(session_id):
+    """The current question rendered to speech (WAV bytes)."""
+    res = requests.get(f"{BASE_URL}/voice/questions/{session_id}/speech")
+    res.raise_for_status()
+    return res.content
+
+
 # ---------------- REPORT DOWNLOAD URL ----------------
 def get_report_url(session_id):
     return f"{BASE_URL}/interview/report/{session_id}"
@@ -24,9 +24,13 @@ import time
 
 from api import (
     start_interview,
-    submit_answer,
+    submit_answer_stream,
     end_interview,
+    get_live_metrics,
+    get_question_audio,
     get_report_url,
+    get_session_ranking,
+    wait_for_report,
 )
 
 st.set_page_config(
@@ -244,8 +248,28 @@ elif st.session_state.step == 5:
     elapsed = int(time.time() - st.session_state.start_time)
     st.info(f"⏱ Time elapsed: {elapsed} seconds")
 
+    # Running averages so far (cheap, doesn't end the interview)
+    try:
+        live = get_live_metrics(st.session_state.session_id)
+    except Exception:
+        # Evicted session or backend hiccup: just skip the caption
+        live = None
+    if live and live["total_questions"]:
+        readiness = live["metrics"]["readiness"]
+        st.caption(
+            f"Answered: {live['total_questions']} | "
+            f"Avg readiness: {readiness['mean']} | "
+            f"Recent trend: {readiness['trend']:+}"
+        )
+
     st.markdown(f"### ❓ Question\n{st.session_state.question}")
 
+    if st.button("🔊 Listen"):
+        try:
+            st.audio(get_question_audio(st.session_state.session_id), format="audio/wav")
+        except Exception:
+            st.warning("Audio is not available right now.")
+
     # Disable answer box if waiting for next question
     answer = st.text_area(
         "Your Answer",
@@ -258,10 +282,34 @@ elif st.session_state.step == 5:
     # ---------- SUBMIT ANSWER ----------
     with col1:
         if st.button("Submit Answer", disabled=st.session_state.awaiting_next):
-            result = submit_answer(
+            result = {}
+            scores_box = st.empty()
+            followup_box = st.empty()
+            followup = ""
+
+            # Render scores and the follow-up as soon as they stream in
+            for event, data in submit_answer_stream(
                 st.session_state.session_id,
                 answer
-            )
+            ):
+                if event == "scores":
+                    result.update(data)
+                    scores_box.info(
+                        f"Correctness: {data['correctness_score']} | "
+                        f"Confidence: {data['confidence_score']}"
+                    )
+                elif event == "token":
+                    followup += data
+                    followup_box.markdown(f"**Next question:** {followup}")
+                elif event == "evaluation":
+                    # Correctness blended with the LLM's verdict replaces the heuristic one
+                    result.update(data)
+                    scores_box.info(
+                        f"Correctness: {data['correctness_score']} | "
+                        f"Confidence: {result['confidence_score']}"
+                    )
+                elif event == "done":
+                    result["follow_up_question"] = data["follow_up_question"]
 
             # store evaluation
             st.session_state.last_result = result
@@ -289,6 +337,8 @@ elif st.session_state.step == 5:
         with cols[0]:
             st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
             st.metric("Correctness", result["correctness_score"])
+            if result.get("correctness_verdict"):
+                st.caption(f"Verdict: {result['correctness_verdict']}")
             st.markdown("</div>", unsafe_allow_html=True)
 
         with cols[1]:
@@ -325,6 +375,13 @@ elif st.session_state.step == 6:
     analytics = summary["analytics"]
     improvement = summary["improvement"]
 
+    # Coaching summary and PDF are produced in the background
+    if improvement.get("summary") is None and summary.get("job_id"):
+        with st.spinner("Preparing your personalised recommendation..."):
+            status = wait_for_report(summary["job_id"])
+        if status.get("improvement"):
+            improvement = summary["improvement"] = status["improvement"]
+
     st.success("Interview completed successfully")
 
     # ---------- OVERALL PERFORMANCE ----------
@@ -335,6 +392,23 @@ elif st.session_state.step == 6:
     cols[1].metric("Confidence", analytics["averages"]["confidence"])
     cols[2].metric("Readiness", analytics["averages"]["readiness"])
 
+    # ---------- COHORT RANKING ----------
+    try:
+        ranking = get_session_ranking(st.session_state.session_id)
+    except Exception:
+        ranking = None
+
+    if ranking and ranking["cohort_size"] > 1:
+        percentiles = ranking["percentiles"]
+        st.caption(
+            f"Compared with {ranking['cohort_size']} finished interviews "
+            "for the same role, domain and difficulty"
+        )
+        cols = st.columns(3)
+        for col, metric in zip(cols, ("correctness", "confidence", "readiness")):
+            if metric in percentiles:
+                col.metric(f"{metric.title()} percentile", f"P{percentiles[metric]:.0f}")
+
     st.divider()
 
     # ---------- PERSONALIZED FEEDBACK ----------
@@ -360,7 +434,7 @@ elif st.session_state.step == 6:
 
     # ---------- FINAL RECOMMENDATION ----------
     st.markdown("## 🧠 Final Recommendation")
-    st.info(improvement.get("summary", "Keep practicing consistently."))
+    st.info(improvement.get("summary") or "Keep practicing consistently.")
 
     st.divider()
 